@@ -1,28 +1,88 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
-import pandas as pd
-import joblib
-from pipeline import predict_startup, generate_peer_comparison_report, compare_to_selected_startup, RevenueMapper, EmployeeRangeConverter, FundingConverter, YearsActiveCalculator, GrowthConfidenceConverter, IndustriesEncoder, FrequencyEncoder, DerivedFeatures
+from model_registry import registry, file_signature, load_pipeline, load_target_encoder, DEFAULT_PIPELINE_PATH, DEFAULT_TARGET_ENCODER_PATH
+from feature_store import get_feature_store
+from worker_pool import InferenceWorkerPool, WorkerPoolBusy
+from persistence import create_client, PredictionStore, MONGO_DB, find_page, iter_documents
+from response_cache import make_response_cache, canonical_key
+from compiled_scorer import load_scorer, predict_startup_compiled
+from startup_input import StartupData, startup_frame
+from pipeline import predict_startup, predict_startups_batch, generate_peer_comparison_report, compare_to_selected_startup, RevenueMapper, EmployeeRangeConverter, FundingConverter, YearsActiveCalculator, GrowthConfidenceConverter, IndustriesEncoder, FrequencyEncoder, DerivedFeatures
 import math
-import pymongo
+import json
+import os
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
 import logging
 
 # Logging Setup
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Executor Setup
+# pandas/XGBoost work and blocking pymongo calls run on bounded pools so a
+# slow request never stalls the event loop. Predictions and the heavier peer
+# comparisons get separate pools so a burst of one cannot queue up the other.
+CPU_COUNT = os.cpu_count() or 4
+PREDICT_WORKERS = int(os.environ.get("PREDICT_WORKERS", CPU_COUNT))
+ANALYSIS_WORKERS = int(os.environ.get("ANALYSIS_WORKERS", max(1, CPU_COUNT // 2)))
+MONGO_WORKERS = int(os.environ.get("MONGO_WORKERS", 16))
+predict_executor = ThreadPoolExecutor(max_workers=PREDICT_WORKERS, thread_name_prefix="predict")
+analysis_executor = ThreadPoolExecutor(max_workers=ANALYSIS_WORKERS, thread_name_prefix="analysis")
+mongo_executor = ThreadPoolExecutor(max_workers=MONGO_WORKERS, thread_name_prefix="mongo")
+
+async def run_in(executor, fn, *args, **kwargs):
+    return await asyncio.get_running_loop().run_in_executor(executor, functools.partial(fn, *args, **kwargs))
+
+# Optional process pool for predictions and peer comparisons. Threads only
+# help while pandas/XGBoost release the GIL; with WORKER_PROCESSES > 0 that
+# work goes to pre-started worker processes sharing the reference arrays.
+WORKER_PROCESSES = int(os.environ.get("WORKER_PROCESSES", 0))
+WORKER_QUEUE_SIZE = int(os.environ.get("WORKER_QUEUE_SIZE", WORKER_PROCESSES * 4))
+worker_pool = None
+
+async def dispatch(executor, fn, *args, **kwargs):
+    if worker_pool is not None:
+        return await worker_pool.run(fn, *args, **kwargs)
+    return await run_in(executor, fn, *args, **kwargs)
+
+# INFERENCE_BACKEND=compiled scores /predict with the flat NumPy scorer
+# compiled from the loaded pipeline instead of the sklearn pipeline itself
+INFERENCE_BACKEND = os.environ.get("INFERENCE_BACKEND", "pipeline")
+predict_one = predict_startup_compiled if INFERENCE_BACKEND == "compiled" else predict_startup
+
 # MongoDB Setup
-MONGO_URI = "mongodb://localhost:27017/"
-try:
-    mongo_client = pymongo.MongoClient(MONGO_URI)
-    db = mongo_client["startup_db"]
-    active_startups_collection = db["active_startups"]
-    closed_startups_collection = db["closed_startups"]  # New collection for Closed startups
-    logger.info("Connected to MongoDB")
-except Exception as e:
-    logger.error(f"Failed to connect to MongoDB: {str(e)}")
-    raise Exception(f"MongoDB connection failed: {str(e)}")
+# The client is created on first use rather than at import so a worker can
+# come up (and warm its models) without waiting on the driver or the server.
+mongo_client = None
+prediction_store = None
+_mongo_lock = threading.RLock()
+
+def get_db():
+    global mongo_client
+    if mongo_client is None:
+        with _mongo_lock:
+            if mongo_client is None:
+                try:
+                    mongo_client = create_client()
+                    logger.info("Connected to MongoDB")
+                except Exception as e:
+                    logger.error(f"Failed to connect to MongoDB: {str(e)}")
+                    raise Exception(f"MongoDB connection failed: {str(e)}")
+    return mongo_client[MONGO_DB]
+
+def get_prediction_store():
+    global prediction_store
+    if prediction_store is None:
+        with _mongo_lock:
+            if prediction_store is None:
+                prediction_store = PredictionStore(get_db())
+    return prediction_store
 
 # Utility Functions
 def replace_inf_nan(obj):
@@ -37,6 +97,37 @@ def replace_inf_nan(obj):
     else:
         return obj
 
+# Peer comparisons run against this dataset
+REFERENCE_DATASET = "startup_og.csv"
+
+# Response Cache
+# Predictions and peer reports are deterministic for a given input, model and
+# reference dataset, so identical re-posts from the front end are answered
+# from here. Keys include the artifact hashes and dataset signature, so a
+# model or dataset swap never serves stale answers.
+response_cache = make_response_cache()
+
+def model_versions():
+    return registry.version(DEFAULT_PIPELINE_PATH), registry.version(DEFAULT_TARGET_ENCODER_PATH), INFERENCE_BACKEND
+
+def peer_versions():
+    return registry.version(DEFAULT_PIPELINE_PATH), file_signature(REFERENCE_DATASET), os.environ.get("PEER_INDEX", "exact")
+
+# Resolving a version can reload and hash a freshly swapped pickle (or wait
+# on another thread doing so), so keys are built on the executors, never on
+# the event loop.
+def predict_cache_key(record):
+    return canonical_key("predict", record, *model_versions())
+
+def peer_cache_key(namespace, payload):
+    return canonical_key(namespace, payload, *peer_versions())
+
+async def cache_call(fn, *args):
+    # The in-memory cache is a dict lookup; a Redis round trip is blocking I/O
+    if response_cache.backend == "memory":
+        return fn(*args)
+    return await run_in(mongo_executor, fn, *args)
+
 # FastAPI Setup
 app = FastAPI(title="Startup Analysis API")
 origins = [
@@ -49,29 +140,50 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Browsers hide non-safelisted response headers from cross-origin callers
+    expose_headers=["X-Next-After"],
 )
 
+def warm_up():
+    pipeline = load_pipeline()
+    load_target_encoder()
+    if INFERENCE_BACKEND == "compiled":
+        load_scorer(DEFAULT_PIPELINE_PATH)
+    return get_feature_store(REFERENCE_DATASET, pipeline)
+
+def log_index_failure(future):
+    if not future.cancelled() and future.exception() is not None:
+        logger.error(f"Creating prediction indexes failed: {str(future.exception())}")
+
+@app.on_event("startup")
+async def load_models():
+    global worker_pool
+    # Unpickle the artifacts once per worker before the first request
+    store = await run_in(analysis_executor, warm_up)
+    logger.info(f"Model artifacts loaded, reference feature store holds {len(store)} startups")
+    # Index creation waits on server selection; don't hold up serving for it,
+    # but don't let a failure vanish with the unawaited future either
+    predictions = get_prediction_store()
+    indexing = asyncio.get_running_loop().run_in_executor(mongo_executor, predictions.ensure_indexes)
+    indexing.add_done_callback(log_index_failure)
+    predictions.start()
+    if WORKER_PROCESSES > 0:
+        pool = InferenceWorkerPool(store, REFERENCE_DATASET, processes=WORKER_PROCESSES, max_pending=WORKER_QUEUE_SIZE)
+        worker_pool = await run_in(analysis_executor, pool.start)
+
+@app.on_event("shutdown")
+async def shutdown_executors():
+    # Write out whatever is still buffered before the executors go away
+    if prediction_store is not None:
+        await run_in(mongo_executor, prediction_store.close)
+    for executor in (predict_executor, analysis_executor, mongo_executor):
+        executor.shutdown(wait=False)
+    if worker_pool is not None:
+        worker_pool.shutdown()
+
 # Pydantic Model
-class StartupData(BaseModel):
-    Organization_Name: str = None
-    Industries: str = None
-    Headquarters_Location: str = None
-    Estimated_Revenue: str = None
-    Founded_Date: float = None
-    Investment_Stage: str = None
-    Industry_Groups: str = None
-    Number_of_Founders: float = None
-    Founders: str = None
-    Number_of_Employees: str = None
-    Number_of_Funding_Rounds: float = None
-    Funding_Status: str = None
-    Total_Funding_Amount: str = None
-    Growth_Category: str = None
-    Growth_Confidence: str = None
-    Monthly_visit: float = None
-    Visit_Duration_Growth: float = None
-    Patents_Granted: float = None
-    Visit_Duration: float = None
+class BatchPredictionRequest(BaseModel):
+    startups: List[StartupData]
 
 class ComparisonRequest(BaseModel):
     startup_data: StartupData
@@ -80,187 +192,171 @@ class ComparisonRequest(BaseModel):
 # API Endpoints
 @app.post("/predict")
 async def predict(data: StartupData):
-    input_data = data.dict(exclude_unset=True)
+    input_data = data.to_input()
     logger.info(f"Received input data: {input_data}")
     if not input_data:
         raise HTTPException(status_code=422, detail="No valid data provided")
     try:
-        # Convert field names from underscores to spaces for the pipeline
-        converted_data = {}
-        field_mapping = {
-            "Organization_Name": "Organization Name",
-            "Industries": "Industries",
-            "Headquarters_Location": "Headquarters Location",
-            "Estimated_Revenue": "Estimated Revenue",
-            "Founded_Date": "Founded Date",
-            "Investment_Stage": "Investment Stage",
-            "Industry_Groups": "Industry Groups",
-            "Number_of_Founders": "Number of Founders",
-            "Founders": "Founders",
-            "Number_of_Employees": "Number of Employees",
-            "Number_of_Funding_Rounds": "Number of Funding Rounds",
-            "Funding_Status": "Funding Status",
-            "Total_Funding_Amount": "Total Funding Amount",
-            "Growth_Category": "Growth Category",
-            "Growth_Confidence": "Growth Confidence",
-            "Monthly_visit": "Monthly visit",
-            "Visit_Duration_Growth": "Visit Duration Growth",
-            "Patents_Granted": "Patents Granted",
-            "Visit_Duration": "Visit Duration"
-        }
-        
-        for key, value in input_data.items():
-            if key in field_mapping:
-                converted_data[field_mapping[key]] = value
-            else:
-                converted_data[key] = value
+        converted_data = data.to_record()
         
-        result = predict_startup(converted_data)
+        key = await run_in(predict_executor, predict_cache_key, converted_data)
+        result = await cache_call(response_cache.get, key)
+        if result is None:
+            result = await dispatch(predict_executor, predict_one, converted_data)
+            await cache_call(response_cache.set, key, result)
         logger.info(f"Prediction for {data.Organization_Name}: {result['practical_prediction']['display_label']} (Confidence: {result['practical_prediction']['confidence']})")
-        startup_data = input_data
-        startup_data["prediction"] = result["practical_prediction"]["display_label"]
-        startup_data["confidence_level"] = result["practical_prediction"]["confidence"]
-        
-        if result["practical_prediction"]["label"] == "Active":
-            active_startups_collection.update_one(
-                {"Organization_Name": startup_data.get("Organization_Name")},
-                {"$set": startup_data},
-                upsert=True
-            )
-            logger.info(f"Stored Successful startup: {startup_data.get('Organization_Name')}")
-        elif result["practical_prediction"]["label"] == "Closed":
-            closed_startups_collection.update_one(
-                {"Organization_Name": startup_data.get("Organization_Name")},
-                {"$set": startup_data},
-                upsert=True
-            )
-            logger.info(f"Stored Struggling startup: {startup_data.get('Organization_Name')}")
-        else:
-            logger.warning(f"Unexpected prediction value: {result['practical_prediction']['label']}")
+        get_prediction_store().record(input_data, result)
         return result
+    except WorkerPoolBusy as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
     except Exception as e:
         logger.error(f"Prediction failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}")
 
+MAX_BATCH_SIZE = 10000
+
+@app.post("/predict/batch")
+async def predict_batch(request: BatchPredictionRequest):
+    if not request.startups:
+        raise HTTPException(status_code=422, detail="No startups provided")
+    if len(request.startups) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=413, detail=f"Batch too large: at most {MAX_BATCH_SIZE} startups per call")
+    input_rows = [startup.to_input() for startup in request.startups]
+    logger.info(f"Received batch of {len(input_rows)} startups")
+    try:
+        frame = startup_frame(request.startups)
+        results = await dispatch(predict_executor, predict_startups_batch, frame)
+        get_prediction_store().record_batch(input_rows, results)
+        return results
+    except WorkerPoolBusy as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    except Exception as e:
+        logger.error(f"Batch prediction failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Batch prediction failed: {str(e)}")
+
 @app.post("/peer_comparison")
 async def peer_comparison(data: StartupData):
-    input_data = data.dict(exclude_unset=True)
+    input_data = data.to_input()
     logger.info(f"Peer comparison input data: {input_data}")
     if not input_data:
         raise HTTPException(status_code=422, detail="No valid data provided")
     try:
-        # Convert field names from underscores to spaces for the pipeline
-        converted_data = {}
-        field_mapping = {
-            "Organization_Name": "Organization Name",
-            "Industries": "Industries",
-            "Headquarters_Location": "Headquarters Location",
-            "Estimated_Revenue": "Estimated Revenue",
-            "Founded_Date": "Founded Date",
-            "Investment_Stage": "Investment Stage",
-            "Industry_Groups": "Industry Groups",
-            "Number_of_Founders": "Number of Founders",
-            "Founders": "Founders",
-            "Number_of_Employees": "Number of Employees",
-            "Number_of_Funding_Rounds": "Number of Funding Rounds",
-            "Funding_Status": "Funding Status",
-            "Total_Funding_Amount": "Total Funding Amount",
-            "Growth_Category": "Growth Category",
-            "Growth_Confidence": "Growth Confidence",
-            "Monthly_visit": "Monthly visit",
-            "Visit_Duration_Growth": "Visit Duration Growth",
-            "Patents_Granted": "Patents Granted",
-            "Visit_Duration": "Visit Duration"
-        }
+        converted_data = data.to_record()
         
-        for key, value in input_data.items():
-            if key in field_mapping:
-                converted_data[field_mapping[key]] = value
-            else:
-                converted_data[key] = value
-        
-        report = generate_peer_comparison_report(converted_data, "startup_og.csv")
-        clean_report = replace_inf_nan(report)
+        key = await run_in(analysis_executor, peer_cache_key, "peer_comparison", converted_data)
+        clean_report = await cache_call(response_cache.get, key)
+        if clean_report is None:
+            report = await dispatch(analysis_executor, generate_peer_comparison_report, converted_data, REFERENCE_DATASET)
+            clean_report = replace_inf_nan(report)
+            await cache_call(response_cache.set, key, clean_report)
         return clean_report
+    except WorkerPoolBusy as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Peer comparison failed: {str(e)}")
 
 @app.post("/compare_to_startup")
 async def compare_to_startup(request: ComparisonRequest):
-    input_data = request.startup_data.dict(exclude_unset=True)
+    input_data = request.startup_data.to_input()
     logger.info(f"Compare to startup input data: {input_data}")
     try:
-        # Convert field names from underscores to spaces for the pipeline
-        converted_data = {}
-        field_mapping = {
-            "Organization_Name": "Organization Name",
-            "Industries": "Industries",
-            "Headquarters_Location": "Headquarters Location",
-            "Estimated_Revenue": "Estimated Revenue",
-            "Founded_Date": "Founded Date",
-            "Investment_Stage": "Investment Stage",
-            "Industry_Groups": "Industry Groups",
-            "Number_of_Founders": "Number of Founders",
-            "Founders": "Founders",
-            "Number_of_Employees": "Number of Employees",
-            "Number_of_Funding_Rounds": "Number of Funding Rounds",
-            "Funding_Status": "Funding Status",
-            "Total_Funding_Amount": "Total Funding Amount",
-            "Growth_Category": "Growth Category",
-            "Growth_Confidence": "Growth Confidence",
-            "Monthly_visit": "Monthly visit",
-            "Visit_Duration_Growth": "Visit Duration Growth",
-            "Patents_Granted": "Patents Granted",
-            "Visit_Duration": "Visit Duration"
-        }
-        
-        for key, value in input_data.items():
-            if key in field_mapping:
-                converted_data[field_mapping[key]] = value
-            else:
-                converted_data[key] = value
+        converted_data = request.startup_data.to_record()
         
-        report = compare_to_selected_startup(
-            converted_data,
-            request.selected_startup_name,
-            "startup_og.csv"
-        )
-        clean_report = replace_inf_nan(report)
+        key = await run_in(analysis_executor, peer_cache_key, "compare_to_startup", [converted_data, request.selected_startup_name])
+        clean_report = await cache_call(response_cache.get, key)
+        if clean_report is None:
+            report = await dispatch(
+                analysis_executor,
+                compare_to_selected_startup,
+                converted_data,
+                request.selected_startup_name,
+                REFERENCE_DATASET
+            )
+            clean_report = replace_inf_nan(report)
+            await cache_call(response_cache.set, key, clean_report)
         return clean_report
+    except WorkerPoolBusy as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Comparison failed: {str(e)}")
 
+# Listing endpoints page through the collection in insertion order. Pass
+# the returned cursor back as ?after= for the next page; format=ndjson
+# streams every remaining document instead, one JSON object per line.
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+STARTUP_LIST_FIELDS = {
+    "Organization_Name": "Unknown",
+    "Industries": "N/A",
+    "Headquarters_Location": "N/A",
+    "Investment_Stage": "N/A",
+    "prediction": "N/A"
+}
+
+def format_startup(s):
+    return {field: s.get(field, default) for field, default in STARTUP_LIST_FIELDS.items()}
+
+def stream_ndjson(cursor, transform=None):
+    def lines():
+        for doc in cursor:
+            yield json.dumps(replace_inf_nan(transform(doc) if transform else doc), default=str) + "\n"
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
 @app.get("/startups")
-async def get_startups():
+async def get_startups(
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    format: str = Query("json", pattern="^(json|ndjson)$")
+):
+    projection = {field: 1 for field in STARTUP_LIST_FIELDS}
     try:
-        startups = list(active_startups_collection.find({}, {"_id": 0}))
-        formatted_startups = [
-            {
-                "Organization_Name": s.get("Organization_Name", "Unknown"),
-                "Industries": s.get("Industries", "N/A"),
-                "Headquarters_Location": s.get("Headquarters_Location", "N/A"),
-                "Investment_Stage": s.get("Investment_Stage", "N/A"),
-                "prediction": s.get("prediction", "N/A")
-            }
-            for s in startups
-        ]
+        if format == "ndjson":
+            cursor = await run_in(mongo_executor, iter_documents, get_db()["active_startups"], projection)
+            return stream_ndjson(cursor, format_startup)
+        startups, next_after = await run_in(mongo_executor, find_page, get_db()["active_startups"], projection, limit, after)
+        formatted_startups = [format_startup(s) for s in startups]
+        if next_after is not None:
+            response.headers["X-Next-After"] = next_after
         logger.info(f"Fetched {len(formatted_startups)} startups")
         return formatted_startups
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
     except Exception as e:
         logger.error(f"Failed to fetch startups: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to fetch startups: {str(e)}")
 
 @app.get("/debug_startups")
-async def debug_startups():
+async def debug_startups(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    format: str = Query("json", pattern="^(json|ndjson)$")
+):
     try:
-        count = active_startups_collection.count_documents({})
-        startups = list(active_startups_collection.find({}, {"_id": 0}))
-        logger.info(f"Debug fetched {count} startups")
-        return {"count": count, "startups": startups}
+        if format == "ndjson":
+            cursor = await run_in(mongo_executor, iter_documents, get_db()["active_startups"])
+            return stream_ndjson(cursor)
+        # Collection metadata count; count_documents({}) would scan every document
+        count = await run_in(mongo_executor, get_db()["active_startups"].estimated_document_count)
+        startups, next_after = await run_in(mongo_executor, find_page, get_db()["active_startups"], None, limit, after)
+        logger.info(f"Debug fetched {len(startups)} of {count} startups")
+        return {"count": count, "startups": startups, "next_after": next_after}
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
     except Exception as e:
         logger.error(f"Debug failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Debug failed: {str(e)}")
 
+@app.get("/metrics/workers")
+async def worker_metrics():
+    if worker_pool is None:
+        return {"processes": 0}
+    return worker_pool.metrics()
+
+@app.get("/metrics/cache")
+async def cache_metrics():
+    return response_cache.metrics()
+
 # Main Execution
 if __name__ == "__main__":
     import uvicorn
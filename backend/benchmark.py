@@ -0,0 +1,391 @@
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from model_registry import registry
+from pipeline import (
+    predict_startup, predict_startups_batch,
+    RevenueMapper, FundingConverter, EmployeeRangeConverter, input_normalizer,
+    NUMERIC_COLUMNS, PLACEHOLDER_COLUMNS,
+    generate_peer_comparison_report, compare_to_selected_startup
+)
+from test_converters import legacy_parse_amount, legacy_parse_employees, legacy_transform
+
+SAMPLE_INPUT = {
+    "Organization Name": "Test Startup",
+    "Industries": "FinTech",
+    "Headquarters Location": "Delhi",
+    "Estimated Revenue": "Less than $1M",
+    "Founded Date": 2023,
+    "Investment Stage": "Seed",
+    "Industry Groups": "Commerce",
+    "Number of Founders": 1,
+    "Founders": "Ravi Kumar",
+    "Number of Employees": "1-10",
+    "Number of Funding Rounds": 0,
+    "Funding Status": "Seed",
+    "Total Funding Amount": "$0 to $1M",
+    "Growth Category": "Medium",
+    "Growth Confidence": "Low",
+    "Monthly visit": 500,
+    "Visit Duration Growth": 0.0,
+    "Patents Granted": 0,
+    "Visit Duration": 100
+}
+
+
+def timeit(fn, repeat):
+    fn()  # warm-up
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return np.array(timings) * 1000
+
+
+def report(name, timings_ms):
+    print(f"{name:<40} mean {timings_ms.mean():8.3f} ms   p50 {np.percentile(timings_ms, 50):8.3f} ms   p99 {np.percentile(timings_ms, 99):8.3f} ms")
+
+
+# Per-call latency of predict_startup against the previous three-pass
+# sequence (pipeline.predict, then transform again, then predict_proba).
+def bench_predict(args):
+    pipeline = registry.get("startup_pipeline.pkl")
+    preprocessor = pipeline.named_steps['preprocessor']
+    derived = pipeline.named_steps['derived']
+    classifier = pipeline.named_steps['classifier']
+    frame = pd.DataFrame([SAMPLE_INPUT])
+
+    def three_pass():
+        pipeline.predict(frame)
+        X_derived = derived.transform(preprocessor.transform(frame))
+        classifier.predict_proba(X_derived)
+
+    def single_pass():
+        X_derived = derived.transform(preprocessor.transform(frame))
+        classifier.predict_proba(X_derived)
+
+    report("inference, three passes (before)", timeit(three_pass, args.repeat))
+    report("inference, single pass (after)", timeit(single_pass, args.repeat))
+    report("predict_startup end to end", timeit(lambda: predict_startup(dict(SAMPLE_INPUT)), args.repeat))
+
+
+# Scoring startups.csv row by row versus one predict_startups_batch call
+def bench_batch(args):
+    frame = pd.read_csv("startups.csv").drop(columns=["Operating Status"])
+    frame = pd.concat([frame] * max(1, args.rows // len(frame)), ignore_index=True).head(args.rows)
+    records = frame.to_dict("records")
+    sample = records[:min(len(records), 200)]
+    per_row = timeit(lambda: [predict_startup(dict(r)) for r in sample], 1).mean() / len(sample)
+    batch = timeit(lambda: predict_startups_batch(frame), 3).mean()
+    print(f"{len(frame)} rows: row by row ~{per_row * len(frame):10.1f} ms (extrapolated)   batch {batch:10.1f} ms")
+
+
+# Range converters on 1k/100k/1M labels drawn from the reference CSVs, against
+# the original per-row closures (kept in test_converters) they replaced.
+def bench_converters(args):
+    labels = pd.concat([pd.read_csv(path)[columns] for path, columns in [
+        ("startups.csv", ["Estimated Revenue", "Total Funding Amount", "Number of Employees"]),
+        ("startup_og.csv", ["Estimated Revenue", "Total Funding Amount", "Number of Employees"]),
+    ]], ignore_index=True)
+    converters = [
+        ("RevenueMapper", RevenueMapper(), legacy_parse_amount, "Estimated Revenue"),
+        ("FundingConverter", FundingConverter(), legacy_parse_amount, "Total Funding Amount"),
+        ("EmployeeRangeConverter", EmployeeRangeConverter(), legacy_parse_employees, "Number of Employees"),
+    ]
+    rng = np.random.default_rng(13)
+    for n_rows in (1_000, 100_000, 1_000_000):
+        for name, converter, parse, column in converters:
+            X = pd.DataFrame({column: rng.choice(labels[column].values, n_rows)})
+            per_row = lambda: legacy_transform(parse, X)
+            expected, actual = per_row(), converter.transform(X)
+            assert expected.tobytes() == actual.tobytes(), f"{name} output differs from the original per-row parsing"
+            repeat = 5 if n_rows < 1_000_000 else 1
+            before = timeit(per_row, repeat).mean()
+            after = timeit(lambda: converter.transform(X), repeat).mean()
+            print(f"{name:<24} {n_rows:>9} rows   per-row {before:10.2f} ms   vectorized {after:10.2f} ms   x{before / after:6.1f}")
+
+
+# InputNormalizer on 1M rows resampled from the reference CSVs (raw strings,
+# as read_csv leaves them, and already-numeric), against the unanchored
+# astype(str).replace(regex) loop it replaced
+def _regex_cleanup(df):
+    pattern = r'—|–|-|N/A|unknown|nan'
+    for col in NUMERIC_COLUMNS:
+        df[col] = pd.to_numeric(df[col].astype(str).replace(pattern, np.nan, regex=True), errors='coerce')
+    for col in PLACEHOLDER_COLUMNS:
+        df[col] = df[col].astype(str).replace(pattern, np.nan, regex=True)
+    df["Industries"] = df["Industries"].astype(str).replace(pattern, "Unknown", regex=True).str.strip()
+    df["Number of Employees"] = df["Number of Employees"].apply(lambda x: str(x).strip() if pd.notna(x) else np.nan)
+    return df
+
+
+def bench_normalize(args):
+    columns = NUMERIC_COLUMNS + PLACEHOLDER_COLUMNS + ["Industries", "Number of Employees"]
+    raw = pd.concat([pd.read_csv(path, dtype=str)[columns] for path in ("startups.csv", "startup_og.csv")], ignore_index=True)
+    n_rows = max(args.rows, 1_000_000)
+    rng = np.random.default_rng(13)
+    raw = raw.iloc[rng.integers(0, len(raw), n_rows)].reset_index(drop=True)
+    typed = raw.copy()
+    typed[NUMERIC_COLUMNS] = typed[NUMERIC_COLUMNS].apply(pd.to_numeric, errors="coerce")
+    for name, frame in (("strings", raw), ("numeric dtypes", typed)):
+        before = timeit(lambda: _regex_cleanup(frame.copy()), 1).mean()
+        after = timeit(lambda: input_normalizer.transform(frame), 1).mean()
+        print(f"{name:<16} {n_rows} rows   regex loop {before:10.1f} ms   InputNormalizer {after:10.1f} ms   x{before / after:6.1f}")
+
+
+# StartupData -> pipeline input: the handlers' old dict() + per-key rename
+# (one record, and a --rows batch through a list of renamed dicts) against
+# the alias dump and the column-ordered batch frame
+def bench_input(args):
+    from startup_input import StartupData, startup_frame
+    body = {key.replace(" ", "_"): value for key, value in SAMPLE_INPUT.items()}
+    startup = StartupData(**body)
+    mapping = {field: field.replace("_", " ") for field in StartupData.model_fields}
+    rename = lambda data: {mapping.get(key, key): value for key, value in data.model_dump(exclude_unset=True).items()}
+    report("single record, dump + rename (before)", timeit(lambda: rename(startup), args.repeat))
+    report("single record, to_record (after)", timeit(startup.to_record, args.repeat))
+    startups = [startup] * args.rows
+    report(f"{args.rows} rows, DataFrame of renamed dicts", timeit(lambda: pd.DataFrame([rename(s) for s in startups]), 5))
+    report(f"{args.rows} rows, startup_frame", timeit(lambda: startup_frame(startups), 5))
+
+
+# Per-request latency of the peer comparison endpoints' pipeline functions
+def bench_peers(args):
+    report("generate_peer_comparison_report", timeit(
+        lambda: generate_peer_comparison_report(dict(SAMPLE_INPUT), "startup_og.csv"), args.repeat))
+    peer = generate_peer_comparison_report(dict(SAMPLE_INPUT), "startup_og.csv")["Similar_Startups"][0]
+    report("compare_to_selected_startup", timeit(
+        lambda: compare_to_selected_startup(dict(SAMPLE_INPUT), peer, "startup_og.csv"), args.repeat))
+
+
+# Full (N+1)x(N+1) cosine_similarity versus one normalised sparse matvec +
+# argpartition, on a reference corpus tiled up to each size
+def bench_similarity(args):
+    from scipy.sparse import vstack
+    from sklearn.metrics.pairwise import cosine_similarity
+    from feature_store import get_feature_store
+    from peer_index import top_k
+    store = get_feature_store("startup_og.csv", registry.get("startup_pipeline.pkl"))
+    frame = pd.DataFrame([SAMPLE_INPUT])
+    query = store.query_vectors(frame)
+    reference = store.index.vectors
+    for n_rows in (1_000, 10_000, 100_000, 1_000_000):
+        corpus = vstack([reference] * (n_rows // reference.shape[0] + 1)).tocsr()[:n_rows]
+        repeat = 5 if n_rows <= 10_000 else 2
+        if n_rows <= 10_000:
+            full = lambda: np.argsort(-cosine_similarity(vstack([corpus, query]))[-1])[1:6]
+            before = f"{timeit(full, repeat).mean():10.2f} ms"
+        else:
+            before = "  (skipped: dense N x N)"
+        after = timeit(lambda: top_k((corpus @ query[0].T).toarray().ravel(), 5), repeat).mean()
+        print(f"{n_rows:>9} rows   full matrix {before}   query vs corpus {after:10.2f} ms")
+
+
+# Synthetic corpus: each row blends two reference rows with random weights, so
+# sizes beyond the ~1000 shipped startups do not degenerate into duplicates.
+def _blended_corpus(reference, n_rows, rng):
+    from scipy.sparse import diags
+    left = reference[rng.integers(0, reference.shape[0], n_rows)]
+    right = reference[rng.integers(0, reference.shape[0], n_rows)]
+    return (diags(rng.random(n_rows)) @ left + right).tocsr()
+
+
+# recall@k of the LSH index against the exact index, plus query latency and
+# build time, on blended corpora of increasing size
+def bench_peer_index(args):
+    from feature_store import get_feature_store
+    from peer_index import ExactPeerIndex, LSHPeerIndex
+    store = get_feature_store("startup_og.csv", registry.get("startup_pipeline.pkl"))
+    rng = np.random.default_rng(13)
+    k = 10
+    for n_rows in (10_000, 100_000, 1_000_000):
+        corpus = _blended_corpus(store.index.vectors, n_rows, rng)
+        queries = _blended_corpus(store.index.vectors, 100, rng)
+        start = time.perf_counter()
+        exact = ExactPeerIndex().add(corpus)
+        exact_build = time.perf_counter() - start
+        start = time.perf_counter()
+        lsh = LSHPeerIndex().add(corpus)
+        lsh.query(queries[0], k)  # includes the first table sort in the build time
+        lsh_build = time.perf_counter() - start
+        recalls, exact_ms, lsh_ms = [], [], []
+        for i in range(queries.shape[0]):
+            query = queries[i]
+            start = time.perf_counter()
+            expected = exact.query(query, k)
+            exact_ms.append(time.perf_counter() - start)
+            start = time.perf_counter()
+            found = lsh.query(query, k)
+            lsh_ms.append(time.perf_counter() - start)
+            # Count a hit for any result scoring at least the exact k-th score,
+            # so tied neighbours are not penalised
+            scores = exact.scores(query)
+            recalls.append(np.mean(scores[found] >= scores[expected].min() - 1e-12))
+        print(f"{n_rows:>9} rows   recall@{k} {np.mean(recalls):.3f}   exact {np.mean(exact_ms) * 1000:8.2f} ms/query   "
+              f"lsh {np.mean(lsh_ms) * 1000:8.2f} ms/query   build exact {exact_build:6.2f} s / lsh {lsh_build:6.2f} s")
+
+
+# Single-row scoring latency: sklearn pipeline versus the compiled scorer,
+# for the bare probability and for the full predict_startup result
+def bench_compiled(args):
+    from compiled_scorer import get_scorer, predict_startup_compiled
+    from pipeline import _prepare_prediction_frame
+    pipeline = registry.get("startup_pipeline.pkl")
+    scorer = get_scorer(pipeline)
+    record = dict(SAMPLE_INPUT)
+    report("pipeline.predict_proba (one row)", timeit(
+        lambda: pipeline.predict_proba(_prepare_prediction_frame(pd.DataFrame([dict(record)]))), args.repeat))
+    report("CompiledScorer.predict_proba (one row)", timeit(lambda: scorer.predict_proba([record]), args.repeat))
+    report("predict_startup", timeit(lambda: predict_startup(dict(record)), args.repeat))
+    report("predict_startup_compiled", timeit(lambda: predict_startup_compiled(dict(record)), args.repeat))
+
+
+# p50/p99 latency of /predict against a running API, alone and while
+# --concurrency clients hammer /peer_comparison. Requests shed with 503 by the
+# worker pool's backpressure are counted rather than timed.
+def bench_concurrency(args):
+    import asyncio
+    import httpx
+
+    body = {key.replace(" ", "_"): value for key, value in SAMPLE_INPUT.items()}
+
+    async def predict_latencies(client, n, label):
+        timings, rejected = [], 0
+        for _ in range(n):
+            start = time.perf_counter()
+            response = await client.post("/predict", json=body)
+            if response.status_code == 503:
+                rejected += 1
+                continue
+            response.raise_for_status()
+            timings.append(time.perf_counter() - start)
+        if timings:
+            report(label, np.array(timings) * 1000)
+        if rejected:
+            print(f"{label:<40} {rejected} of {n} requests rejected with 503")
+
+    async def peer_load(client, stop):
+        while not stop.is_set():
+            response = await client.post("/peer_comparison", json=body)
+            if response.status_code == 503:
+                await asyncio.sleep(float(response.headers.get("Retry-After", 1)))
+
+    async def run():
+        async with httpx.AsyncClient(base_url=args.url, timeout=120) as client:
+            await predict_latencies(client, args.repeat, "/predict, idle server")
+            stop = asyncio.Event()
+            load = [asyncio.create_task(peer_load(client, stop)) for _ in range(args.concurrency)]
+            await asyncio.sleep(1)
+            await predict_latencies(client, args.repeat, f"/predict, {args.concurrency} peer clients")
+            stop.set()
+            await asyncio.gather(*load)
+
+    asyncio.run(run())
+
+
+# Cold-start cost of an API worker: fresh-interpreter import time of pipeline
+# and app, and time from launching uvicorn to the first /predict response
+def bench_startup(args):
+    import subprocess
+    import sys
+    import httpx
+
+    def import_time(module):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", f"import {module}"], check=True)
+        return time.perf_counter() - start
+
+    repeat = min(args.repeat, 5)
+    for module in ("pipeline", "app"):
+        report(f"import {module} (fresh interpreter)", np.array([import_time(module) for _ in range(repeat)]) * 1000)
+
+    body = {key.replace(" ", "_"): value for key, value in SAMPLE_INPUT.items()}
+    url = f"http://127.0.0.1:{args.port}"
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app:app", "--port", str(args.port), "--log-level", "warning"])
+        try:
+            while True:
+                try:
+                    if httpx.post(f"{url}/predict", json=body, timeout=60).status_code == 200:
+                        break
+                except httpx.TransportError:
+                    time.sleep(0.05)
+                if server.poll() is not None:
+                    raise RuntimeError("uvicorn exited before answering")
+            timings.append(time.perf_counter() - start)
+        finally:
+            server.terminate()
+            server.wait()
+    report("uvicorn launch -> first /predict", np.array(timings) * 1000)
+
+
+# Peak RSS and wall time of train_pipeline against the chunked trainer on a
+# --rows synthetic dataset. Each run is a fresh interpreter in a scratch
+# directory so artifacts and peak memory don't leak between them.
+_TRAIN_RUNS = {
+    "train_pipeline (in memory)": "from training import train_pipeline; train_pipeline(path, 'p.pkl', cache_dir=None)",
+    "streaming, QuantileDMatrix": "from streaming_training import train_pipeline_streaming; train_pipeline_streaming(path, 'p.pkl')",
+    "streaming, external memory": "from streaming_training import train_pipeline_streaming; train_pipeline_streaming(path, 'p.pkl', external_memory=True)",
+}
+
+
+def bench_train_memory(args):
+    import os
+    import subprocess
+    import sys
+    import tempfile
+    from generate_synthetic_data import write_synthetic_data
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "synthetic.csv")
+        write_synthetic_data(path, args.rows, seed=13)
+        print(f"{args.rows} rows, {os.path.getsize(path) / 2**20:.0f} MiB CSV")
+        for name, statement in _TRAIN_RUNS.items():
+            code = (
+                "import contextlib, io, resource, sys, time\n"
+                f"sys.path.insert(0, {here!r}); path = {path!r}\n"
+                "start = time.perf_counter()\n"
+                f"with contextlib.redirect_stdout(io.StringIO()): {statement}\n"
+                "print(time.perf_counter() - start, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)\n"
+            )
+            result = subprocess.run([sys.executable, "-W", "ignore", "-c", code], cwd=tmp_dir, capture_output=True, text=True)
+            if result.returncode != 0:
+                print(f"{name:<40} failed: {result.stderr.strip().splitlines()[-1]}")
+                continue
+            seconds, max_rss_kb = result.stdout.split()[-2:]
+            print(f"{name:<40} peak RSS {int(max_rss_kb) / 1024:8.0f} MiB   wall {float(seconds):8.1f} s")
+
+
+BENCHMARKS = {
+    "predict": bench_predict,
+    "batch": bench_batch,
+    "converters": bench_converters,
+    "normalize": bench_normalize,
+    "input": bench_input,
+    "peers": bench_peers,
+    "similarity": bench_similarity,
+    "peer_index": bench_peer_index,
+    "concurrency": bench_concurrency,
+    "compiled": bench_compiled,
+    "startup": bench_startup,
+    "train_memory": bench_train_memory,
+}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backend micro-benchmarks")
+    parser.add_argument("benchmark", choices=sorted(BENCHMARKS))
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+    BENCHMARKS[args.benchmark](args)
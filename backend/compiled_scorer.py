@@ -0,0 +1,295 @@
+import json
+import math
+import os
+import re
+import sys
+import weakref
+from datetime import datetime
+
+import numpy as np
+
+from model_registry import registry, save_artifact
+from pipeline import W_H, W_O, parse_amount, parse_employees, parse_confidence, is_placeholder, _cached_parse, _summarise_predictions
+
+DEFAULT_SCORER_PATH = "startup_scorer.pkl"
+
+_scorers = weakref.WeakKeyDictionary()
+
+
+def _is_nan(value):
+    return isinstance(value, float) and math.isnan(value)
+
+
+def _to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+# The numeric columns go through astype(str) and pd.to_numeric in
+# InputNormalizer; the placeholders are the same is_placeholder values
+def _clean_number(value):
+    text = str(value)
+    # float() also takes "1_000" and non-ASCII digits, pd.to_numeric does not
+    if is_placeholder(text) or "_" in text or not text.isascii():
+        return math.nan
+    return _to_float(text)
+
+
+def _clean_label(value):
+    text = str(value)
+    return "nan" if is_placeholder(text) else text
+
+
+def _scaler(pipeline_step):
+    return pipeline_step.named_steps["scaler"].mean_, pipeline_step.named_steps["scaler"].scale_
+
+
+# XGBoost trees flattened into one node table. Children are absolute node
+# ids; leaves point at themselves so a fixed number of steps walks every
+# tree to its leaf.
+class _Forest:
+    def __init__(self, booster):
+        model = json.loads(booster.save_raw("json"))
+        learner = model["learner"]
+        if learner["objective"]["name"] != "binary:logistic":
+            raise ValueError(f"Unsupported objective {learner['objective']['name']}")
+        trees = learner["gradient_booster"]["model"]["trees"]
+        base_score = float(learner["learner_model_param"]["base_score"].strip("[]"))
+        self.base_margin = np.float32(math.log(base_score / (1 - base_score)))
+        features, thresholds, lefts, rights, default_left, roots = [], [], [], [], [], []
+        offset = 0
+        for tree in trees:
+            if any(tree["split_type"]):
+                raise ValueError("Categorical splits are not supported")
+            left = np.array(tree["left_children"])
+            right = np.array(tree["right_children"])
+            is_leaf = left == -1
+            ids = np.arange(len(left))
+            lefts.append(np.where(is_leaf, ids, left) + offset)
+            rights.append(np.where(is_leaf, ids, right) + offset)
+            features.append(np.where(is_leaf, 0, tree["split_indices"]))
+            thresholds.append(np.array(tree["split_conditions"], dtype=np.float32))
+            default_left.append(np.array(tree["default_left"], dtype=bool))
+            roots.append(offset)
+            offset += len(left)
+        self.feature = np.concatenate(features)
+        # For leaves split_conditions holds the leaf value
+        self.threshold = np.concatenate(thresholds)
+        self.left = np.concatenate(lefts)
+        self.right = np.concatenate(rights)
+        self.default_left = np.concatenate(default_left)
+        self.roots = np.array(roots)
+        self.depth = max(self._depth(tree) for tree in trees)
+
+    @staticmethod
+    def _depth(tree):
+        depth = np.zeros(len(tree["left_children"]), dtype=int)
+        for node, (left, right) in enumerate(zip(tree["left_children"], tree["right_children"])):
+            if left != -1:
+                depth[left] = depth[right] = depth[node] + 1
+        return depth.max()
+
+    def margin(self, X):
+        X = X.astype(np.float32)
+        rows = np.arange(len(X))[:, None]
+        node = np.broadcast_to(self.roots, (len(X), len(self.roots)))
+        for _ in range(self.depth):
+            value = X[rows, self.feature[node]]
+            go_left = np.where(np.isnan(value), self.default_left[node], value < self.threshold[node])
+            node = np.where(go_left, self.left[node], self.right[node])
+        # XGBoost adds tree outputs to the base margin one by one in float32
+        leaves = np.concatenate([np.full((len(X), 1), self.base_margin), self.threshold[node]], axis=1)
+        return np.cumsum(leaves, axis=1, dtype=np.float32)[:, -1]
+
+
+# The fitted preprocessor -> DerivedFeatures -> XGBClassifier chain reduced
+# to lookup tables and arrays: imputer fills, scaler means/scales, ordinal
+# categories, the frequency map, the TF-IDF vocabulary/idf and the flattened
+# trees. Scores plain dicts keyed by the pipeline's column names without
+# building a DataFrame or going through sklearn dispatch.
+#
+# The Non-Financial Score uses the Hardwork Factor mean/std DerivedFeatures
+# learned at fit; pipelines pickled without them leave it NaN, as they do.
+class CompiledScorer:
+    # sha256 of the pipeline file this scorer was exported from, if any
+    source_sha256 = None
+
+    def __init__(self, pipeline):
+        preprocessor = pipeline.named_steps["preprocessor"]
+        derived = pipeline.named_steps["derived"]
+        steps = preprocessor.named_transformers_
+
+        self.numeric_columns = list(dict(
+            (name, columns) for name, _, columns in preprocessor.transformers_)["num"])
+        self.numeric_medians = steps["num"].named_steps["imputer"].statistics_.astype(float)
+        self.numeric_scale = _scaler(steps["num"])
+        self.revenue_scale = _scaler(steps["revenue"])
+        self.employees_scale = _scaler(steps["employees"])
+        self.funding_mean = float(steps["funding"].named_steps["imputer"].statistics_[0])
+        self.funding_scale = _scaler(steps["funding"])
+        self.years_median = float(steps["years"].named_steps["imputer"].statistics_[0])
+        self.years_scale = _scaler(steps["years"])
+        self.growth_confidence_scale = _scaler(steps["growth_confidence"])
+
+        self.categorical_columns = list(dict(
+            (name, columns) for name, _, columns in preprocessor.transformers_)["cat"])
+        self.categories = [
+            {category: float(code) for code, category in enumerate(categories)}
+            for categories in steps["cat"].named_steps["encoder"].categories_
+        ]
+        self.frequency_map = dict(steps["freq"].named_steps["freq_encoder"].freq_map_)
+
+        vectorizer = steps["industries"].named_steps["encoder"].vectorizer
+        self.token_pattern = re.compile(vectorizer.token_pattern)
+        self.vocabulary = dict(vectorizer.vocabulary_)
+        self.idf = vectorizer.idf_.astype(float)
+
+        self.n_features = len(derived.get_feature_names_out(preprocessor.get_feature_names_out()))
+        self.hardwork_idx = self.n_features - 2
+        self.hardwork_mean = getattr(derived, "hardwork_mean_", None)
+        self.hardwork_std = getattr(derived, "hardwork_std_", None)
+        self.forest = _Forest(pipeline.named_steps["classifier"].get_booster())
+
+    def _industries(self, value):
+        text = "nan" if value is None else str(value)
+        text = "Unknown" if is_placeholder(text) else text.strip()
+        weights = np.zeros(len(self.vocabulary))
+        for token in self.token_pattern.findall(text.lower()):
+            column = self.vocabulary.get(token)
+            if column is not None:
+                weights[column] += 1
+        weights *= self.idf
+        norm = np.sqrt(np.dot(weights, weights))
+        return weights / norm if norm > 0 else weights
+
+    def _non_financial(self, hardwork, growth_confidence):
+        if self.hardwork_mean is None:
+            return math.nan
+        hardwork = 0.0 if math.isnan(hardwork) else hardwork
+        with np.errstate(divide='ignore', invalid='ignore'):
+            h_prime = (np.float64(hardwork) - self.hardwork_mean) / np.float64(self.hardwork_std)
+        return W_H * h_prime + W_O * growth_confidence
+
+    def features(self, records):
+        X = np.empty((len(records), self.n_features))
+        current_year = datetime.now().year
+        for i, record in enumerate(records):
+            get = lambda column: record.get(column, math.nan)
+            numeric = np.array([_clean_number(get(column)) for column in self.numeric_columns])
+            numeric = np.where(np.isnan(numeric), self.numeric_medians, numeric)
+            revenue = _cached_parse(parse_amount, _clean_label(get("Estimated Revenue")))
+            employees = _cached_parse(parse_employees, str(get("Number of Employees")))
+            funding = _cached_parse(parse_amount, _clean_label(get("Total Funding Amount")))
+            founded = _clean_number(get("Founded Date"))
+            years = current_year - founded if founded <= current_year else math.nan
+            growth_confidence = _cached_parse(parse_confidence, _clean_label(get("Growth Confidence")))
+
+            revenue = ((0.0 if math.isnan(revenue) else revenue) - self.revenue_scale[0][0]) / self.revenue_scale[1][0]
+            employees = ((0.0 if math.isnan(employees) else employees) - self.employees_scale[0][0]) / self.employees_scale[1][0]
+            funding = ((self.funding_mean if math.isnan(funding) else funding) - self.funding_scale[0][0]) / self.funding_scale[1][0]
+            years = ((self.years_median if math.isnan(years) else years) - self.years_scale[0][0]) / self.years_scale[1][0]
+            growth_confidence = (growth_confidence - self.growth_confidence_scale[0][0]) / self.growth_confidence_scale[1][0]
+
+            categorical = []
+            for column, categories in zip(self.categorical_columns, self.categories):
+                value = get(column)
+                categorical.append(categories.get("Unknown" if _is_nan(value) else value, -1.0))
+            location = get("Headquarters Location")
+            frequency = self.frequency_map.get("Unknown" if _is_nan(location) else str(location), 0.0)
+
+            n_numeric = len(self.numeric_columns)
+            X[i, :n_numeric] = (numeric - self.numeric_scale[0]) / self.numeric_scale[1]
+            X[i, n_numeric:n_numeric + 4] = (revenue, employees, funding, years)
+            offset = n_numeric + 4
+            X[i, offset:offset + len(categorical)] = categorical
+            offset += len(categorical)
+            X[i, offset] = frequency
+            X[i, offset + 1:offset + 1 + len(self.vocabulary)] = self._industries(get("Industries"))
+            offset += 1 + len(self.vocabulary)
+            X[i, offset] = growth_confidence
+            # DerivedFeatures: ratios of the scaled columns, with 0 denominators read as 1
+            X[i, offset + 1] = funding / (years if years != 0 else 1)
+            hardwork = revenue / (employees if employees != 0 else 1)
+            X[i, offset + 2] = hardwork
+            X[i, offset + 3] = self._non_financial(hardwork, growth_confidence)
+        return X
+
+    def predict_proba(self, records):
+        margin = self.forest.margin(self.features(records))
+        active = np.float32(1) / (np.float32(1) + np.exp(-margin))
+        return np.stack([np.float32(1) - active, active], axis=1)
+
+    # Same contract as InferenceEngine.run, on a list of dicts
+    def run(self, records):
+        X = self.features(records)
+        margin = self.forest.margin(X)
+        active = np.float32(1) / (np.float32(1) + np.exp(-margin))
+        probs = np.stack([np.float32(1) - active, active], axis=1)
+        return (probs[:, 1] > 0.5).astype(int), probs, X[:, self.hardwork_idx]
+
+
+def compile_pipeline(pipeline):
+    return CompiledScorer(pipeline)
+
+
+def get_scorer(pipeline):
+    scorer = _scorers.get(pipeline)
+    if scorer is None:
+        scorer = compile_pipeline(pipeline)
+        _scorers[pipeline] = scorer
+    return scorer
+
+
+# The scorer is written next to the pipeline it was compiled from:
+# startup_pipeline.pkl -> startup_scorer.pkl, models/v3.pkl -> models/v3_scorer.pkl
+def scorer_path_for(pipeline_path):
+    directory, name = os.path.split(pipeline_path)
+    stem = os.path.splitext(name)[0]
+    if "pipeline" in stem:
+        head, _, tail = stem.rpartition("pipeline")
+        stem = f"{head}scorer{tail}"
+    else:
+        stem = f"{stem}_scorer"
+    return os.path.join(directory, f"{stem}.pkl")
+
+
+# source_path is the saved pipeline file; its digest goes into the scorer so
+# load_scorer can tell whether the scorer still matches that file
+def export_scorer(pipeline, path=DEFAULT_SCORER_PATH, source_path=None):
+    scorer = compile_pipeline(pipeline)
+    if source_path is not None:
+        scorer.source_sha256 = registry.digest(source_path)
+    save_artifact(scorer, path)
+    return scorer
+
+
+# The scorer exported next to pipeline_path when it was compiled from the
+# pipeline file now there. Otherwise (not exported, or left behind by a
+# newly published pipeline) it is compiled from the pipeline itself.
+def load_scorer(pipeline_path="startup_pipeline.pkl"):
+    scorer_path = scorer_path_for(pipeline_path)
+    try:
+        scorer = registry.get(scorer_path)
+    except FileNotFoundError:
+        scorer = None
+    if scorer is not None and scorer.source_sha256 is not None and scorer.source_sha256 == registry.digest(pipeline_path):
+        return scorer
+    return get_scorer(registry.get(pipeline_path))
+
+
+# predict_startup on the compiled scorer; same result dict, no DataFrame
+def predict_startup_compiled(startup_data, pipeline_path="startup_pipeline.pkl", target_encoder_path="target_encoder.pkl"):
+    scorer = load_scorer(pipeline_path)
+    le = registry.get(target_encoder_path)
+    prediction, prediction_probs, hardwork = scorer.run([startup_data])
+    return _summarise_predictions(le, prediction, prediction_probs, hardwork)[0]
+
+
+if __name__ == "__main__":
+    # python compiled_scorer.py [pipeline.pkl] [scorer.pkl]
+    pipeline_path = sys.argv[1] if len(sys.argv) > 1 else "startup_pipeline.pkl"
+    scorer_path = sys.argv[2] if len(sys.argv) > 2 else scorer_path_for(pipeline_path)
+    export_scorer(registry.get(pipeline_path), scorer_path, source_path=pipeline_path)
+    print(f"Compiled {pipeline_path} to {scorer_path}")
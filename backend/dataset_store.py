@@ -0,0 +1,140 @@
+import argparse
+import json
+import logging
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from model_registry import _file_digest, file_signature
+from pipeline import clean_reference_frame
+
+logger = logging.getLogger(__name__)
+
+# Bump when the cleanup or the on-disk layout changes so older files are
+# treated as stale and the CSV is parsed instead
+INGEST_FORMAT = 2
+METADATA_KEY = b"startup_ipd.dataset"
+DEFAULT_DATASETS = ("startup_og.csv", "startups.csv", "data_2.csv")
+
+
+def columnar_path(data_path):
+    return os.path.splitext(data_path)[0] + ".arrow"
+
+
+def _read_source(data_path):
+    if data_path.endswith(".parquet"):
+        return pd.read_parquet(data_path)
+    return pd.read_csv(data_path)
+
+
+# Float columns keep NaN as a value rather than an Arrow null, so reading
+# them back is a view into the mapped file instead of a null-filling copy.
+def _to_arrow(df):
+    import pyarrow as pa
+    arrays = []
+    for col in df.columns:
+        values = df[col]
+        if values.dtype.kind == "f":
+            arrays.append(pa.array(values.to_numpy(), from_pandas=False))
+        else:
+            arrays.append(pa.array(values, from_pandas=True))
+    return pa.Table.from_arrays(arrays, names=[str(col) for col in df.columns])
+
+
+# Parse and clean a CSV (or Parquet) file once and write it next to the
+# source as an uncompressed Arrow IPC file. The source digest goes into the
+# schema metadata; loaders only trust the file while it matches.
+def ingest_dataset(data_path, output_path=None):
+    import pyarrow as pa
+    output_path = output_path or columnar_path(data_path)
+    df = clean_reference_frame(_read_source(data_path))
+    table = _to_arrow(df)
+    table = table.replace_schema_metadata({METADATA_KEY: json.dumps({
+        "format": INGEST_FORMAT,
+        "source": os.path.basename(data_path),
+        "source_sha256": _source_digest(data_path),
+    })})
+    tmp_path = f"{output_path}.{os.getpid()}.tmp"
+    with pa.OSFile(tmp_path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    os.replace(tmp_path, output_path)
+    logger.info(f"Ingested {data_path} -> {output_path} ({len(df)} rows)")
+    return output_path
+
+
+# Source digests by path, re-hashed only when the file's (mtime, size)
+# signature changes, as ModelRegistry does for pickles
+_digests = {}
+_digests_lock = threading.Lock()
+
+
+def _source_digest(data_path):
+    signature = file_signature(data_path)
+    with _digests_lock:
+        entry = _digests.get(data_path)
+    if entry is not None and entry[0] == signature:
+        return entry[1]
+    digest = _file_digest(data_path)
+    with _digests_lock:
+        _digests[data_path] = (signature, digest)
+    return digest
+
+
+def _open_table(path):
+    import pyarrow as pa
+    # The buffers keep the mapping alive for as long as a column refers to it
+    return pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+
+
+def _ingested_table(data_path):
+    path = data_path if data_path.endswith(".arrow") else columnar_path(data_path)
+    if not os.path.exists(path):
+        return None
+    try:
+        table = _open_table(path)
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable columnar dataset {path}: {str(e)}")
+        return None
+    if path == data_path:
+        return table
+    metadata = json.loads((table.schema.metadata or {}).get(METADATA_KEY, b"{}"))
+    if metadata.get("format") != INGEST_FORMAT or metadata.get("source_sha256") != _source_digest(data_path):
+        logger.warning(f"{path} is out of date with {data_path}; re-run dataset_store.py to refresh it")
+        return None
+    return table
+
+
+def _to_frame(table):
+    df = table.to_pandas(split_blocks=True)
+    # Arrow hands string nulls back as None; the CSV path has NaN there
+    for col in table.column_names:
+        if table.column(col).null_count and df[col].dtype == object:
+            df[col] = df[col].where(df[col].notna(), np.nan)
+    return df
+
+
+# The cleaned frame for a dataset: read from its ingested Arrow file when
+# that is current, otherwise parsed and cleaned from the source as before
+def load_dataset(data_path):
+    table = _ingested_table(data_path)
+    if table is None:
+        return clean_reference_frame(_read_source(data_path))
+    return _to_frame(table)
+
+
+def ingested_chunks(data_path, chunk_size):
+    table = _ingested_table(data_path)
+    if table is None:
+        return None
+    return (_to_frame(table.slice(start, chunk_size)) for start in range(0, table.num_rows, chunk_size))
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Convert the startup CSVs to cleaned, memory-mappable Arrow files")
+    parser.add_argument("paths", nargs="*", default=list(DEFAULT_DATASETS))
+    args = parser.parse_args()
+    for path in args.paths:
+        print(f"{path} -> {ingest_dataset(path)}")
@@ -0,0 +1,206 @@
+import copy
+import logging
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+from scipy.sparse import csr_matrix, hstack
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.preprocessing import normalize
+
+from dataset_store import load_dataset
+from model_registry import file_signature
+from peer_index import make_peer_index
+from pipeline import W_H, W_O, PEER_INPUT_FEATURES
+
+logger = logging.getLogger(__name__)
+
+
+def _industry_documents(industries):
+    return industries.apply(
+        lambda x: " ".join([i.strip() for i in str(x).split(",")]) if isinstance(x, str) else "Unknown"
+    )
+
+
+# Everything the peer comparison endpoints need from the reference dataset,
+# computed once per (dataset file, pipeline) instead of on every request:
+# the transformed reference matrix, the per-feature means/stds used for
+# z-scores, and a peer index over the TF-IDF industry matrix + encoded
+# investment stage (exact by default, PEER_INDEX=lsh for the approximate
+# one). A request only transforms its own row and compares against these.
+#
+# Statistics come from the reference rows alone; the old per-request path
+# also folded the incoming startup into the z-scores, TF-IDF idf and stage
+# codes. That is one row out of ~1000, but it is enough to reorder near-tied
+# peers, swap which ones make the top five, and flip features whose z-score
+# difference is close to zero between Pros and Cons. The old path also
+# dropped the first-ranked row as "itself", so when a reference copy of the
+# startup tied with it, the startup came back as its own peer.
+class ReferenceFeatureStore:
+    def __init__(self, dataset_path, pipeline, index=None):
+        self.pipeline = pipeline
+        self.preprocessor = pipeline.named_steps['preprocessor']
+        self.derived = pipeline.named_steps['derived']
+
+        df = load_dataset(dataset_path)
+        self.columns = df.columns
+        self.names = df["Organization Name"].values if "Organization Name" in df.columns else np.full(len(df), np.nan, dtype=object)
+        self.name_rows = {}
+        for i, name in enumerate(self.names):
+            self.name_rows.setdefault(name, []).append(i)
+        self.name_index = {name: rows[0] for name, rows in self.name_rows.items()}
+
+        feature_names = self.preprocessor.get_feature_names_out()
+        derived = self.derived.transform(self.preprocessor.transform(df))
+        self.feature_names = list(self.derived.get_feature_names_out(feature_names))
+        self.selected_features = [f for f in PEER_INPUT_FEATURES if f in self.feature_names]
+        self.selected_idx = np.array([self.feature_names.index(f) for f in self.selected_features])
+        self.hardwork_idx = self.feature_names.index("Hardwork Factor")
+        self.growth_confidence_idx = self.feature_names.index("growth_confidence_converted")
+        self.non_financial_idx = self.feature_names.index("Non-Financial Score (N)")
+
+        # Pipelines fitted with Hardwork Factor statistics score the
+        # Non-Financial Score consistently on their own. Older ones leave it
+        # NaN, so standardise against the reference distribution instead.
+        self.legacy_non_financial = not hasattr(self.derived, "hardwork_mean_")
+        hardwork = np.nan_to_num(derived[:, self.hardwork_idx].astype(float), nan=0.0)
+        self.hardwork_mean = hardwork.mean()
+        self.hardwork_std = hardwork.std()
+        derived = self._standardise_non_financial(derived.astype(float))
+
+        self.values = derived[:, self.selected_idx].astype(float)
+        self.means = np.nanmean(self.values, axis=0)
+        self.stds = np.nanstd(self.values, axis=0)
+        self.z_scores = self.zscore(self.values)
+
+        if "Investment Stage" in df.columns:
+            stages = df["Investment Stage"].astype(str).values
+            self.stage_classes, stage_codes = np.unique(stages, return_inverse=True)
+        else:
+            self.stage_classes, stage_codes = None, np.zeros(len(df), dtype=int)
+        if "Industries" in df.columns:
+            self.vectorizer = TfidfVectorizer(stop_words="english")
+            industry_matrix = self.vectorizer.fit_transform(_industry_documents(df["Industries"]))
+        else:
+            self.vectorizer = None
+            industry_matrix = csr_matrix((len(df), 1))
+        self.on_release = None
+        self.index = index if index is not None else make_peer_index()
+        self.index.add(hstack([industry_matrix, stage_codes.reshape(-1, 1)]).tocsr())
+
+    def __len__(self):
+        return len(self.values)
+
+    def zscore(self, values):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return (values - self.means) / self.stds
+
+    def _standardise_non_financial(self, derived):
+        if self.legacy_non_financial:
+            hardwork = np.nan_to_num(derived[:, self.hardwork_idx], nan=0.0)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                h_prime = (hardwork - self.hardwork_mean) / self.hardwork_std
+            growth_confidence = np.nan_to_num(derived[:, self.growth_confidence_idx], nan=0.0)
+            derived[:, self.non_financial_idx] = W_H * h_prime + W_O * growth_confidence
+        return derived
+
+    # Derived features for incoming rows; see _standardise_non_financial
+    def transform(self, frame):
+        frame = frame.reindex(columns=self.columns.union(frame.columns, sort=False))
+        derived = self.derived.transform(self.preprocessor.transform(frame)).astype(float)
+        return self._standardise_non_financial(derived)[:, self.selected_idx]
+
+    def query_vectors(self, frame):
+        if self.vectorizer is not None:
+            industries = frame["Industries"] if "Industries" in frame.columns else pd.Series([np.nan] * len(frame))
+            industry_matrix = self.vectorizer.transform(_industry_documents(industries))
+        else:
+            industry_matrix = csr_matrix((len(frame), 1))
+        if self.stage_classes is not None:
+            stages = frame["Investment Stage"].astype(str).values if "Investment Stage" in frame.columns else np.full(len(frame), "nan")
+            # Unseen stages get the code LabelEncoder would have given them
+            stage_codes = np.searchsorted(self.stage_classes, stages)
+        else:
+            stage_codes = np.zeros(len(frame), dtype=int)
+        return normalize(hstack([industry_matrix, stage_codes.reshape(-1, 1)]).tocsr())
+
+    # A startup is never its own peer: the incoming row is not in the index,
+    # and reference rows under the same name are skipped
+    def most_similar(self, frame, k, exclude=None):
+        excluded = self.name_rows.get(exclude, [])
+        indices = self.index.query(self.query_vectors(frame)[0], k + len(excluded))
+        return indices[~np.isin(indices, excluded)][:k]
+
+    # The reference matrix, z-scores and peer index arrays dominate the
+    # store's size. detach() hands them out separately so worker processes
+    # can map one shared copy; attach() rebinds a skeleton to them and to the
+    # worker's own copy of the pipeline.
+    def detach(self):
+        skeleton = copy.copy(self)
+        skeleton.pipeline = skeleton.preprocessor = skeleton.derived = None
+        skeleton.values = skeleton.z_scores = None
+        skeleton.index, index_arrays = self.index.detach()
+        arrays = {"values": self.values, "z_scores": self.z_scores}
+        arrays.update({f"index.{name}": array for name, array in index_arrays.items()})
+        return skeleton, arrays
+
+    def attach(self, pipeline, arrays, on_release=None):
+        self.pipeline = pipeline
+        self.preprocessor = pipeline.named_steps['preprocessor']
+        self.derived = pipeline.named_steps['derived']
+        self.values = arrays["values"]
+        self.z_scores = arrays["z_scores"]
+        self.index.attach({name[len("index."):]: array for name, array in arrays.items() if name.startswith("index.")})
+        self.on_release = on_release
+        return self
+
+    @property
+    def shared(self):
+        return self.on_release is not None
+
+    # Drops every view of the attached arrays, then lets the owner unmap them
+    def release(self):
+        on_release, self.on_release = self.on_release, None
+        self.values = self.z_scores = self.index = None
+        if on_release is not None:
+            on_release()
+
+
+_stores = {}
+_lock = threading.Lock()
+# Shared (attached) stores replaced by a private rebuild in this process
+fallback_rebuilds = 0
+
+
+def get_feature_store(dataset_path, pipeline):
+    path = os.path.abspath(dataset_path)
+    signature = file_signature(path)
+    entry = _stores.get(path)
+    if entry is not None and entry[0] == signature and entry[1].pipeline is pipeline:
+        return entry[1]
+    global fallback_rebuilds
+    with _lock:
+        entry = _stores.get(path)
+        if entry is None or entry[0] != signature or entry[1].pipeline is not pipeline:
+            if entry is not None and entry[1].shared:
+                # A worker whose pipeline or dataset was swapped under it no
+                # longer matches the shared arrays; unmap them before building
+                # a private copy so the old block is not kept alive as well
+                fallback_rebuilds += 1
+                logger.warning(f"Shared feature store for {path} is stale (pipeline or dataset changed); "
+                               f"building a private copy in process {os.getpid()} ({fallback_rebuilds} so far)")
+                _stores.pop(path)
+                entry[1].release()
+            entry = (signature, ReferenceFeatureStore(path, pipeline))
+            _stores[path] = entry
+    return entry[1]
+
+
+# Registers a store built elsewhere (a worker process attaching to shared
+# arrays) so get_feature_store() serves it until the dataset or pipeline changes
+def install_feature_store(dataset_path, store):
+    path = os.path.abspath(dataset_path)
+    with _lock:
+        _stores[path] = (file_signature(path), store)
+    return store
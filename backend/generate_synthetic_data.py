@@ -3,9 +3,6 @@ import numpy as np
 from faker import Faker
 import random
 
-# Initialize Faker for realistic text data
-fake = Faker('en_IN')
-
 # Define choices based on pipeline requirements
 industries_choices = [
     'Agriculture and Allied Industries', 'Auto Components', 'Automobiles', 'Aviation', 'Ayush',
@@ -96,173 +93,177 @@ def clean_funding_amount(amount):
 
 # Function to generate Operating Status with 17-18% Closed
 def determine_operating_status(row, closed_prob=0.175):
-    score = 0
-    # High influence factors
-    revenue_weights = {
-        '$10B+': 0.5, '$1B to $10B': 0.4, '$100M to $500M': 0.3, '$50M to $100M': 0.25,
-        '$10M to $50M': 0.2, '$1M to $10M': 0.15, 'Less than $1M': 0.1
-    }
-    score += revenue_weights.get(row['Estimated Revenue'], 0.0)
-    
-    funding_amount = clean_funding_amount(row['Total Funding Amount'])
-    if funding_amount > 50_000_000:
-        score += 0.4
-    elif funding_amount > 10_000_000:
-        score += 0.3
-    elif funding_amount > 1_000_000:
-        score += 0.2
-    elif funding_amount > 0:
-        score += 0.1
-    
-    employee_weights = {
-        '1001-5000': 0.4, '501-1000': 0.3, '251-500': 0.25, '101-250': 0.2,
-        '51-100': 0.15, '11-50': 0.1, '1-10': 0.05
-    }
-    score += employee_weights.get(row['Number of Employees'], 0.0)
-    
-    if row['Growth Confidence'] == 'High':
-        score += 0.3
-    elif row['Growth Confidence'] == 'Medium':
-        score += 0.15
-    elif row['Growth Confidence'] == 'Low':
-        score -= 0.1
-    
-    if row['Monthly Visit Growth'] > 100:
-        score += 0.3
-    elif row['Monthly Visit Growth'] > 0:
-        score += 0.15
-    elif row['Monthly Visit Growth'] < 0:
-        score -= 0.1
-    
-    # Moderate influence factors
-    if row['Number of Funding Rounds'] >= 4:
-        score += 0.15
-    elif row['Number of Funding Rounds'] >= 2:
-        score += 0.1
-    
-    years_active = 2025 - row['Founded Date']
-    if years_active <= 3:
-        score -= 0.1
-    elif years_active >= 7:
-        score += 0.1
-    
-    if row['Monthly visit'] > 100_000:
-        score += 0.15
-    elif row['Monthly visit'] > 10_000:
-        score += 0.1
-    
-    # Adjust score to target 17-18% Closed
-    prob_closed = 1.0 - min(1.0, max(0.0, score / 2.5))  # Invert score: lower score -> higher prob_closed
-    prob_closed = min(0.35, prob_closed * 0.8)  # Tune to ~0.175 average
+    prob_closed = closed_probability(pd.DataFrame([row]))[0]
     return 'Closed' if random.random() < prob_closed else 'Active'
 
+# Vectorized generation. Every column is drawn for a whole chunk at once
+# from one seeded Generator; names and founders come from pools built once
+# with Faker instead of per-row Faker calls.
+NAME_SUFFIXES = ['Labs', 'Technologies', 'Solutions', 'Innovations', 'Pvt Ltd']
+CLOSED_RATIO_RANGE = (0.17, 0.18)
+DEFAULT_CHUNK_SIZE = 500_000
+
+COLUMNS = [
+    'Organization Name', 'Industries', 'Headquarters Location', 'Estimated Revenue', 'Operating Status',
+    'Founded Date', 'Investment Stage', 'Industry Groups', 'Number of Founders', 'Founders',
+    'Number of Employees', 'Number of Funding Rounds', 'Funding Status', 'Total Funding Amount',
+    'Growth Category', 'Growth Confidence', 'Monthly visit', 'Monthly Visit Growth',
+    'Visit Duration Growth', 'Patents Granted', 'Visit Duration'
+]
+
+REVENUE_WEIGHTS = {
+    '$10B+': 0.5, '$1B to $10B': 0.4, '$100M to $500M': 0.3, '$50M to $100M': 0.25,
+    '$10M to $50M': 0.2, '$1M to $10M': 0.15, 'Less than $1M': 0.1
+}
+EMPLOYEE_WEIGHTS = {
+    '1001-5000': 0.4, '501-1000': 0.3, '251-500': 0.25, '101-250': 0.2,
+    '51-100': 0.15, '11-50': 0.1, '1-10': 0.05
+}
+CONFIDENCE_WEIGHTS = {'High': 0.3, 'Medium': 0.15, 'Low': -0.1}
+
+def build_name_pools(seed=None, companies=5000, people=5000):
+    pool_fake = Faker('en_IN')
+    pool_fake.seed_instance(seed)
+    return (
+        np.array([pool_fake.company() for _ in range(companies)], dtype=object),
+        np.array([pool_fake.name() for _ in range(people)], dtype=object),
+    )
+
+def _pick(rng, choices, size):
+    return np.array(choices, dtype=object)[rng.integers(len(choices), size=size)]
+
+def _lookup(values, weights):
+    return pd.Series(values).map(weights).fillna(0.0).to_numpy()
+
+# determine_operating_status's closed probability for a whole frame
+def closed_probability(df):
+    score = _lookup(df['Estimated Revenue'], REVENUE_WEIGHTS)
+    amounts = pd.Series(df['Total Funding Amount'])
+    funding = amounts.map({amount: clean_funding_amount(amount) for amount in amounts.unique()}).to_numpy(dtype=float)
+    score += np.select([funding > 50_000_000, funding > 10_000_000, funding > 1_000_000, funding > 0], [0.4, 0.3, 0.2, 0.1], 0.0)
+    score += _lookup(df['Number of Employees'], EMPLOYEE_WEIGHTS)
+    score += _lookup(df['Growth Confidence'], CONFIDENCE_WEIGHTS)
+    growth = np.asarray(df['Monthly Visit Growth'])
+    score += np.select([growth > 100, growth > 0, growth < 0], [0.3, 0.15, -0.1], 0.0)
+    rounds = np.asarray(df['Number of Funding Rounds'])
+    score += np.select([rounds >= 4, rounds >= 2], [0.15, 0.1], 0.0)
+    years_active = 2025 - np.asarray(df['Founded Date'])
+    score += np.select([years_active <= 3, years_active >= 7], [-0.1, 0.1], 0.0)
+    visits = np.asarray(df['Monthly visit'])
+    score += np.select([visits > 100_000, visits > 10_000], [0.15, 0.1], 0.0)
+    prob_closed = 1.0 - np.clip(score / 2.5, 0.0, 1.0)
+    return np.minimum(0.35, prob_closed * 0.8)
+
+def _founders(rng, people, counts):
+    names = people[rng.integers(len(people), size=(len(counts), counts.max()))]
+    founders = names[:, 0].copy()
+    for j in range(1, names.shape[1]):
+        founders = np.where(counts > j, founders + ', ' + names[:, j], founders)
+    return founders
+
+def _generate_chunk(rng, n, n_closed, companies, people):
+    closed = np.zeros(n, dtype=bool)
+    closed[rng.choice(n, size=n_closed, replace=False)] = True
+    industry = _pick(rng, industries_choices, n)
+    num_founders = np.maximum(1, rng.integers(0, 6, size=n))
+    # Closed startups draw from the lower end of the financial/growth ranges
+    def either(closed_values, active_values):
+        return np.where(closed, closed_values, active_values)
+    df = pd.DataFrame({
+        'Organization Name': companies[rng.integers(len(companies), size=n)] + ' ' + _pick(rng, NAME_SUFFIXES, n),
+        'Industries': industry,
+        'Headquarters Location': _pick(rng, headquarters_locations, n),
+        'Estimated Revenue': either(_pick(rng, estimated_revenue_choices[:3], n), _pick(rng, estimated_revenue_choices, n)),
+        'Operating Status': np.where(closed, 'Closed', 'Active'),
+        'Founded Date': rng.integers(2017, 2025, size=n),
+        'Investment Stage': either(_pick(rng, investment_stage_choices[:2], n), _pick(rng, investment_stage_choices, n)),
+        'Industry Groups': pd.Series(industry).map(industry_groups_map).fillna('Other').to_numpy(),
+        'Number of Founders': num_founders,
+        'Founders': _founders(rng, people, num_founders),
+        'Number of Employees': either(_pick(rng, number_employees_choices[:3], n), _pick(rng, number_employees_choices, n)),
+        'Number of Funding Rounds': either(rng.integers(0, 3, size=n), rng.integers(0, 8, size=n)),
+        'Funding Status': either(_pick(rng, funding_status_choices[:2], n), _pick(rng, funding_status_choices, n)),
+        'Total Funding Amount': either(_pick(rng, total_funding_amount_choices[:2], n), _pick(rng, total_funding_amount_choices, n)),
+        'Growth Category': _pick(rng, growth_category_choices, n),
+        'Growth Confidence': either(_pick(rng, ['Low', 'Medium'], n), _pick(rng, growth_confidence_choices, n)),
+        'Monthly visit': either(rng.integers(0, 50_001, size=n), rng.integers(0, 2_000_001, size=n)),
+        'Monthly Visit Growth': either(rng.uniform(-100, 50, size=n), rng.uniform(-100, 2000, size=n)),
+        'Visit Duration Growth': rng.uniform(-100, 10000, size=n),
+        'Patents Granted': rng.integers(0, 11, size=n),
+        'Visit Duration': rng.integers(0, 2501, size=n),
+    }, columns=COLUMNS)
+    # Closed rows the score would call Active get pushed further down
+    adjust = closed & (rng.random(n) >= closed_probability(df))
+    k = int(adjust.sum())
+    df.loc[adjust, 'Estimated Revenue'] = _pick(rng, estimated_revenue_choices[:2], k)
+    df.loc[adjust, 'Total Funding Amount'] = total_funding_amount_choices[0]
+    df.loc[adjust, 'Number of Employees'] = _pick(rng, number_employees_choices[:2], k)
+    df.loc[adjust, 'Growth Confidence'] = 'Low'
+    df.loc[adjust, 'Monthly Visit Growth'] = rng.uniform(-100, 0, size=k)
+    df.loc[adjust, 'Monthly visit'] = rng.integers(0, 10_001, size=k)
+    df.loc[adjust, 'Number of Funding Rounds'] = 0
+    df.loc[adjust, 'Funding Status'] = funding_status_choices[0]
+    df.loc[adjust, 'Investment Stage'] = investment_stage_choices[0]
+    return df
+
+# Yields DataFrames of up to chunk_size rows. The Closed share is drawn once
+# for the whole dataset (17-18% of n_rows) and spread over the chunks with
+# hypergeometric draws, so the total is exact and closed rows are uniformly
+# placed. Output is reproducible for a given (seed, chunk_size).
+def generate_chunks(n_rows, seed=None, chunk_size=DEFAULT_CHUNK_SIZE, pools=None):
+    rng = np.random.default_rng(seed)
+    companies, people = pools if pools is not None else build_name_pools(seed)
+    closed_left = int(round(n_rows * rng.uniform(*CLOSED_RATIO_RANGE)))
+    rows_left = n_rows
+    while rows_left > 0:
+        n = min(chunk_size, rows_left)
+        n_closed = closed_left if n == rows_left else int(rng.hypergeometric(closed_left, rows_left - closed_left, n))
+        yield _generate_chunk(rng, n, n_closed, companies, people)
+        closed_left -= n_closed
+        rows_left -= n
+
+# Streams chunks to .csv or .parquet without holding the dataset in memory
+def write_synthetic_data(path, n_rows, seed=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    counts = pd.Series(0, index=['Active', 'Closed'])
+    writer = None
+    try:
+        for i, chunk in enumerate(generate_chunks(n_rows, seed, chunk_size)):
+            if path.endswith('.parquet'):
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(path, table.schema)
+                writer.write_table(table)
+            else:
+                chunk.to_csv(path, mode='w' if i == 0 else 'a', header=i == 0, index=False)
+            counts = counts.add(chunk['Operating Status'].value_counts(), fill_value=0)
+    finally:
+        if writer is not None:
+            writer.close()
+    return counts.astype(int)
+
 # Generate synthetic data
-def generate_synthetic_data(n_rows=1000):
-    data = []
-    closed_count = 0
-    target_closed = random.randint(170, 180)  # Exact 17-18%
-    
-    for _ in range(n_rows):
-        # Basic company info
-        org_name = fake.company() + ' ' + random.choice(['Labs', 'Technologies', 'Solutions', 'Innovations', 'Pvt Ltd'])
-        industry = random.choice(industries_choices)
-        industry_group = industry_groups_map.get(industry, 'Other')
-        hq_location = random.choice(headquarters_locations)
-        founded_year = random.randint(2017, 2024)
-        
-        # Decide Operating Status early to set features accordingly
-        is_closed = False
-        if closed_count < target_closed and random.random() < 0.3:  # Bias toward Closed until target
-            is_closed = True
-            closed_count += 1
-        
-        # Financial and growth metrics
-        if is_closed:
-            estimated_revenue = random.choice(estimated_revenue_choices[:3])  # Up to $10M
-            total_funding = random.choice(total_funding_amount_choices[:2])  # Up to $5M
-            num_employees = random.choice(number_employees_choices[:3])  # Up to 100
-            growth_confidence = random.choice(['Low', 'Medium'])
-            monthly_visit_growth = random.uniform(-100, 50)  # Negative or low
-            monthly_visits = random.randint(0, 50_000)  # Lower visits
-            num_funding_rounds = random.randint(0, 2)  # Fewer rounds
-            funding_status = random.choice(funding_status_choices[:2])  # Seed or Early Stage
-            investment_stage = random.choice(investment_stage_choices[:2])  # Seed or Series A
-        else:
-            estimated_revenue = random.choice(estimated_revenue_choices)
-            total_funding = random.choice(total_funding_amount_choices)
-            num_employees = random.choice(number_employees_choices)
-            growth_confidence = random.choice(growth_confidence_choices)
-            monthly_visit_growth = random.uniform(-100, 2000)
-            monthly_visits = random.randint(0, 2_000_000)
-            num_funding_rounds = random.randint(0, 7)
-            funding_status = random.choice(funding_status_choices)
-            investment_stage = random.choice(investment_stage_choices)
-        
-        # Employee and founder info
-        num_founders = random.randint(0, 5)
-        founders = ', '.join([fake.name() for _ in range(max(1, num_founders))])  # At least one founder
-        
-        # Growth metrics
-        visit_duration = random.randint(0, 2500)
-        visit_duration_growth = random.uniform(-100, 10000)
-        growth_category = random.choice(growth_category_choices)
-        
-        # Other details
-        patents_granted = random.randint(0, 10)
-        
-        # Create row
-        row = {
-            'Organization Name': org_name,
-            'Industries': industry,
-            'Headquarters Location': hq_location,
-            'Estimated Revenue': estimated_revenue,
-            'Operating Status': 'Closed' if is_closed else 'Active',
-            'Founded Date': founded_year,
-            'Investment Stage': investment_stage,
-            'Industry Groups': industry_group,
-            'Number of Founders': max(1, num_founders),
-            'Founders': founders,
-            'Number of Employees': num_employees,
-            'Number of Funding Rounds': num_funding_rounds,
-            'Funding Status': funding_status,
-            'Total Funding Amount': total_funding,
-            'Growth Category': growth_category,
-            'Growth Confidence': growth_confidence,
-            'Monthly visit': monthly_visits,
-            'Monthly Visit Growth': monthly_visit_growth,
-            'Visit Duration Growth': visit_duration_growth,
-            'Patents Granted': patents_granted,
-            'Visit Duration': visit_duration
-        }
-        
-        # Verify Operating Status with scoring for consistency
-        if determine_operating_status(row) != row['Operating Status']:
-            # Adjust features to align with score-based expectation
-            if row['Operating Status'] == 'Closed':
-                row['Estimated Revenue'] = random.choice(estimated_revenue_choices[:2])  # Up to $1M
-                row['Total Funding Amount'] = total_funding_amount_choices[0]  # $0 to $1M
-                row['Number of Employees'] = random.choice(number_employees_choices[:2])  # Up to 50
-                row['Growth Confidence'] = 'Low'
-                row['Monthly Visit Growth'] = random.uniform(-100, 0)
-                row['Monthly visit'] = random.randint(0, 10_000)
-                row['Number of Funding Rounds'] = 0
-                row['Funding Status'] = funding_status_choices[0]  # Seed
-                row['Investment Stage'] = investment_stage_choices[0]  # Seed
-        
-        data.append(row)
-    
-    # Create DataFrame
-    df = pd.DataFrame(data)
+def generate_synthetic_data(n_rows=1000, seed=None, path='data_2.csv'):
+    df = pd.concat(generate_chunks(n_rows, seed, chunk_size=max(n_rows, 1)), ignore_index=True)
     
     # Save to CSV_
-    df.to_csv('data_2.csv', index=False)
+    if path is not None:
+        df.to_csv(path, index=False)
     return df
 
 # Generate data
 if __name__ == '__main__':
-    synthetic_data = generate_synthetic_data(1000)
-    print(synthetic_data.head())
+    import argparse
+    parser = argparse.ArgumentParser(description='Generate synthetic startup data')
+    parser.add_argument('--rows', type=int, default=1000)
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--output', default='data_2.csv', help='.csv or .parquet')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args()
+    counts = write_synthetic_data(args.output, args.rows, args.seed, args.chunk_size)
+    print(f"Wrote {args.rows} rows to {args.output}")
     print("\nOperating Status Distribution:")
-    print(synthetic_data['Operating Status'].value_counts())
+    print(counts)
     print("\nOperating Status Proportions:")
-    print(synthetic_data['Operating Status'].value_counts(normalize=True))
\ No newline at end of file
+    print(counts / counts.sum())
@@ -0,0 +1,201 @@
+import itertools
+import math
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+from sklearn.base import clone
+from sklearn.metrics import accuracy_score, roc_auc_score
+from sklearn.model_selection import StratifiedKFold
+
+from pipeline import DerivedFeatures
+
+SEARCH_MODES = ("grid", "random", "halving")
+
+# "balanced" is resolved to negatives/positives of the training labels
+PARAM_GRID = {
+    "max_depth": [3, 4, 6],
+    "learning_rate": [0.05, 0.1, 0.3],
+    "n_estimators": [100, 200, 400],
+    "scale_pos_weight": [1, "balanced"],
+}
+
+
+def _sample_params(rng):
+    return {
+        "max_depth": int(rng.randint(2, 9)),
+        "learning_rate": float(np.exp(rng.uniform(np.log(0.01), np.log(0.3)))),
+        "n_estimators": int(rng.randint(50, 501)),
+        "scale_pos_weight": [1, "balanced"][rng.randint(2)],
+    }
+
+
+def make_candidates(mode, n_iter=20, random_state=13, param_grid=None):
+    if mode == "grid":
+        grid = param_grid or PARAM_GRID
+        return [dict(zip(grid, values)) for values in itertools.product(*grid.values())]
+    if mode in ("random", "halving"):
+        rng = np.random.RandomState(random_state)
+        return [_sample_params(rng) for _ in range(n_iter)]
+    raise ValueError(f"Unknown search mode {mode!r}, expected one of {SEARCH_MODES}")
+
+
+def resolve_params(params, y):
+    params = dict(params)
+    if params.get("scale_pos_weight") == "balanced":
+        positives = np.sum(y == 1)
+        params["scale_pos_weight"] = float((len(y) - positives) / max(positives, 1))
+    return params
+
+
+# Preprocessor and DerivedFeatures are fitted once per fold on that fold's
+# training rows; every candidate then trains on the same cached matrices
+# instead of re-running the ColumnTransformer.
+def preprocess_folds(preprocessor, X, y, cv=5, random_state=13):
+    folds = []
+    splitter = StratifiedKFold(n_splits=cv, shuffle=True, random_state=random_state)
+    for train_idx, valid_idx in splitter.split(X, y):
+        fold_preprocessor = clone(preprocessor)
+        derived = DerivedFeatures()
+        X_train = fold_preprocessor.fit_transform(X.iloc[train_idx])
+        X_train = derived.fit_transform(X_train, y[train_idx], feature_names=fold_preprocessor.get_feature_names_out())
+        X_valid = derived.transform(fold_preprocessor.transform(X.iloc[valid_idx]))
+        folds.append((np.asarray(X_train, dtype=np.float64), y[train_idx], np.asarray(X_valid, dtype=np.float64), y[valid_idx]))
+    return folds
+
+
+# Per-process copy of the fold matrices, shipped once through the pool initializer
+_folds = None
+
+
+def _init_worker(folds):
+    global _folds
+    _folds = folds
+
+
+def _subsample(y, fraction, random_state):
+    # Same rows for every candidate at a given budget, both classes kept
+    order = np.random.RandomState(random_state).permutation(len(y))
+    keep = []
+    for label in np.unique(y):
+        rows = order[y[order] == label]
+        keep.append(rows[:max(1, int(round(len(rows) * fraction)))])
+    return np.sort(np.concatenate(keep))
+
+
+def _score_fold(task):
+    params, fold, fraction, n_jobs, random_state = task
+    X_train, y_train, X_valid, y_valid = _folds[fold]
+    if fraction < 1:
+        rows = _subsample(y_train, fraction, random_state + fold)
+        X_train, y_train = X_train[rows], y_train[rows]
+    start = time.perf_counter()
+    classifier = xgb.XGBClassifier(
+        random_state=random_state, eval_metric='logloss', n_jobs=n_jobs, **resolve_params(params, y_train))
+    classifier.fit(X_train, y_train)
+    proba = classifier.predict_proba(X_valid)[:, 1]
+    return {
+        "roc_auc": roc_auc_score(y_valid, proba),
+        "accuracy": accuracy_score(y_valid, (proba > 0.5).astype(int)),
+        "fit_time": time.perf_counter() - start,
+    }
+
+
+class _Evaluator:
+    def __init__(self, folds, processes, random_state):
+        self.n_folds = len(folds)
+        self.random_state = random_state
+        self.executor = None
+        # One XGBoost thread per worker so folds don't oversubscribe the cores
+        self.n_jobs = 1 if processes > 1 else None
+        if processes > 1:
+            self.executor = ProcessPoolExecutor(
+                max_workers=processes, mp_context=multiprocessing.get_context("forkserver"),
+                initializer=_init_worker, initargs=(folds,))
+        else:
+            _init_worker(folds)
+
+    def evaluate(self, candidates, fraction=1.0):
+        tasks = [
+            (params, fold, fraction, self.n_jobs, self.random_state)
+            for params in candidates for fold in range(self.n_folds)
+        ]
+        mapper = self.executor.map if self.executor is not None else map
+        scores = list(mapper(_score_fold, tasks))
+        rows = []
+        for i, params in enumerate(candidates):
+            fold_scores = pd.DataFrame(scores[i * self.n_folds:(i + 1) * self.n_folds])
+            rows.append({
+                **params,
+                "sample_fraction": fraction,
+                "mean_roc_auc": fold_scores["roc_auc"].mean(),
+                "std_roc_auc": fold_scores["roc_auc"].std(ddof=0),
+                "mean_accuracy": fold_scores["accuracy"].mean(),
+                "mean_fit_time": fold_scores["fit_time"].mean(),
+            })
+        return rows
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown()
+
+
+def _ranked(rows):
+    # Stable tie-break on candidate order keeps the winner reproducible
+    board = pd.DataFrame(rows).reset_index(names="candidate")
+    board = board.sort_values(["mean_roc_auc", "candidate"], ascending=[False, True], kind="mergesort")
+    board.insert(0, "rank", range(1, len(board) + 1))
+    return board.reset_index(drop=True)
+
+
+# Successive halving: every candidate is scored on a small sample of each
+# fold's training rows, the best 1/factor move on with factor times the rows,
+# until the survivors are scored on the full folds.
+def _halving(evaluator, candidates, factor):
+    n_rungs = 1
+    while factor ** n_rungs < len(candidates):
+        n_rungs += 1
+    history = []
+    survivors = list(range(len(candidates)))
+    for rung in range(n_rungs):
+        fraction = float(factor) ** (rung - n_rungs + 1)
+        rows = evaluator.evaluate([candidates[i] for i in survivors], fraction)
+        for i, row in zip(survivors, rows):
+            history.append({**row, "candidate": i, "rung": rung})
+        order = sorted(range(len(rows)), key=lambda j: (-rows[j]["mean_roc_auc"], survivors[j]))
+        survivors = [survivors[j] for j in order[:max(1, math.ceil(len(survivors) / factor))]]
+    return history
+
+
+def search_hyperparameters(preprocessor, X, y, mode="random", n_iter=20, cv=5, processes=None,
+                           factor=3, random_state=13, param_grid=None):
+    candidates = make_candidates(mode, n_iter, random_state, param_grid)
+    folds = preprocess_folds(preprocessor, X, y, cv, random_state)
+    processes = processes or os.cpu_count() or 1
+    evaluator = _Evaluator(folds, min(processes, len(candidates) * cv), random_state)
+    try:
+        if mode == "halving":
+            # Each candidate ranked by the furthest rung it reached, then score
+            history = pd.DataFrame(_halving(evaluator, candidates, factor))
+            board = history.sort_values("rung").groupby("candidate").tail(1)
+            board = board.sort_values(["rung", "mean_roc_auc", "candidate"], ascending=[False, False, True], kind="mergesort")
+            board = board[["candidate"] + [c for c in board.columns if c != "candidate"]].reset_index(drop=True)
+            board.insert(0, "rank", range(1, len(board) + 1))
+        else:
+            board = _ranked(evaluator.evaluate(candidates))
+    finally:
+        evaluator.close()
+    best = candidates[int(board.loc[0, "candidate"])]
+    return best, board
+
+
+def write_leaderboard(board, mode, report_dir="reports"):
+    os.makedirs(report_dir, exist_ok=True)
+    path = os.path.join(report_dir, f"hyperparameter_search_{mode}_{datetime.now():%Y%m%d_%H%M%S}.csv")
+    board.to_csv(path, index=False)
+    return path
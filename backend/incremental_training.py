@@ -0,0 +1,182 @@
+import argparse
+import json
+import logging
+import os
+from datetime import datetime
+
+import joblib
+import pandas as pd
+
+from compiled_scorer import export_scorer, scorer_path_for
+from model_registry import save_artifact, _file_digest, DEFAULT_PIPELINE_PATH, DEFAULT_TARGET_ENCODER_PATH
+from persistence import create_client, KEY_FIELD, MONGO_DB
+from pipeline import _prepare_prediction_frame
+
+logger = logging.getLogger(__name__)
+
+# Set on a stored startup once its real outcome is known ("Active"/"Closed").
+# The collection a startup sits in is only the model's own prediction and is
+# never used as a label.
+OUTCOME_FIELD = "Operating_Status"
+# Set to the (UTC) time whenever OUTCOME_FIELD is recorded or corrected, so a
+# corrected outcome is trained on again. Outcomes stored without it are
+# picked up once each, in _id order.
+OUTCOME_TIME_FIELD = "Operating_Status_Updated_At"
+COLLECTIONS = ("active_startups", "closed_startups")
+
+MODEL_DIR = "models"
+MANIFEST_NAME = "versions.json"
+DEFAULT_ROUNDS = 50
+MIN_NEW_ROWS = 20
+
+
+def load_manifest(model_dir=MODEL_DIR):
+    try:
+        with open(os.path.join(model_dir, MANIFEST_NAME)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {"versions": [], "high_water": {}}
+
+
+def save_manifest(manifest, model_dir=MODEL_DIR):
+    path = os.path.join(model_dir, MANIFEST_NAME)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+# Startups whose outcome was recorded after the high-water mark of the last
+# published version, with the API's underscore field names mapped back to the
+# CSV columns. The mark is the latest OUTCOME_TIME_FIELD seen, plus the
+# largest _id among outcomes stored without a time; both are filtered in
+# MongoDB, so a run only reads what is new. Returns the rows and the mark
+# they advance to.
+def export_labelled_rows(db, classes, high_water=None):
+    from bson import ObjectId
+    high_water = high_water or {}
+    latest = datetime.fromisoformat(high_water["labelled_at"]) if high_water.get("labelled_at") else None
+    last_id = ObjectId(high_water["_id"]) if high_water.get("_id") else None
+    untimed = {OUTCOME_TIME_FIELD: None}
+    if last_id is not None:
+        untimed["_id"] = {"$gt": last_id}
+    timed = {OUTCOME_TIME_FIELD: {"$gt": latest or datetime.min}}
+    query = {OUTCOME_FIELD: {"$in": list(classes)}, "$or": [timed, untimed]}
+    rows, order = [], []
+    for name in COLLECTIONS:
+        for doc in db[name].find(query):
+            doc_id = doc.pop("_id")
+            labelled_at = doc.pop(OUTCOME_TIME_FIELD, None)
+            if labelled_at is None:
+                last_id = doc_id if last_id is None else max(last_id, doc_id)
+                order.append(doc_id.generation_time.replace(tzinfo=None))
+            else:
+                latest = labelled_at if latest is None else max(latest, labelled_at)
+                order.append(labelled_at.replace(tzinfo=None))
+            rows.append({key.replace("_", " "): value for key, value in doc.items()})
+    frame = pd.DataFrame(rows)
+    key = KEY_FIELD.replace("_", " ")
+    if key in frame.columns:
+        # A startup can sit in both collections once its prediction flips;
+        # train on the copy whose outcome was recorded last
+        frame = frame.assign(_order=order).sort_values("_order", kind="stable").drop(columns="_order")
+        named = frame[key].notna()
+        frame = pd.concat([frame[named].drop_duplicates(subset=key, keep="last"), frame[~named]]).reset_index(drop=True)
+    mark = {
+        "labelled_at": latest.isoformat() if latest is not None else None,
+        "_id": str(last_id) if last_id is not None else None,
+    }
+    return frame, mark
+
+
+# Frequency and TF-IDF statistics take the new rows in through partial_fit;
+# imputers, scalers and DerivedFeatures keep their fitted values. This moves
+# the very feature values the existing trees split on: after a refresh every
+# old tree scores re-encoded inputs. It is therefore off by default (a full
+# retrain refits the encoders and the trees together), and a version that
+# used it is recorded with refreshed_statistics in the manifest.
+def refresh_encoder_statistics(preprocessor, X):
+    columns = {name: cols for name, _, cols in preprocessor.transformers_}
+    for name, step in (("freq", "freq_encoder"), ("industries", "encoder")):
+        transformer = preprocessor.named_transformers_[name]
+        transformer.named_steps[step].partial_fit(transformer[:-1].transform(X[columns[name]]))
+
+
+def warm_start(pipeline, X, y, rounds=DEFAULT_ROUNDS, refresh_statistics=False):
+    if refresh_statistics:
+        logger.warning("Refreshing frequency/TF-IDF statistics: the existing trees will score re-encoded features")
+        refresh_encoder_statistics(pipeline.named_steps["preprocessor"], X)
+    features = pipeline[:-1].transform(X)
+    classifier = pipeline.named_steps["classifier"]
+    # Continue boosting: `rounds` more trees on top of the existing booster
+    booster = classifier.get_booster()
+    classifier.set_params(n_estimators=rounds)
+    classifier.fit(features, y, xgb_model=booster)
+    return pipeline
+
+
+# Export the new labelled rows, warm-start a private copy of the serving
+# pipeline on them and publish it. The version is written under model_dir
+# first, then swapped over pipeline_path with save_artifact's atomic rename;
+# running workers pick it up on their next registry lookup, so there is no
+# restart and no request ever sees a half-written pickle.
+def train_incremental(db, pipeline_path=DEFAULT_PIPELINE_PATH, target_encoder_path=DEFAULT_TARGET_ENCODER_PATH,
+                      scorer_path=None, model_dir=MODEL_DIR, rounds=DEFAULT_ROUNDS,
+                      min_rows=MIN_NEW_ROWS, refresh_statistics=False):
+    manifest = load_manifest(model_dir)
+    le = joblib.load(target_encoder_path)
+    frame, high_water = export_labelled_rows(db, le.classes_, manifest.get("high_water"))
+    if len(frame) < min_rows:
+        logger.info(f"{len(frame)} new labelled startups, need {min_rows}; keeping the current model")
+        return None
+    y = le.transform(frame["Operating Status"])
+    if len(set(y)) < len(le.classes_):
+        logger.info(f"New labelled startups cover only {sorted(set(frame['Operating Status']))}; keeping the current model")
+        return None
+
+    parent = _file_digest(pipeline_path)
+    pipeline = joblib.load(pipeline_path)
+    X = _prepare_prediction_frame(frame.drop(columns=["Operating Status"]))
+    warm_start(pipeline, X, y, rounds, refresh_statistics)
+
+    os.makedirs(model_dir, exist_ok=True)
+    version = datetime.now().strftime("%Y%m%d_%H%M%S")
+    versioned_path = os.path.join(model_dir, f"startup_pipeline_{version}.pkl")
+    save_artifact(pipeline, versioned_path)
+    save_artifact(pipeline, pipeline_path)
+    # Until the new scorer lands, load_scorer sees the old one no longer
+    # matches and compiles from the published pipeline instead
+    export_scorer(pipeline, scorer_path or scorer_path_for(pipeline_path), source_path=pipeline_path)
+
+    entry = {
+        "version": version,
+        "path": versioned_path,
+        "sha256": _file_digest(versioned_path),
+        "parent_sha256": parent,
+        "rows": len(frame),
+        "rounds": rounds,
+        "trees": pipeline.named_steps["classifier"].get_booster().num_boosted_rounds(),
+        "refreshed_statistics": refresh_statistics,
+        "trained_at": datetime.now().isoformat(timespec="seconds"),
+    }
+    manifest["versions"].append(entry)
+    manifest["high_water"] = high_water
+    save_manifest(manifest, model_dir)
+    logger.info(f"Published {versioned_path} ({len(frame)} new startups, {entry['trees']} trees)")
+    return entry
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Warm-start the serving pipeline on newly labelled startups")
+    parser.add_argument("--pipeline-path", default=DEFAULT_PIPELINE_PATH)
+    parser.add_argument("--model-dir", default=MODEL_DIR)
+    parser.add_argument("--rounds", type=int, default=DEFAULT_ROUNDS)
+    parser.add_argument("--min-rows", type=int, default=MIN_NEW_ROWS)
+    parser.add_argument("--refresh-statistics", action="store_true",
+                        help="also update frequency/TF-IDF statistics (re-encodes the features existing trees split on)")
+    args = parser.parse_args()
+    entry = train_incremental(
+        create_client()[MONGO_DB], args.pipeline_path, model_dir=args.model_dir, rounds=args.rounds,
+        min_rows=args.min_rows, refresh_statistics=args.refresh_statistics)
+    print(json.dumps(entry, indent=2) if entry else "No new version published")
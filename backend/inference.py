@@ -0,0 +1,42 @@
+import weakref
+
+import numpy as np
+
+# One engine per loaded pipeline object; entries go away with the pipeline
+# when the model registry swaps in a new artifact.
+_engines = weakref.WeakKeyDictionary()
+
+
+# Runs the fitted preprocessor -> DerivedFeatures -> classifier chain exactly
+# once per input frame. pipeline.predict followed by a second transform and
+# predict_proba used to do all of this work two to three times.
+class InferenceEngine:
+    def __init__(self, pipeline):
+        self.preprocessor = pipeline.named_steps['preprocessor']
+        self.derived = pipeline.named_steps['derived']
+        self.classifier = pipeline.named_steps['classifier']
+        feature_names = self.preprocessor.get_feature_names_out()
+        self.feature_names = list(self.derived.get_feature_names_out(feature_names))
+        self.hardwork_idx = self.feature_names.index("Hardwork Factor")
+
+    def transform(self, X):
+        return self.derived.transform(self.preprocessor.transform(X))
+
+    def run(self, X):
+        X_derived = self.transform(X)
+        probs = self.classifier.predict_proba(X_derived)
+        if probs.shape[1] == 2:
+            # Same rule XGBClassifier.predict applies to the class-one probability
+            prediction = (probs[:, 1] > 0.5).astype(int)
+        else:
+            prediction = np.argmax(probs, axis=1)
+        hardwork = X_derived[:, self.hardwork_idx].astype(float)
+        return prediction, probs, hardwork
+
+
+def get_engine(pipeline):
+    engine = _engines.get(pipeline)
+    if engine is None:
+        engine = InferenceEngine(pipeline)
+        _engines[pipeline] = engine
+    return engine
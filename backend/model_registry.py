@@ -0,0 +1,102 @@
+import hashlib
+import logging
+import os
+import threading
+
+import joblib
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PIPELINE_PATH = "startup_pipeline.pkl"
+DEFAULT_TARGET_ENCODER_PATH = "target_encoder.pkl"
+
+
+def file_signature(path):
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+# Process-wide artifact cache. Each entry is keyed by absolute path and
+# remembers the file's (mtime, size) at load time; when a new pickle is
+# dropped in place the next lookup reloads it and swaps the entry in one
+# assignment, so callers always see either the old or the new artifact.
+class ModelRegistry:
+    def __init__(self):
+        self._entries = {}
+        self._digests = {}
+        self._lock = threading.Lock()
+
+    def get(self, path, loader=joblib.load):
+        return self._entry(path, loader)[2]
+
+    def version(self, path, loader=joblib.load):
+        # sha256 of the file contents the cached artifact was loaded from
+        return self._entry(path, loader)[1]
+
+    def digest(self, path):
+        # sha256 of the file as it is now, without loading it; hashed again
+        # only when its (mtime, size) changes
+        path = os.path.abspath(path)
+        signature = file_signature(path)
+        for cached in (self._entries.get(path), self._digests.get(path)):
+            if cached is not None and cached[0] == signature:
+                return cached[1]
+        digest = _file_digest(path)
+        self._digests[path] = (signature, digest)
+        return digest
+
+    def clear(self):
+        with self._lock:
+            self._entries = {}
+            self._digests = {}
+
+    def _entry(self, path, loader):
+        path = os.path.abspath(path)
+        signature = file_signature(path)
+        entry = self._entries.get(path)
+        if entry is not None and entry[0] == signature:
+            return entry
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry[0] == signature:
+                return entry
+            try:
+                artifact = loader(path)
+            except Exception as e:
+                # A half-written pickle must not take the worker down; keep
+                # serving the previous artifact until the file is complete.
+                if entry is None:
+                    raise
+                logger.warning(f"Reload of {path} failed, keeping previous artifact: {str(e)}")
+                return entry
+            entry = (signature, _file_digest(path), artifact)
+            self._entries[path] = entry
+            logger.info(f"Loaded artifact {path} (sha256 {entry[1][:12]})")
+            return entry
+
+
+registry = ModelRegistry()
+
+
+def save_artifact(artifact, path):
+    # Write next to the target and rename over it so a registry in another
+    # worker never observes a partially written pickle.
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    joblib.dump(artifact, tmp_path)
+    os.replace(tmp_path, path)
+
+
+def load_pipeline(path=DEFAULT_PIPELINE_PATH):
+    return registry.get(path)
+
+
+def load_target_encoder(path=DEFAULT_TARGET_ENCODER_PATH):
+    return registry.get(path)
@@ -0,0 +1,176 @@
+import copy
+import os
+
+import joblib
+import numpy as np
+from scipy.sparse import csr_matrix, vstack
+from sklearn.preprocessing import normalize
+
+from model_registry import save_artifact
+
+
+# Indices of the k largest scores, highest first; equal scores are ordered by
+# row index, as a stable argsort of -scores would order them.
+def top_k(scores, k):
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.array([], dtype=int)
+    candidates = np.argpartition(-scores, k - 1)[:k]
+    # Pull in everything tied with the k-th score before breaking ties
+    candidates = np.flatnonzero(scores >= scores[candidates].min())
+    order = np.lexsort((candidates, -scores[candidates]))
+    return candidates[order][:k]
+
+
+# Peer indexes hold L2-normalised sparse rows (TF-IDF industries + encoded
+# investment stage) and answer cosine top-k queries by row position. Rows are
+# only ever appended, so positions stay valid across incremental adds.
+class ExactPeerIndex:
+    kind = "exact"
+
+    def __init__(self):
+        self.vectors = None
+
+    def __len__(self):
+        return 0 if self.vectors is None else self.vectors.shape[0]
+
+    def add(self, vectors):
+        vectors = normalize(csr_matrix(vectors, dtype=float))
+        self.vectors = vectors if self.vectors is None else vstack([self.vectors, vectors]).tocsr()
+        return self
+
+    def scores(self, query, candidates=None):
+        vectors = self.vectors if candidates is None else self.vectors[candidates]
+        return (vectors @ normalize(csr_matrix(query, dtype=float))[0].T).toarray().ravel()
+
+    def query(self, query, k):
+        if not len(self):
+            return np.array([], dtype=int)
+        return top_k(self.scores(query), k)
+
+    def save(self, path):
+        save_artifact(self, path)
+
+    # Splits the index into a small picklable skeleton and the large arrays a
+    # worker process can map from shared memory (see worker_pool.py)
+    def detach(self):
+        skeleton = copy.copy(self)
+        skeleton.vectors = None
+        if self.vectors is None:
+            return skeleton, {}
+        return skeleton, {
+            "data": self.vectors.data,
+            "indices": self.vectors.indices,
+            "indptr": self.vectors.indptr,
+            "shape": np.array(self.vectors.shape),
+        }
+
+    def attach(self, arrays):
+        if arrays:
+            self.vectors = csr_matrix((arrays["data"], arrays["indices"], arrays["indptr"]),
+                                      shape=tuple(arrays["shape"]), copy=False)
+        return self
+
+
+# Random-projection LSH: each of n_tables hashes a row to the sign pattern of
+# n_bits random hyperplanes. A query gathers the rows sharing its bucket (and,
+# with probes=1, the buckets one bit-flip away) in every table, then ranks
+# only those candidates exactly. Falls back to a full scan when the buckets
+# come back with fewer than k rows.
+class LSHPeerIndex(ExactPeerIndex):
+    kind = "lsh"
+
+    def __init__(self, n_tables=16, n_bits=16, probes=1, random_state=13, chunk_size=65536):
+        super().__init__()
+        self.n_tables = n_tables
+        self.n_bits = n_bits
+        self.probes = probes
+        self.random_state = random_state
+        self.chunk_size = chunk_size
+        self.planes = None
+        self.offset = None
+        self.codes = np.empty((0, n_tables), dtype=np.int64)
+        self._tables = None
+
+    def _hash(self, vectors):
+        weights = np.left_shift(1, np.arange(self.n_bits, dtype=np.int64))
+        codes = []
+        for start in range(0, vectors.shape[0], self.chunk_size):
+            projected = vectors[start:start + self.chunk_size] @ self.planes - self.offset
+            bits = (np.asarray(projected) > 0).reshape(-1, self.n_tables, self.n_bits)
+            codes.append(bits.astype(np.int64) @ weights)
+        return np.vstack(codes) if codes else np.empty((0, self.n_tables), dtype=np.int64)
+
+    def add(self, vectors):
+        vectors = normalize(csr_matrix(vectors, dtype=float))
+        if self.planes is None:
+            rng = np.random.default_rng(self.random_state)
+            self.planes = rng.standard_normal((vectors.shape[1], self.n_tables * self.n_bits))
+            # Hash around the centroid of the first batch: the stage column
+            # dominates every row, and uncentred hyperplanes would send
+            # almost the whole corpus to the same bucket.
+            self.offset = np.asarray(vectors.mean(axis=0)) @ self.planes
+        super().add(vectors)
+        self.codes = np.vstack([self.codes, self._hash(vectors)])
+        self._tables = None  # re-sorted lazily on the next query
+        return self
+
+    def _sorted_tables(self):
+        if self._tables is None:
+            orders = np.argsort(self.codes, axis=0, kind="stable")
+            self._tables = (orders, np.take_along_axis(self.codes, orders, axis=0))
+        return self._tables
+
+    def candidates(self, query):
+        orders, sorted_codes = self._sorted_tables()
+        codes = self._hash(normalize(csr_matrix(query, dtype=float))[:1])[0]
+        flips = [0] + ([1 << bit for bit in range(self.n_bits)] if self.probes else [])
+        found = []
+        for table in range(self.n_tables):
+            probe_codes = codes[table] ^ np.array(flips, dtype=np.int64)
+            lo = np.searchsorted(sorted_codes[:, table], probe_codes, side="left")
+            hi = np.searchsorted(sorted_codes[:, table], probe_codes, side="right")
+            found.extend(orders[l:h, table] for l, h in zip(lo, hi) if h > l)
+        return np.unique(np.concatenate(found)) if found else np.array([], dtype=int)
+
+    def query(self, query, k):
+        if not len(self):
+            return np.array([], dtype=int)
+        candidates = self.candidates(query)
+        if len(candidates) < k:
+            return super().query(query, k)
+        return candidates[top_k(self.scores(query, candidates), k)]
+
+    def detach(self):
+        orders, sorted_codes = self._sorted_tables()
+        skeleton, arrays = super().detach()
+        skeleton.codes = None
+        skeleton._tables = None
+        arrays.update(codes=self.codes, orders=orders, sorted_codes=sorted_codes)
+        return skeleton, arrays
+
+    def attach(self, arrays):
+        super().attach(arrays)
+        self.codes = arrays["codes"]
+        self._tables = (arrays["orders"], arrays["sorted_codes"])
+        return self
+
+
+PEER_INDEXES = {
+    "exact": ExactPeerIndex,
+    "lsh": LSHPeerIndex,
+}
+
+
+def make_peer_index(kind=None, **params):
+    kind = kind or os.environ.get("PEER_INDEX", "exact")
+    if kind not in PEER_INDEXES:
+        raise ValueError(f"Unknown peer index '{kind}', expected one of {sorted(PEER_INDEXES)}")
+    return PEER_INDEXES[kind](**params)
+
+
+def load_peer_index(path):
+    index = joblib.load(path)
+    if not isinstance(index, ExactPeerIndex):
+        raise ValueError(f"{path} does not contain a peer index")
+    return index
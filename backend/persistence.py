@@ -0,0 +1,208 @@
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+MONGO_URI = os.environ.get("MONGO_URI", "mongodb://localhost:27017/")
+MONGO_DB = os.environ.get("MONGO_DB", "startup_db")
+
+# Explicit pool settings instead of the driver defaults; every knob can be
+# overridden per deployment
+MONGO_POOL_SETTINGS = {
+    "maxPoolSize": int(os.environ.get("MONGO_MAX_POOL_SIZE", 16)),
+    "minPoolSize": int(os.environ.get("MONGO_MIN_POOL_SIZE", 2)),
+    "maxIdleTimeMS": int(os.environ.get("MONGO_MAX_IDLE_MS", 60000)),
+    "waitQueueTimeoutMS": int(os.environ.get("MONGO_WAIT_QUEUE_TIMEOUT_MS", 5000)),
+    "connectTimeoutMS": int(os.environ.get("MONGO_CONNECT_TIMEOUT_MS", 5000)),
+    "serverSelectionTimeoutMS": int(os.environ.get("MONGO_SERVER_SELECTION_TIMEOUT_MS", 5000)),
+}
+
+FLUSH_INTERVAL = float(os.environ.get("MONGO_FLUSH_INTERVAL", 0.5))
+MAX_BATCH_SIZE = int(os.environ.get("MONGO_MAX_BATCH_SIZE", 500))
+# While MongoDB is unreachable: at most this many startups are held for retry
+# (further new ones are dropped and counted), and flushes back off from
+# RETRY_BACKOFF seconds, doubling up to MAX_RETRY_BACKOFF
+MAX_BUFFERED = int(os.environ.get("MONGO_MAX_BUFFERED", 10000))
+RETRY_BACKOFF = float(os.environ.get("MONGO_RETRY_BACKOFF", 1.0))
+MAX_RETRY_BACKOFF = float(os.environ.get("MONGO_MAX_RETRY_BACKOFF", 60.0))
+
+KEY_FIELD = "Organization_Name"
+
+
+# pymongo is imported on first use so importing this module (and app.py)
+# stays cheap; MongoClient itself connects in the background.
+def create_client(uri=MONGO_URI, **overrides):
+    import pymongo
+    return pymongo.MongoClient(uri, **{**MONGO_POOL_SETTINGS, **overrides})
+
+
+# Buffers prediction upserts and writes them with one unordered bulk_write per
+# collection, either every flush_interval seconds from a background thread or
+# as soon as max_batch startups are waiting. Upserts for the same startup
+# inside one window are merged field by field, which is what applying their
+# $sets in order would have produced, so a batch never carries two writes for
+# one key.
+#
+# Writes are acknowledged after the HTTP response: a crash can lose at most
+# one flush window, and a failed flush puts its documents back in the buffer
+# under any newer fields that arrived meanwhile. Until the retry backoff has
+# passed, neither requests nor the flush thread wait on another
+# server-selection timeout, and the buffer never holds more than
+# max_buffered startups.
+class PredictionStore:
+    def __init__(self, db, flush_interval=FLUSH_INTERVAL, max_batch=MAX_BATCH_SIZE, max_buffered=MAX_BUFFERED,
+                 retry_backoff=RETRY_BACKOFF, max_retry_backoff=MAX_RETRY_BACKOFF):
+        self.collections = {
+            "Active": db["active_startups"],
+            "Closed": db["closed_startups"],
+        }
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.max_buffered = max_buffered
+        self.retry_backoff = retry_backoff
+        self.max_retry_backoff = max_retry_backoff
+        self._backoff = 0.0
+        self._retry_at = 0.0
+        self._buffers = {label: {} for label in self.collections}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self.flushed = 0
+        self.failed_flushes = 0
+        self.dropped = 0
+
+    def ensure_indexes(self):
+        from pymongo.errors import PyMongoError
+        for collection in self.collections.values():
+            try:
+                collection.create_index(KEY_FIELD, unique=True, name=f"{KEY_FIELD}_unique")
+            except PyMongoError as e:
+                # Typically pre-existing duplicates; upserts still work, just unindexed
+                logger.error(f"Could not create unique index on {collection.name}.{KEY_FIELD}: {str(e)}")
+
+    def record(self, startup_data, result):
+        label = result["practical_prediction"]["label"]
+        if label not in self.collections:
+            logger.warning(f"Unexpected prediction value: {label}")
+            return
+        startup_data["prediction"] = result["practical_prediction"]["display_label"]
+        startup_data["confidence_level"] = result["practical_prediction"]["confidence"]
+        with self._lock:
+            buffer = self._buffers[label]
+            key = startup_data.get(KEY_FIELD)
+            pending = sum(len(b) for b in self._buffers.values())
+            if key not in buffer and pending >= self.max_buffered:
+                self.dropped += 1
+                if self.dropped == 1 or self.dropped % 1000 == 0:
+                    logger.warning(f"Prediction buffer full ({pending} startups), dropped {self.dropped} so far")
+                return
+            buffer[key] = {**buffer.get(key, {}), **startup_data}
+            pending = sum(len(b) for b in self._buffers.values())
+        if pending >= self.max_batch and not self.backing_off():
+            if self._thread is None:
+                self.flush()
+            else:
+                self._wake.set()
+
+    def record_batch(self, input_rows, results):
+        for startup_data, result in zip(input_rows, results):
+            self.record(startup_data, result)
+
+    def pending(self):
+        with self._lock:
+            return sum(len(b) for b in self._buffers.values())
+
+    def backing_off(self):
+        return time.monotonic() < self._retry_at
+
+    def flush(self):
+        from pymongo import UpdateOne
+        from pymongo.errors import PyMongoError
+        with self._flush_lock:
+            with self._lock:
+                buffers = self._buffers
+                self._buffers = {label: {} for label in self.collections}
+            counts = {}
+            failed = False
+            for label, docs in buffers.items():
+                if not docs:
+                    continue
+                ops = [UpdateOne({KEY_FIELD: key}, {"$set": doc}, upsert=True) for key, doc in docs.items()]
+                try:
+                    self.collections[label].bulk_write(ops, ordered=False)
+                except PyMongoError as e:
+                    self.failed_flushes += 1
+                    failed = True
+                    self._backoff = min(max(self._backoff * 2, self.retry_backoff), self.max_retry_backoff)
+                    self._retry_at = time.monotonic() + self._backoff
+                    logger.error(f"Flushing {len(ops)} {label} predictions failed, retrying in {self._backoff:.1f}s: {str(e)}")
+                    with self._lock:
+                        buffer = self._buffers[label]
+                        pending = sum(len(b) for b in self._buffers.values())
+                        for key, doc in docs.items():
+                            if key not in buffer:
+                                if pending >= self.max_buffered:
+                                    self.dropped += 1
+                                    continue
+                                pending += 1
+                            buffer[key] = {**doc, **buffer.get(key, {})}
+                    continue
+                counts[label] = len(ops)
+                self.flushed += len(ops)
+            if counts and not failed:
+                self._backoff = 0.0
+                self._retry_at = 0.0
+            if counts:
+                logger.info(f"Stored {counts.get('Active', 0)} Successful, {counts.get('Closed', 0)} Struggling startups")
+            return counts
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            if not self.backing_off():
+                self.flush()
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="mongo-flush", daemon=True)
+            self._thread.start()
+        return self
+
+    def close(self):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+
+# Keyset pagination over _id: each page starts strictly after the last _id
+# of the previous one, so deep pages cost the same as the first instead of
+# skipping over every earlier document. _id is always present and unique,
+# unlike Organization_Name, and keeps the collection's insertion order.
+def find_page(collection, projection=None, limit=100, after=None):
+    from bson import ObjectId
+    if after is not None and not ObjectId.is_valid(after):
+        raise ValueError(f"Invalid page cursor: {after}")
+    query = {} if after is None else {"_id": {"$gt": ObjectId(after)}}
+    if projection:
+        projection = {**projection, KEY_FIELD: 1}
+    docs = list(collection.find(query, projection or None).sort("_id", 1).limit(limit + 1))
+    next_after = str(docs[limit - 1]["_id"]) if len(docs) > limit else None
+    docs = docs[:limit]
+    for doc in docs:
+        del doc["_id"]
+    return docs, next_after
+
+
+def iter_documents(collection, projection=None, batch_size=1000):
+    projection = {"_id": 0, **(projection or {})}
+    if len(projection) > 1:
+        projection[KEY_FIELD] = 1
+    return collection.find({}, projection).sort("_id", 1).batch_size(batch_size)
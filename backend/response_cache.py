@@ -0,0 +1,135 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+RESPONSE_CACHE_URL = os.environ.get("RESPONSE_CACHE_URL")
+RESPONSE_CACHE_SIZE = int(os.environ.get("RESPONSE_CACHE_SIZE", 4096))
+RESPONSE_CACHE_TTL = float(os.environ.get("RESPONSE_CACHE_TTL", 300))
+
+
+# Stable digest of an endpoint name, its (field-mapped) input and the versions
+# of everything the answer depends on. Key order and float formatting in the
+# incoming JSON do not change the key; a new model or dataset always does.
+def canonical_key(namespace, payload, *versions):
+    body = json.dumps([namespace, payload, versions], sort_keys=True, separators=(",", ":"), default=str)
+    return f"{namespace}:{hashlib.sha256(body.encode()).hexdigest()}"
+
+
+class CacheStats:
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expired = 0
+        self.errors = 0
+
+    def as_dict(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expired": self.expired,
+            "errors": self.errors,
+        }
+
+
+# In-process LRU with a per-entry time to live
+class TTLCache:
+    backend = "memory"
+
+    def __init__(self, maxsize=RESPONSE_CACHE_SIZE, ttl=RESPONSE_CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] < time.monotonic():
+                del self._entries[key]
+                self.stats.expired += 1
+                entry = None
+            if entry is None:
+                self.stats.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return entry[1]
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def metrics(self):
+        with self._lock:
+            size = len(self._entries)
+        return {"backend": self.backend, "size": size, "maxsize": self.maxsize, "ttl": self.ttl, **self.stats.as_dict()}
+
+
+# Shared cache on any Redis-compatible server (Redis, KeyDB, Valkey, ...).
+# Expiry is the server's; LRU eviction comes from its maxmemory-policy. A
+# failing server degrades to cache misses rather than failed requests.
+# Responses are stored as JSON, never pickled: anything that can write to
+# the server must not be able to run code in the API process.
+class RedisCache:
+    backend = "redis"
+
+    def __init__(self, url, ttl=RESPONSE_CACHE_TTL, prefix="startup-api:"):
+        import redis  # optional dependency, only needed for this backend
+        self.client = redis.Redis.from_url(url)
+        self.ttl = ttl
+        self.prefix = prefix
+        self.stats = CacheStats()
+
+    def get(self, key):
+        try:
+            value = self.client.get(self.prefix + key)
+            if value is not None:
+                value = json.loads(value)
+        except Exception as e:
+            self.stats.errors += 1
+            logger.warning(f"Response cache read failed: {str(e)}")
+            value = None
+        if value is None:
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        return value
+
+    def set(self, key, value):
+        try:
+            self.client.set(self.prefix + key, json.dumps(value), px=int(self.ttl * 1000))
+        except Exception as e:
+            self.stats.errors += 1
+            logger.warning(f"Response cache write failed: {str(e)}")
+
+    def clear(self):
+        for key in self.client.scan_iter(f"{self.prefix}*"):
+            self.client.delete(key)
+
+    def metrics(self):
+        return {"backend": self.backend, "ttl": self.ttl, **self.stats.as_dict()}
+
+
+def make_response_cache(url=RESPONSE_CACHE_URL):
+    if url:
+        return RedisCache(url)
+    return TTLCache()
@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+from pydantic import AliasGenerator, BaseModel, ConfigDict
+
+
+# Every pipeline column is its API field name with spaces for underscores,
+# so the mapping is a serialization alias on the model rather than a dict
+# rebuilt and walked per request. Requests still validate by field name.
+def _column_name(field):
+    return field.replace("_", " ")
+
+
+class StartupData(BaseModel):
+    model_config = ConfigDict(alias_generator=AliasGenerator(serialization_alias=_column_name))
+
+    Organization_Name: str = None
+    Industries: str = None
+    Headquarters_Location: str = None
+    Estimated_Revenue: str = None
+    Founded_Date: float = None
+    Investment_Stage: str = None
+    Industry_Groups: str = None
+    Number_of_Founders: float = None
+    Founders: str = None
+    Number_of_Employees: str = None
+    Number_of_Funding_Rounds: float = None
+    Funding_Status: str = None
+    Total_Funding_Amount: str = None
+    Growth_Category: str = None
+    Growth_Confidence: str = None
+    Monthly_visit: float = None
+    Visit_Duration_Growth: float = None
+    Patents_Granted: float = None
+    Visit_Duration: float = None
+
+    # The fields the client sent, keyed as stored in MongoDB
+    def to_input(self):
+        return self.model_dump(exclude_unset=True)
+
+    # The same fields keyed by pipeline column, in column order
+    def to_record(self):
+        return self.model_dump(by_alias=True, exclude_unset=True)
+
+
+INPUT_FIELDS = tuple(StartupData.model_fields)
+INPUT_COLUMNS = tuple(_column_name(field) for field in INPUT_FIELDS)
+
+
+# One frame for a batch, built column by column straight from the models.
+# Fields a startup left out are NaN, as they are when the pipeline adds a
+# missing column itself, never None (which the imputers don't treat as missing).
+def startup_frame(startups):
+    columns = {}
+    for field, column in zip(INPUT_FIELDS, INPUT_COLUMNS):
+        values = [getattr(startup, field) for startup in startups]
+        columns[column] = [np.nan if value is None else value for value in values]
+    return pd.DataFrame(columns, columns=list(INPUT_COLUMNS))
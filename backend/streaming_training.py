@@ -0,0 +1,217 @@
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score, roc_auc_score
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import LabelEncoder
+
+from compiled_scorer import export_scorer, scorer_path_for
+from dataset_store import ingested_chunks
+from model_registry import save_artifact
+from pipeline import DerivedFeatures, clean_reference_frame
+from training import FEATURE_COLUMNS, TEST_SIZE, create_preprocessing_pipeline, fill_values
+
+DEFAULT_CHUNK_SIZE = 50_000
+# Rows the preprocessor (imputers, scalers, ordinal categories, TF-IDF
+# vocabulary, DerivedFeatures) is fitted on; a uniform sample of the file
+DEFAULT_SAMPLE_ROWS = 100_000
+# Held-out rows kept in memory for the final report
+DEFAULT_EVAL_ROWS = 100_000
+
+# Same defaults XGBClassifier(random_state=13, eval_metric='logloss') trains with
+DEFAULT_PARAMS = {"objective": "binary:logistic", "eval_metric": "logloss", "max_depth": 6, "learning_rate": 0.3, "seed": 13}
+DEFAULT_ROUNDS = 100
+
+
+def iter_chunks(data_path, chunk_size=DEFAULT_CHUNK_SIZE):
+    if data_path.endswith(".parquet"):
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(data_path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(data_path, chunksize=chunk_size)
+
+
+# Cleaned chunks, sliced from the ingested Arrow file when it is current
+def iter_clean_chunks(data_path, chunk_size=DEFAULT_CHUNK_SIZE):
+    chunks = ingested_chunks(data_path, chunk_size)
+    if chunks is None:
+        chunks = (clean_reference_frame(chunk) for chunk in iter_chunks(data_path, chunk_size))
+    yield from chunks
+
+
+# Each row's split and sample key are hashed from (random_state, its row
+# number in the file), so both passes, and any chunk size, assign every row
+# the same draws. The hash is the splitmix64 finalizer.
+def _row_draws(random_state, start, n):
+    offset = np.random.SeedSequence(random_state).generate_state(1, np.uint64)[0]
+    rows = np.arange(start, start + n, dtype=np.uint64)
+
+    def uniform(stream):
+        z = (rows * np.uint64(2) + np.uint64(stream)) * np.uint64(0x9E3779B97F4A7C15) + offset
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        z = z ^ (z >> np.uint64(31))
+        return (z >> np.uint64(11)) * (1.0 / (1 << 53))
+
+    return uniform(0) < TEST_SIZE, uniform(1)
+
+
+# Pass 1: clean every chunk and keep the sample_rows training rows with the
+# smallest random keys (a uniform sample in bounded memory, returned in file
+# order), plus exact label and Headquarters Location counts over all
+# training rows.
+def collect_statistics(data_path, chunk_size=DEFAULT_CHUNK_SIZE, sample_rows=DEFAULT_SAMPLE_ROWS, random_state=13):
+    sample = None
+    labels = pd.Series(dtype=float)
+    locations = pd.Series(dtype=float)
+    n_rows = n_train = 0
+    for chunk in iter_clean_chunks(data_path, chunk_size):
+        if "Operating Status" not in chunk.columns:
+            raise ValueError("Target column 'Operating Status' not found in dataset")
+        is_test, keys = _row_draws(random_state, n_rows, len(chunk))
+        rows = np.arange(n_rows, n_rows + len(chunk))
+        n_rows += len(chunk)
+        chunk = chunk.loc[~is_test].assign(_key=keys[~is_test], _row=rows[~is_test])
+        n_train += len(chunk)
+        labels = labels.add(chunk["Operating Status"].value_counts(), fill_value=0)
+        if "Headquarters Location" in chunk.columns:
+            location = chunk["Headquarters Location"].fillna("Unknown").astype(str)
+            locations = locations.add(location.value_counts(), fill_value=0)
+        sample = chunk if sample is None else pd.concat([sample, chunk], ignore_index=True)
+        if len(sample) > sample_rows:
+            sample = sample.nsmallest(sample_rows, "_key")
+    return {
+        "sample": sample.sort_values("_row").drop(columns=["_key", "_row"]).reset_index(drop=True),
+        "labels": labels,
+        "locations": locations,
+        "n_rows": n_rows,
+        "n_train": n_train,
+    }
+
+
+def fit_preprocessing(stats):
+    sample = stats["sample"]
+    feature_columns = [col for col in FEATURE_COLUMNS if col in sample.columns]
+    fills = fill_values(sample, feature_columns)
+    sample = sample.fillna(fills)
+
+    le = LabelEncoder().fit(stats["labels"].index.to_numpy())
+    preprocessor = create_preprocessing_pipeline()
+    derived = DerivedFeatures()
+    y_sample = le.transform(sample["Operating Status"])
+    X_sample = preprocessor.fit_transform(sample[feature_columns])
+    derived.fit(X_sample, y_sample, feature_names=preprocessor.get_feature_names_out())
+
+    # Location frequencies are cheap to count exactly over every training row
+    freq = preprocessor.named_transformers_["freq"].named_steps["freq_encoder"]
+    freq.freq_map_ = (stats["locations"] / stats["n_train"]).to_dict()
+    freq.n_samples_ = stats["n_train"]
+    return feature_columns, fills, le, preprocessor, derived
+
+
+# Pass 2, replayed by XGBoost as often as it needs: cleaned, filled and
+# transformed training chunks as float32 matrices. Held-out rows are kept
+# (up to max_eval_rows) on the first walk only.
+class TrainingChunks(xgb.DataIter):
+    def __init__(self, data_path, transform, chunk_size=DEFAULT_CHUNK_SIZE, random_state=13,
+                 max_eval_rows=DEFAULT_EVAL_ROWS, cache_prefix=None):
+        self.data_path = data_path
+        self.transform = transform
+        self.chunk_size = chunk_size
+        self.random_state = random_state
+        self.max_eval_rows = max_eval_rows
+        self.eval_X, self.eval_y = [], []
+        self._eval_done = False
+        self._chunks = None
+        self._start = 0
+        super().__init__(cache_prefix=cache_prefix)
+
+    def _eval_rows(self):
+        return sum(len(y) for y in self.eval_y)
+
+    def next(self, input_data):
+        if self._chunks is None:
+            self._chunks = iter_clean_chunks(self.data_path, self.chunk_size)
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            self._eval_done = True
+            return False
+        is_test, _ = _row_draws(self.random_state, self._start, len(chunk))
+        self._start += len(chunk)
+        X, y = self.transform(chunk)
+        if not self._eval_done and is_test.any():
+            room = self.max_eval_rows - self._eval_rows()
+            if room > 0:
+                self.eval_X.append(X[is_test][:room])
+                self.eval_y.append(y[is_test][:room])
+        input_data(data=X[~is_test], label=y[~is_test])
+        return True
+
+    def reset(self):
+        self._chunks = None
+        self._start = 0
+
+
+# train_pipeline for files larger than memory. The preprocessor is fitted on
+# a uniform sample (location frequencies exactly), then XGBoost builds its
+# quantile sketch and histograms straight from transformed chunks: a
+# QuantileDMatrix holds the data as one byte per feature, and with
+# external_memory=True an ExtMemQuantileDMatrix pages it to disk instead.
+# The saved pipeline has the usual preprocessor/derived/classifier layout.
+def train_pipeline_streaming(data_path, save_path="startup_pipeline.pkl", chunk_size=DEFAULT_CHUNK_SIZE,
+                             sample_rows=DEFAULT_SAMPLE_ROWS, max_eval_rows=DEFAULT_EVAL_ROWS,
+                             external_memory=False, cache_dir=None, params=None, num_boost_round=DEFAULT_ROUNDS,
+                             random_state=13):
+    stats = collect_statistics(data_path, chunk_size, sample_rows, random_state)
+    print(f"Rows: {stats['n_rows']} ({stats['n_train']} training), preprocessor fitted on {len(stats['sample'])}")
+    print(f"Class distribution (training rows): {stats['labels'].astype(int).to_dict()}")
+    feature_columns, fills, le, preprocessor, derived = fit_preprocessing(stats)
+    save_artifact(le, "target_encoder.pkl")
+
+    def transform(chunk):
+        chunk = chunk.fillna(fills)
+        X = derived.transform(preprocessor.transform(chunk[feature_columns]))
+        return X.astype(np.float32), le.transform(chunk["Operating Status"])
+
+    with tempfile.TemporaryDirectory(dir=cache_dir) as tmp_dir:
+        chunks = TrainingChunks(
+            data_path, transform, chunk_size, random_state, max_eval_rows,
+            cache_prefix=os.path.join(tmp_dir, "dmatrix") if external_memory else None)
+        if external_memory:
+            dtrain = xgb.ExtMemQuantileDMatrix(chunks)
+        else:
+            dtrain = xgb.QuantileDMatrix(chunks)
+        booster = xgb.train({**DEFAULT_PARAMS, **(params or {})}, dtrain, num_boost_round=num_boost_round)
+        del dtrain
+
+    classifier = xgb.XGBClassifier()
+    classifier.load_model(bytearray(booster.save_raw("ubj")))
+    print("Components fitted successfully")
+
+    if chunks.eval_y:
+        X_test, y_test = np.vstack(chunks.eval_X), np.concatenate(chunks.eval_y)
+        proba = classifier.predict_proba(X_test)[:, 1]
+        y_pred = (proba > 0.5).astype(int)
+        print(f"\nModel Performance ({len(y_test)} held-out rows):")
+        print(f"Accuracy: {accuracy_score(y_test, y_pred):.4f}")
+        print(f"Precision: {precision_score(y_test, y_pred, average='weighted'):.4f}")
+        print(f"Recall: {recall_score(y_test, y_pred, average='weighted'):.4f}")
+        print(f"F1 Score: {f1_score(y_test, y_pred, average='weighted'):.4f}")
+        if len(set(y_test)) > 1:
+            print(f"ROC AUC: {roc_auc_score(y_test, proba):.4f}")
+
+    pipeline = Pipeline([
+        ('preprocessor', preprocessor),
+        ('derived', derived),
+        ('classifier', classifier)
+    ])
+    save_artifact(pipeline, save_path)
+    print(f"\nPipeline saved to {save_path}")
+    scorer_path = scorer_path_for(save_path)
+    export_scorer(pipeline, scorer_path, source_path=save_path)
+    print(f"Compiled scorer saved to {scorer_path}")
+    return pipeline
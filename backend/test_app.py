@@ -0,0 +1,103 @@
+import os
+import shutil
+import threading
+
+import mongomock
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+import app
+import model_registry
+from model_registry import registry, save_artifact
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    for name in ("startup_pipeline.pkl", "target_encoder.pkl", "startup_og.csv"):
+        shutil.copy(os.path.join(HERE, name), tmp_path / name)
+    monkeypatch.chdir(tmp_path)
+    db_client = mongomock.MongoClient()
+    monkeypatch.setattr(app, "create_client", lambda: db_client)
+    monkeypatch.setattr(app, "mongo_client", None)
+    monkeypatch.setattr(app, "prediction_store", None)
+    monkeypatch.setattr(app, "response_cache", app.make_response_cache(None))
+    # No startup event: artifacts load lazily, as after a hot swap
+    yield TestClient(app.app)
+
+
+def load_bodies(n):
+    frame = pd.read_csv(os.path.join(HERE, "startups.csv")).drop(columns=["Operating Status", "Monthly Visit Growth"], errors="ignore")
+    return [{k.replace(" ", "_"): v for k, v in row.items()} for row in frame.head(n).to_dict("records")]
+
+
+def test_swapped_pipeline_is_reloaded_off_the_event_loop(client, monkeypatch):
+    body = load_bodies(1)[0]
+    first = client.post("/predict", json=body)
+    assert first.status_code == 200
+    loads = []
+    digest = model_registry._file_digest
+    monkeypatch.setattr(model_registry, "_file_digest", lambda path: loads.append(threading.current_thread().name) or digest(path))
+    # Publish a new pickle in place, as incremental training does
+    save_artifact(registry.get("startup_pipeline.pkl"), "startup_pipeline.pkl")
+    os.utime("startup_pipeline.pkl", ns=(0, os.stat("startup_pipeline.pkl").st_mtime_ns + 1_000_000))
+    for path, payload in (("/predict", body), ("/peer_comparison", body)):
+        assert client.post(path, json=payload).status_code == 200
+    assert loads
+    assert all(name.startswith(("predict", "analysis")) for name in loads), loads
+    assert client.post("/predict", json=body).json() == first.json()
+
+
+def seed_startups(n):
+    docs = [{"Organization_Name": f"Startup {i:03d}", "Industries": "FinTech", "Secret": i} for i in range(n)]
+    app.get_db()["active_startups"].insert_many(docs)
+    return [d["Organization_Name"] for d in docs]
+
+
+def test_startups_pages_follow_the_cursor_header(client):
+    names = seed_startups(23)
+    seen, after = [], None
+    while True:
+        response = client.get("/startups", params={"limit": 10, **({"after": after} if after else {})},
+                              headers={"Origin": "http://localhost:3000"})
+        assert response.status_code == 200
+        assert "X-Next-After" in response.headers["access-control-expose-headers"]
+        page = response.json()
+        assert all(set(s) == set(app.STARTUP_LIST_FIELDS) for s in page)
+        seen += [s["Organization_Name"] for s in page]
+        after = response.headers.get("X-Next-After")
+        if after is None:
+            break
+        assert len(page) == 10
+    assert seen == names
+
+
+def test_debug_startups_pages_follow_next_after(client):
+    names = seed_startups(23)
+    seen, after, pages = [], None, 0
+    while True:
+        body = client.get("/debug_startups", params={"limit": 10, **({"after": after} if after else {})}).json()
+        assert body["count"] == 23
+        assert all("_id" not in s and "Secret" in s for s in body["startups"])
+        seen += [s["Organization_Name"] for s in body["startups"]]
+        pages += 1
+        after = body["next_after"]
+        if after is None:
+            break
+    assert (pages, seen) == (3, names)
+
+
+def test_exact_last_page_has_no_cursor(client):
+    seed_startups(20)
+    response = client.get("/startups", params={"limit": 20})
+    assert len(response.json()) == 20 and "X-Next-After" not in response.headers
+    assert client.get("/debug_startups", params={"limit": 20}).json()["next_after"] is None
+
+
+@pytest.mark.parametrize("path", ["/startups", "/debug_startups"])
+def test_invalid_cursor_is_rejected(client, path):
+    seed_startups(3)
+    assert client.get(path, params={"after": "not-an-object-id"}).status_code == 422
+    assert client.get(path, params={"limit": 0}).status_code == 422
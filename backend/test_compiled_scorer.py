@@ -0,0 +1,140 @@
+import numpy as np
+import pandas as pd
+
+from compiled_scorer import CompiledScorer, get_scorer, predict_startup_compiled
+from model_registry import registry
+from pipeline import _prepare_prediction_frame, predict_startup
+
+# float32 scores; XGBoost's own sigmoid may round differently by an ulp
+ATOL = 1e-6
+
+INPUT_COLUMNS = [
+    "Industries", "Headquarters Location", "Estimated Revenue", "Founded Date",
+    "Investment Stage", "Industry Groups", "Number of Founders", "Founders",
+    "Number of Employees", "Number of Funding Rounds", "Funding Status",
+    "Total Funding Amount", "Growth Category", "Growth Confidence",
+    "Monthly visit", "Visit Duration Growth", "Patents Granted", "Visit Duration"
+]
+
+ODD_VALUES = [
+    None, np.nan, "", "-", "—", "unknown", "Unknown", "N/A", "nan", "xyz", "12", "1-10", "10000+",
+    "$1M to $10M", "Less than $1M", "$8,241,266", 5, 0, -3.5, 2030, 1e-5, "1_000",
+    "  FinTech, E-Commerce ", "High", "Seed",
+]
+
+
+def load_records(n):
+    frames = [
+        pd.read_csv("startups.csv").head(n),
+        pd.read_csv("startup_og.csv").head(n),
+    ]
+    frame = pd.concat(frames, ignore_index=True)
+    return frame[[c for c in INPUT_COLUMNS if c in frame.columns]].to_dict("records")
+
+
+def fuzzed_records(records, n, seed=13):
+    rng = np.random.default_rng(seed)
+    fuzzed = []
+    for _ in range(n):
+        record = dict(records[rng.integers(len(records))])
+        for column in rng.choice(INPUT_COLUMNS, size=rng.integers(1, 5), replace=False):
+            if rng.random() < 0.15:
+                record.pop(column, None)
+            else:
+                record[column] = ODD_VALUES[rng.integers(len(ODD_VALUES))]
+        fuzzed.append(record)
+    return fuzzed
+
+
+def pipeline_proba(pipeline, record):
+    return pipeline.predict_proba(_prepare_prediction_frame(pd.DataFrame([dict(record)])))[0]
+
+
+def assert_parity(records):
+    pipeline = registry.get("startup_pipeline.pkl")
+    scorer = get_scorer(pipeline)
+    compared = 0
+    for record in records:
+        try:
+            expected = pipeline_proba(pipeline, record)
+        except (ValueError, TypeError):
+            # Inputs the sklearn pipeline itself rejects are out of scope
+            continue
+        actual = scorer.predict_proba([record])[0]
+        np.testing.assert_allclose(actual, expected, rtol=0, atol=ATOL, err_msg=str(record))
+        compared += 1
+    return compared
+
+
+def test_parity_on_reference_rows():
+    assert assert_parity(load_records(300)) == 600
+
+
+def test_parity_on_missing_and_malformed_fields():
+    assert assert_parity(fuzzed_records(load_records(300), 500)) > 400
+
+
+def test_scoring_many_rows_matches_one_at_a_time():
+    scorer = get_scorer(registry.get("startup_pipeline.pkl"))
+    records = load_records(100)
+    together = scorer.predict_proba(records)
+    one_by_one = np.vstack([scorer.predict_proba([record]) for record in records])
+    np.testing.assert_array_equal(together, one_by_one)
+
+
+def test_predict_startup_compiled_matches_predict_startup():
+    for record in load_records(50):
+        expected = predict_startup(dict(record))
+        actual = predict_startup_compiled(dict(record))
+        for section in ("original_prediction", "no_hardwork_adjustment", "practical_prediction"):
+            assert actual[section]["label"] == expected[section]["label"]
+            assert actual[section]["confidence"] == expected[section]["confidence"]
+            assert abs(actual[section]["probability"] - expected[section]["probability"]) <= ATOL
+        assert actual["comparison"]["random_factor"] == expected["comparison"]["random_factor"]
+
+
+def test_scorer_round_trips_through_pickle(tmp_path):
+    from compiled_scorer import export_scorer
+    import joblib
+    pipeline = registry.get("startup_pipeline.pkl")
+    path = tmp_path / "startup_scorer.pkl"
+    export_scorer(pipeline, str(path))
+    loaded = joblib.load(path)
+    assert isinstance(loaded, CompiledScorer)
+    records = load_records(20)
+    np.testing.assert_array_equal(loaded.predict_proba(records), get_scorer(pipeline).predict_proba(records))
+
+
+def test_scorer_path_follows_pipeline_path():
+    import os
+    from compiled_scorer import scorer_path_for
+    assert scorer_path_for("startup_pipeline.pkl") == "startup_scorer.pkl"
+    assert scorer_path_for(os.path.join("models", "startup_pipeline_v2.pkl")) == os.path.join("models", "startup_scorer_v2.pkl")
+    assert scorer_path_for(os.path.join("/tmp", "run", "model.pkl")) == os.path.join("/tmp", "run", "model_scorer.pkl")
+
+
+def test_serving_loads_the_exported_scorer_while_it_matches(tmp_path):
+    import os
+    import shutil
+    from compiled_scorer import export_scorer, load_scorer
+    from model_registry import save_artifact
+    pipeline_path = str(tmp_path / "startup_pipeline.pkl")
+    shutil.copy("startup_pipeline.pkl", pipeline_path)
+    pipeline = registry.get(pipeline_path)
+    # Not exported yet: compiled from the pipeline
+    assert load_scorer(pipeline_path) is get_scorer(pipeline)
+
+    export_scorer(pipeline, str(tmp_path / "startup_scorer.pkl"), source_path=pipeline_path)
+    exported = registry.get(str(tmp_path / "startup_scorer.pkl"))
+    assert exported.source_sha256 == registry.version(pipeline_path)
+    assert load_scorer(pipeline_path) is exported
+    records = load_records(20)
+    np.testing.assert_array_equal(exported.predict_proba(records), get_scorer(pipeline).predict_proba(records))
+
+    # A newly published pipeline leaves the old scorer behind
+    pipeline.named_steps["classifier"].set_params(n_jobs=3)
+    save_artifact(pipeline, pipeline_path)
+    os.utime(pipeline_path, ns=(0, os.stat(pipeline_path).st_mtime_ns + 1_000_000))
+    current = load_scorer(pipeline_path)
+    assert current is not exported
+    assert current is get_scorer(registry.get(pipeline_path))
@@ -0,0 +1,214 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pipeline import (
+    PARSE_CACHE_SIZE, EmployeeRangeConverter, FundingConverter, RevenueMapper,
+    parse_cache_clear, parse_cache_info,
+)
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+# The per-row closures RevenueMapper/FundingConverter (identical) and
+# EmployeeRangeConverter applied before the converters were vectorised
+def legacy_parse_amount(revenue):
+    revenue = str(revenue).strip().lower()
+    if revenue in ['unknown', 'nan', 'none', '', '—', '–', '-']:
+        return np.nan
+    revenue_clean = revenue.replace('$', '').replace(',', '')
+    multiplier = 1.0
+    if 'k' in revenue_clean:
+        multiplier = 1e3
+        revenue_clean = revenue_clean.replace('k', '').strip()
+    elif 'm' in revenue_clean:
+        multiplier = 1e6
+        revenue_clean = revenue_clean.replace('m', '').strip()
+    elif 'b' in revenue_clean:
+        multiplier = 1e9
+        revenue_clean = revenue_clean.replace('b', '').strip()
+    if 'to' in revenue_clean:
+        try:
+            low, high = revenue_clean.split('to')
+            low = low.strip()
+            high = high.strip()
+            high_multiplier = multiplier
+            if 'k' in high:
+                high_multiplier = 1e3
+                high = high.replace('k', '').strip()
+            elif 'm' in high:
+                high_multiplier = 1e6
+                high = high.replace('m', '').strip()
+            elif 'b' in high:
+                high_multiplier = 1e9
+                high = high.replace('b', '').strip()
+            low_val = float(low) * multiplier
+            high_val = float(high) * high_multiplier
+            return (low_val + high_val) / 2
+        except:
+            return np.nan
+    if 'less than' in revenue_clean:
+        try:
+            value = revenue_clean.replace('less than', '').strip()
+            val_multiplier = multiplier
+            if 'k' in value:
+                val_multiplier = 1e3
+                value = value.replace('k', '').strip()
+            elif 'm' in value:
+                val_multiplier = 1e6
+                value = value.replace('m', '').strip()
+            elif 'b' in value:
+                val_multiplier = 1e9
+                value = value.replace('b', '').strip()
+            return float(value) * val_multiplier * 0.5
+        except:
+            return 500000.0 if multiplier == 1e6 else 500000000.0 if multiplier == 1e9 else 500.0
+    try:
+        return float(revenue_clean) * multiplier
+    except:
+        return np.nan
+
+
+def legacy_parse_employees(emp):
+    emp = str(emp).strip().lower()
+    if emp in ['unknown', 'nan', 'none', '', '—', '–', '-']:
+        return np.nan
+    if '-' in emp:
+        try:
+            low, high = emp.split('-')
+            return (float(low.strip()) + float(high.strip())) / 2
+        except:
+            return np.nan
+    elif '+' in emp:
+        try:
+            return float(emp.replace('+', '').strip())
+        except:
+            return np.nan
+    try:
+        return float(emp)
+    except:
+        return np.nan
+
+
+def legacy_transform(parse, X):
+    X_copy = X.copy()
+    if isinstance(X_copy, pd.DataFrame):
+        X_copy = X_copy.iloc[:, 0].astype(str).values
+    elif isinstance(X_copy, np.ndarray):
+        X_copy = X_copy.astype(str) if X_copy.ndim == 1 else X_copy[:, 0].astype(str)
+    else:
+        X_copy = np.array(X_copy, dtype=str)
+    return np.array([parse(x) for x in X_copy]).reshape(-1, 1)
+
+
+CONVERTERS = [
+    (RevenueMapper, legacy_parse_amount, "Estimated Revenue"),
+    (FundingConverter, legacy_parse_amount, "Total Funding Amount"),
+    (EmployeeRangeConverter, legacy_parse_employees, "Number of Employees"),
+]
+
+EDGE_CASES = [
+    None, np.nan, float("nan"), 0, 7, -3, 2.5, 1e9, True, "", " ", "nan", "NaN", "None", "unknown", "—", "–", "-",
+    "$1M to $10M", "$100M to $500M", "$10B+", "Less than $1M", "less than $", "less than $5B", "$8,241,266",
+    "1-10", "10000+", "1001-5000", " 51 - 100 ", "5-", "+", "1-2-3", "12k", "3.5m", "2 to", "to to",
+    "garbage", "¯\\_(ツ)_/¯", "1e3", "inf", "-inf", "0x10", "$ 1 , 000", "LESS THAN $10K", "mb", "kb to gb",
+]
+
+# Pinned values for a few labels, independent of either implementation
+PINNED = {
+    "$1M to $10M": (5.5e6, np.nan),
+    "Less than $1M": (5e5, np.nan),
+    "less than $": (500.0, np.nan),
+    "$8,241,266": (8241266.0, np.nan),
+    "1001-5000": (np.nan, 3000.5),
+    "10000+": (np.nan, 10000.0),
+    "7": (7.0, 7.0),
+    "garbage": (np.nan, np.nan),
+    None: (np.nan, np.nan),
+    "—": (np.nan, np.nan),
+}
+
+
+def reference_labels():
+    frames = [pd.read_csv(os.path.join(HERE, name)) for name in ("startups.csv", "startup_og.csv", "data_2.csv")]
+    return {column: pd.concat([f[column] for f in frames if column in f.columns]).tolist()
+            for _, _, column in CONVERTERS}
+
+
+def fuzz_labels(labels, n, seed):
+    # Reference labels, edge cases and random edits of both
+    rng = np.random.default_rng(seed)
+    pool = [str(x) for x in labels + EDGE_CASES]
+    alphabet = list("0123456789$,.-+ kmbKMBtoless than—")
+    fuzzed = []
+    for _ in range(n):
+        label = list(pool[rng.integers(len(pool))])
+        for _ in range(rng.integers(0, 4)):
+            op = rng.integers(3)
+            position = rng.integers(len(label) + 1)
+            if op == 0:
+                label.insert(position, alphabet[rng.integers(len(alphabet))])
+            elif label and op == 1:
+                del label[min(position, len(label) - 1)]
+            elif label:
+                label[min(position, len(label) - 1)] = alphabet[rng.integers(len(alphabet))]
+        fuzzed.append("".join(label))
+    return fuzzed
+
+
+@pytest.mark.parametrize("converter, parse, column", CONVERTERS)
+def test_edge_cases_match_legacy_closures(converter, parse, column):
+    X = pd.DataFrame({column: pd.Series(EDGE_CASES, dtype=object)})
+    expected = legacy_transform(parse, X)
+    actual = converter().transform(X)
+    assert actual.dtype == expected.dtype and actual.shape == expected.shape
+    np.testing.assert_array_equal(actual, expected)
+    for values in (X.to_numpy(), X[column].to_numpy(), list(X[column])):
+        np.testing.assert_array_equal(converter().transform(values), legacy_transform(parse, values))
+
+
+@pytest.mark.parametrize("converter, parse, column", CONVERTERS)
+def test_fuzzed_labels_match_legacy_closures(converter, parse, column):
+    labels = fuzz_labels(reference_labels()[column], 20_000, seed=len(column))
+    X = pd.DataFrame({column: labels})
+    np.testing.assert_array_equal(converter().transform(X), legacy_transform(parse, X))
+
+
+@pytest.mark.parametrize("label, expected", PINNED.items())
+def test_pinned_outputs(label, expected):
+    X = pd.DataFrame({"value": pd.Series([label], dtype=object)})
+    amount, employees = expected
+    np.testing.assert_array_equal(RevenueMapper().transform(X), [[amount]])
+    np.testing.assert_array_equal(FundingConverter().transform(X), [[amount]])
+    np.testing.assert_array_equal(EmployeeRangeConverter().transform(X), [[employees]])
+
+
+def test_repeated_labels_are_parsed_once_per_distinct_label():
+    parse_cache_clear()
+    X = pd.DataFrame({"value": ["$1M to $10M", "1-10", "$1M to $10M", "garbage", "1-10", "$1M to $10M"] * 50})
+    RevenueMapper().transform(X)
+    info = parse_cache_info()
+    assert (info["hits"], info["misses"], info["currsize"]) == (0, 3, 3)
+    FundingConverter().transform(X)
+    info = parse_cache_info()
+    assert (info["hits"], info["misses"], info["currsize"]) == (3, 3, 3)
+    # Same labels, different parser: its own entries
+    EmployeeRangeConverter().transform(X)
+    info = parse_cache_info()
+    assert (info["hits"], info["misses"], info["currsize"]) == (3, 6, 6)
+
+
+def test_garbage_labels_cannot_grow_the_cache_past_its_bound():
+    parse_cache_clear()
+    garbage = pd.DataFrame({"value": [f"garbage-{i}" for i in range(3 * PARSE_CACHE_SIZE)]})
+    for converter in (RevenueMapper(), EmployeeRangeConverter()):
+        assert np.isnan(converter.transform(garbage)).all()
+    info = parse_cache_info()
+    assert info["maxsize"] == PARSE_CACHE_SIZE
+    assert info["currsize"] <= info["maxsize"]
+    assert info["misses"] == 6 * PARSE_CACHE_SIZE
+    # Evicted labels still parse the same
+    X = pd.DataFrame({"value": ["$1M to $10M", "garbage-0"]})
+    np.testing.assert_array_equal(RevenueMapper().transform(X), legacy_transform(legacy_parse_amount, X))
@@ -0,0 +1,70 @@
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+import dataset_store
+from dataset_store import columnar_path, ingest_dataset, load_dataset
+from pipeline import clean_reference_frame
+from streaming_training import iter_chunks, iter_clean_chunks
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def copy_dataset(tmp_path, name):
+    path = str(tmp_path / name)
+    shutil.copy(os.path.join(HERE, name), path)
+    return path
+
+
+def test_ingested_frame_matches_cleaned_csv(tmp_path):
+    for name in ("startup_og.csv", "startups.csv", "data_2.csv"):
+        path = copy_dataset(tmp_path, name)
+        expected = clean_reference_frame(pd.read_csv(path))
+        assert ingest_dataset(path) == columnar_path(path)
+        loaded = load_dataset(path)
+        pd.testing.assert_frame_equal(loaded, expected)
+        pd.testing.assert_frame_equal(load_dataset(columnar_path(path)), expected)
+
+
+def test_float_columns_map_the_file_without_copying(tmp_path):
+    path = copy_dataset(tmp_path, "startup_og.csv")
+    ingest_dataset(path)
+    values = load_dataset(path)["Visit Duration Growth"].to_numpy()
+    # A view into the read-only memory map, NaN kept as a value
+    assert not values.flags.writeable and values.base is not None
+    assert np.isnan(values).any()
+
+
+def test_stale_file_falls_back_to_csv(tmp_path):
+    path = copy_dataset(tmp_path, "startups.csv")
+    ingest_dataset(path)
+    frame = pd.read_csv(path).head(100)
+    frame.to_csv(path, index=False)
+    assert len(load_dataset(path)) == 100
+
+
+def test_source_is_hashed_only_when_it_changes(tmp_path, monkeypatch):
+    path = copy_dataset(tmp_path, "startup_og.csv")
+    ingest_dataset(path)
+    hashed = []
+    digest = dataset_store._file_digest
+    monkeypatch.setattr(dataset_store, "_file_digest", lambda p: hashed.append(p) or digest(p))
+    for _ in range(3):
+        load_dataset(path)
+    assert hashed == []
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert len(load_dataset(path)) == len(pd.read_csv(path))
+    load_dataset(path)
+    assert hashed == [path]
+
+
+def test_clean_chunks_same_with_and_without_ingested_file(tmp_path):
+    path = copy_dataset(tmp_path, "data_2.csv")
+    from_csv = pd.concat(iter_clean_chunks(path, 300), ignore_index=True)
+    ingest_dataset(path)
+    from_arrow = pd.concat(iter_clean_chunks(path, 300), ignore_index=True)
+    pd.testing.assert_frame_equal(from_arrow, from_csv)
+    pd.testing.assert_frame_equal(from_csv, clean_reference_frame(pd.concat(iter_chunks(path, 300), ignore_index=True)))
@@ -0,0 +1,48 @@
+import numpy as np
+from scipy.stats import zscore
+
+from pipeline import W_H, W_O, DerivedFeatures
+
+FEATURE_NAMES = [
+    "Number of Founders", "revenue_mapped", "employees_converted",
+    "funding_amount_converted", "years_active", "growth_confidence_converted",
+]
+
+
+def make_matrix(n, seed=13):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n, len(FEATURE_NAMES)))
+    X[rng.random(n) < 0.1, 1] = np.nan
+    X[rng.random(n) < 0.1, 2] = 0.0
+    X[rng.random(n) < 0.1, 4] = 0.0
+    return X
+
+
+def test_fit_learns_hardwork_statistics():
+    X = make_matrix(500)
+    derived = DerivedFeatures().fit(X, feature_names=FEATURE_NAMES)
+    hardwork = X[:, 1] / np.where(X[:, 2] == 0, 1, X[:, 2])
+    hardwork = np.where(np.isnan(hardwork), 0, hardwork)
+    assert derived.hardwork_mean_ == hardwork.mean()
+    assert derived.hardwork_std_ == hardwork.std()
+    # On the training matrix the score matches the old batch z-score
+    expected = W_H * zscore(hardwork) + W_O * X[:, 5]
+    np.testing.assert_allclose(derived.transform(X)[:, -1], expected)
+
+
+def test_rows_score_the_same_alone_and_in_a_batch():
+    derived = DerivedFeatures().fit(make_matrix(500), feature_names=FEATURE_NAMES)
+    X = make_matrix(50, seed=7)
+    batch = derived.transform(X)
+    one_by_one = np.vstack([derived.transform(X[i:i + 1]) for i in range(len(X))])
+    np.testing.assert_array_equal(batch, one_by_one)
+    assert not np.isnan(batch[:, -1]).any()
+
+
+def test_pipelines_without_statistics_score_rows_on_their_own():
+    derived = DerivedFeatures().fit(make_matrix(500), feature_names=FEATURE_NAMES)
+    del derived.hardwork_mean_, derived.hardwork_std_, derived.column_positions_
+    X = make_matrix(20, seed=7)
+    out = derived.transform(X)
+    assert np.isnan(out[:, -1]).all()
+    np.testing.assert_array_equal(out[:, :-1], np.vstack([derived.transform(X[i:i + 1])[:, :-1] for i in range(len(X))]))
@@ -0,0 +1,92 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from feature_store import get_feature_store
+from model_registry import registry
+from pipeline import _startup_frame, clean_reference_frame, generate_peer_comparison_report
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DATASET = os.path.join(HERE, "startup_og.csv")
+
+
+def reference_record(name):
+    frame = clean_reference_frame(pd.read_csv(DATASET)).drop(columns=["Operating Status"], errors="ignore")
+    record = frame[frame["Organization Name"] == name].iloc[0].to_dict()
+    return {k: None if isinstance(v, float) and np.isnan(v) else v for k, v in record.items()}
+
+
+PROBE = {
+    "Organization Name": "Probe Labs", "Industries": "FinTech, Payments",
+    "Headquarters Location": "Bengaluru, Karnataka, India", "Estimated Revenue": "$1M to $10M",
+    "Founded Date": 2018.0, "Investment Stage": "Seed", "Industry Groups": "Financial Services, Payments",
+    "Number of Founders": 3.0, "Founders": "A, B, C", "Number of Employees": "51-100",
+    "Number of Funding Rounds": 2.0, "Funding Status": "Seed", "Total Funding Amount": "$2,500,000",
+    "Growth Category": "Growing", "Growth Confidence": "Medium", "Monthly visit": 12000.0,
+    "Visit Duration Growth": 5.0, "Patents Granted": 0.0, "Visit Duration": 120.0,
+}
+
+# Pinned against the committed startup_pipeline.pkl and startup_og.csv
+EXPECTED = {
+    "KisanKonnect": {
+        "peers": ["Farm Theory", "AGROWAVE", "Celcius Logistics Solutions", "Grab", "Vulcan Express"],
+        "pros": ["Growth Confidence", "Hardwork Factor", "Non-Financial Score (N)"],
+        "cons": ["Estimated Revenue", "Number of Employees", "Total Funding Amount", "Years Active", "Funding Per Year"],
+        "z": [-0.157541, 0.190011, -0.260263, 2.869123, -0.818735, -0.601979, 1.46908, 1.947871],
+    },
+    "Mensa Brands": {
+        "peers": ["Jass Brands", "1Crowd", "StartupLanes", "Venture Finance Solutions", "XIFAQ Consulting"],
+        "pros": ["Estimated Revenue", "Number of Employees", "Total Funding Amount", "Funding Per Year"],
+        "cons": ["Growth Confidence", "Years Active", "Hardwork Factor", "Non-Financial Score (N)"],
+        "z": [-0.126529, 0.637838, 2.473887, -0.341332, -1.13897, 17.825038, -1.277062, -1.338462],
+    },
+    "Probe Labs": {
+        "peers": ["iServeU", "BriskPe", "DGV", "Infinity", "OmegaOn"],
+        "pros": ["Estimated Revenue", "Years Active"],
+        "cons": ["Number of Employees", "Total Funding Amount", "Growth Confidence", "Funding Per Year",
+                 "Hardwork Factor", "Non-Financial Score (N)"],
+        "z": [-0.157541, -0.168251, -0.315215, -0.341332, -0.178265, -0.33087, 0.08574, 0.029829],
+    },
+}
+
+
+@pytest.fixture(scope="module")
+def store():
+    return get_feature_store(DATASET, registry.get(os.path.join(HERE, "startup_pipeline.pkl")))
+
+
+def load_input(name):
+    return dict(PROBE) if name == PROBE["Organization Name"] else reference_record(name)
+
+
+@pytest.mark.parametrize("name", sorted(EXPECTED))
+def test_peer_report_is_pinned(name, store):
+    expected = EXPECTED[name]
+    report = generate_peer_comparison_report(load_input(name), DATASET, pipeline_path=os.path.join(HERE, "startup_pipeline.pkl"))
+    assert report["Similar_Startups"] == expected["peers"]
+    assert report["Pros"] == expected["pros"]
+    assert report["Cons"] == expected["cons"]
+    _, frame = _startup_frame(load_input(name))
+    np.testing.assert_allclose(store.zscore(store.transform(frame)[0]), expected["z"], atol=1e-6)
+
+
+def test_startup_is_never_its_own_peer(store):
+    # Every reference startup, queried as itself, gets five other startups
+    frame = clean_reference_frame(pd.read_csv(DATASET)).head(40)
+    for i in range(len(frame)):
+        row = frame.iloc[[i]].reset_index(drop=True)
+        name = row["Organization Name"][0]
+        peers = store.names[store.most_similar(row, 5, exclude=name)]
+        assert len(peers) == 5
+        assert name not in list(peers)
+
+
+def test_store_matches_reference_statistics(store):
+    assert len(store) == len(pd.read_csv(DATASET))
+    assert store.selected_features == [
+        "revenue_mapped", "employees_converted", "funding_amount_converted", "growth_confidence_converted",
+        "years_active", "Funding Per Year", "Hardwork Factor", "Non-Financial Score (N)",
+    ]
+    np.testing.assert_allclose(np.nanmean(store.z_scores, axis=0), 0, atol=1e-9)
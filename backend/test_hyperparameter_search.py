@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from hyperparameter_search import make_candidates, resolve_params, search_hyperparameters
+from pipeline import _prepare_prediction_frame
+from training import create_preprocessing_pipeline
+
+SMALL_GRID = {"max_depth": [2, 3], "learning_rate": [0.1], "n_estimators": [20, 40], "scale_pos_weight": [1, "balanced"]}
+
+
+def load_training_data(n=300):
+    frame = pd.read_csv("startups.csv").head(n)
+    y = (frame["Operating Status"] == "Closed").astype(int).to_numpy()
+    return _prepare_prediction_frame(frame.drop(columns=["Operating Status"])), y
+
+
+def scores(board):
+    return board.drop(columns=["mean_fit_time"])
+
+
+def test_candidates_are_reproducible():
+    assert len(make_candidates("grid", param_grid=SMALL_GRID)) == 8
+    assert make_candidates("random", 5, random_state=3) == make_candidates("random", 5, random_state=3)
+    with pytest.raises(ValueError):
+        make_candidates("bayes")
+
+
+def test_balanced_class_weight():
+    y = np.array([0, 0, 0, 1])
+    assert resolve_params({"scale_pos_weight": "balanced"}, y) == {"scale_pos_weight": 3.0}
+
+
+def test_grid_search_same_in_process_and_in_pool():
+    X, y = load_training_data()
+    best, board = search_hyperparameters(create_preprocessing_pipeline(), X, y, mode="grid", cv=3, processes=1, param_grid=SMALL_GRID)
+    pooled_best, pooled = search_hyperparameters(create_preprocessing_pipeline(), X, y, mode="grid", cv=3, processes=2, param_grid=SMALL_GRID)
+    assert best == pooled_best
+    pd.testing.assert_frame_equal(scores(board), scores(pooled))
+    assert list(board["rank"]) == list(range(1, 9))
+    assert board["mean_roc_auc"].is_monotonic_decreasing
+
+
+def test_halving_scores_survivors_on_full_folds():
+    X, y = load_training_data()
+    best, board = search_hyperparameters(create_preprocessing_pipeline(), X, y, mode="halving", n_iter=9, cv=3, processes=1)
+    assert len(board) == 9
+    assert board.loc[0, "sample_fraction"] == 1.0
+    assert (board["sample_fraction"] == 1.0).sum() == 3
+    assert best == make_candidates("halving", 9)[board.loc[0, "candidate"]]
@@ -0,0 +1,112 @@
+import json
+import os
+import shutil
+from datetime import datetime
+
+import joblib
+import mongomock
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from compiled_scorer import CompiledScorer, load_scorer
+from incremental_training import export_labelled_rows, train_incremental
+from model_registry import registry
+from pipeline import FrequencyEncoder, IndustriesEncoder, _prepare_prediction_frame
+from training import train_pipeline
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def test_encoder_partial_fit_matches_fit_on_all_rows():
+    first = np.array(["FinTech, SaaS", "E-Commerce", "FinTech", "Health Care"])
+    second = np.array(["SaaS", "Health Care, FinTech", "Robotics"])
+    encoder = IndustriesEncoder().fit(first).partial_fit(second)
+    full = TfidfVectorizer(vocabulary=encoder.vectorizer.vocabulary_).fit(np.concatenate([first, second]))
+    np.testing.assert_allclose(encoder.vectorizer.idf_, full.idf_)
+
+    locations = np.array(["Delhi", "Mumbai", "Delhi", "Pune"])
+    more = np.array(["Delhi", "Goa"])
+    refreshed = FrequencyEncoder().fit(locations).partial_fit(more)
+    expected = FrequencyEncoder().fit(np.concatenate([locations, more]))
+    assert refreshed.freq_map_.keys() == expected.freq_map_.keys()
+    for key, freq in expected.freq_map_.items():
+        assert abs(refreshed.freq_map_[key] - freq) < 1e-12
+
+
+def make_db(frame):
+    db = mongomock.MongoClient()["startup_db"]
+    docs = [{key.replace(" ", "_"): value for key, value in row.items()} for row in frame.to_dict("records")]
+    db["active_startups"].insert_many(docs[: len(docs) // 2])
+    db["closed_startups"].insert_many(docs[len(docs) // 2:])
+    return db
+
+
+def test_unlabelled_rows_are_skipped():
+    frame = pd.read_csv(os.path.join(HERE, "data_2.csv")).drop_duplicates("Organization Name").head(40)
+    frame.loc[:9, "Operating Status"] = None
+    db = make_db(frame)
+    rows, high_water = export_labelled_rows(db, ["Active", "Closed"])
+    assert len(rows) == 30
+    assert "Organization Name" in rows.columns and "Operating Status" in rows.columns
+    assert high_water["_id"] is not None and high_water["labelled_at"] is None
+    # Nothing past the mark until something new is labelled
+    rows, again = export_labelled_rows(db, ["Active", "Closed"], high_water)
+    assert len(rows) == 0 and again == high_water
+    db["closed_startups"].insert_one({"Organization_Name": "Acme", "Operating_Status": "Closed"})
+    rows, _ = export_labelled_rows(db, ["Active", "Closed"], high_water)
+    assert rows["Organization Name"].tolist() == ["Acme"]
+
+
+def test_corrected_outcomes_are_exported_again():
+    db = mongomock.MongoClient()["startup_db"]
+    db["active_startups"].insert_one({"Organization_Name": "Acme", "Operating_Status": "Active",
+                                      "Operating_Status_Updated_At": datetime(2026, 1, 1)})
+    rows, high_water = export_labelled_rows(db, ["Active", "Closed"])
+    assert rows["Operating Status"].tolist() == ["Active"]
+    assert high_water["labelled_at"] == "2026-01-01T00:00:00"
+    assert len(export_labelled_rows(db, ["Active", "Closed"], high_water)[0]) == 0
+    db["active_startups"].update_one({"Organization_Name": "Acme"}, {"$set": {
+        "Operating_Status": "Closed", "Operating_Status_Updated_At": datetime(2026, 2, 1)}})
+    # Its prediction flipped too: the older copy in the other collection loses
+    db["closed_startups"].insert_one({"Organization_Name": "Acme", "Operating_Status": "Active",
+                                      "Operating_Status_Updated_At": datetime(2026, 1, 15)})
+    rows, high_water = export_labelled_rows(db, ["Active", "Closed"], high_water)
+    assert rows["Operating Status"].tolist() == ["Closed"]
+    assert high_water["labelled_at"] == "2026-02-01T00:00:00"
+
+
+def test_warm_start_publishes_new_version(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    base = train_pipeline(os.path.join(HERE, "startups.csv"), cache_dir=None)
+    trees = base.named_steps["classifier"].get_booster().num_boosted_rounds()
+    frame = pd.read_csv(os.path.join(HERE, "data_2.csv")).drop_duplicates("Organization Name").head(300)
+    db = make_db(frame)
+
+    # By default the encoders the existing trees were fitted on stay as they are
+    shutil.copy("startup_pipeline.pkl", "plain.pkl")
+    plain = train_incremental(db, pipeline_path="plain.pkl", model_dir="plain_models", rounds=10)
+    assert not plain["refreshed_statistics"]
+    freq = joblib.load("plain.pkl").named_steps["preprocessor"].named_transformers_["freq"].named_steps["freq_encoder"]
+    assert freq.n_samples_ == 850
+
+    entry = train_incremental(db, rounds=10, refresh_statistics=True)
+    assert entry["rows"] == 300 and entry["trees"] == trees + 10 and entry["refreshed_statistics"]
+    published = joblib.load("startup_pipeline.pkl")
+    assert published.named_steps["classifier"].get_booster().num_boosted_rounds() == trees + 10
+    assert os.path.exists(entry["path"])
+    with open(os.path.join("models", "versions.json")) as f:
+        assert json.load(f)["high_water"]["_id"] is not None
+    freq = published.named_steps["preprocessor"].named_transformers_["freq"].named_steps["freq_encoder"]
+    assert freq.n_samples_ == 850 + 300
+
+    # The exported scorer follows the refreshed statistics and the new trees
+    X = _prepare_prediction_frame(frame.drop(columns=["Operating Status"]).head(50))
+    scorer = joblib.load("startup_scorer.pkl")
+    assert isinstance(scorer, CompiledScorer)
+    assert scorer.source_sha256 == registry.digest("startup_pipeline.pkl")
+    assert load_scorer().source_sha256 == scorer.source_sha256
+    np.testing.assert_allclose(scorer.predict_proba(X.to_dict("records")), published.predict_proba(X), atol=1e-6)
+
+    # Nothing new since the last run
+    assert train_incremental(db, rounds=10) is None
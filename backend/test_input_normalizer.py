@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+
+from compiled_scorer import get_scorer
+from model_registry import registry
+from pipeline import (
+    InputNormalizer, NUMERIC_COLUMNS, PLACEHOLDER_COLUMNS, _prepare_prediction_frame, clean_reference_frame, input_normalizer
+)
+
+
+def test_placeholders_are_whole_values():
+    frame = pd.DataFrame({
+        "Visit Duration Growth": ["-95.74", " - ", "N/A", np.nan, "12"],
+        "Estimated Revenue": ["$1M to $10M", "—", "unknown ", np.nan, "Less than $1M"],
+        "Industries": ["E-Commerce", " nan ", "Financial Services", "–", " FinTech "],
+        "Number of Employees": [" 1-10", np.nan, "11-50", 5, "10000+"],
+    })
+    cleaned = input_normalizer.transform(frame)
+    np.testing.assert_array_equal(cleaned["Visit Duration Growth"], [-95.74, np.nan, np.nan, np.nan, 12.0])
+    assert cleaned["Estimated Revenue"].isna().tolist() == [False, True, True, True, False]
+    assert cleaned["Industries"].tolist() == ["E-Commerce", "Unknown", "Financial Services", "Unknown", "FinTech"]
+    assert cleaned["Number of Employees"].tolist()[::2] == ["1-10", "11-50", "10000+"]
+    # The caller's frame is left as it was
+    assert frame["Visit Duration Growth"].tolist()[0] == "-95.74"
+
+
+def test_numeric_columns_skip_the_string_round_trip():
+    frame = pd.DataFrame({"Monthly visit": [500.0, np.nan, -1.0], "Patents Granted": [0, 3, 1]})
+    cleaned = InputNormalizer().transform(frame)
+    assert np.shares_memory(cleaned["Monthly visit"].values, frame["Monthly visit"].values)
+    pd.testing.assert_frame_equal(cleaned, frame)
+
+
+def test_same_cleanup_for_strings_and_parsed_csv():
+    as_strings = clean_reference_frame(pd.read_csv("startups.csv", dtype=str))
+    parsed = clean_reference_frame(pd.read_csv("startups.csv"))
+    # Negative growth figures survive the cleanup
+    assert (parsed["Visit Duration Growth"] < 0).any()
+    for col in NUMERIC_COLUMNS:
+        # read_csv's float parser may differ from to_numeric in the last ulp
+        np.testing.assert_allclose(as_strings[col].astype(float), parsed[col].astype(float), rtol=1e-15)
+    labels = PLACEHOLDER_COLUMNS + ["Industries", "Number of Employees"]
+    pd.testing.assert_frame_equal(as_strings[labels], parsed[labels])
+
+
+def test_compiled_scorer_keeps_negatives():
+    record = pd.read_csv("startups.csv").drop(columns=["Operating Status"]).head(1).to_dict("records")[0]
+    pipeline = registry.get("startup_pipeline.pkl")
+    for growth in (-250.0, "-250", 250.0):
+        row = dict(record, **{"Visit Duration Growth": growth})
+        expected = pipeline.predict_proba(_prepare_prediction_frame(pd.DataFrame([row])))
+        np.testing.assert_allclose(get_scorer(pipeline).predict_proba([row]), expected, atol=1e-6)
@@ -0,0 +1,68 @@
+import os
+
+import joblib
+import pytest
+
+import model_registry
+from model_registry import ModelRegistry, file_signature, save_artifact
+
+
+def bump(path, ns):
+    os.utime(path, ns=(ns, ns))
+
+
+def test_reloads_when_signature_changes(tmp_path):
+    path = str(tmp_path / "model.pkl")
+    save_artifact({"version": 1}, path)
+    bump(path, 1_000_000_000)
+    registry = ModelRegistry()
+    assert registry.get(path) == {"version": 1}
+    first_version = registry.version(path)
+
+    # Same (mtime, size): served from the cache even though the file changed
+    loads = []
+    save_artifact({"version": 2}, path)
+    bump(path, 1_000_000_000)
+    counting = lambda p: loads.append(p) or joblib.load(p)
+    assert registry.get(path, counting) == {"version": 1}
+    assert loads == []
+
+    bump(path, 2_000_000_000)
+    assert registry.get(path, counting) == {"version": 2}
+    assert len(loads) == 1
+    assert registry.version(path) != first_version
+
+
+def test_failed_reload_keeps_previous_artifact(tmp_path):
+    path = str(tmp_path / "model.pkl")
+    save_artifact([1, 2, 3], path)
+    registry = ModelRegistry()
+    assert registry.get(path) == [1, 2, 3]
+    with open(path, "wb") as f:
+        f.write(b"not a pickle, or not all of one")
+    bump(path, 3_000_000_000)
+    assert registry.get(path) == [1, 2, 3]
+
+    # Nothing to fall back to on a first load
+    with pytest.raises(Exception):
+        ModelRegistry().get(path)
+
+
+def test_save_artifact_replaces_atomically(tmp_path, monkeypatch):
+    path = str(tmp_path / "model.pkl")
+    save_artifact("old", path)
+    renames = []
+    real_replace = os.replace
+
+    def replace(src, dst):
+        # The target still holds the old artifact until the rename
+        assert joblib.load(dst) == "old" and joblib.load(src) == "new"
+        renames.append((src, dst))
+        real_replace(src, dst)
+
+    monkeypatch.setattr(model_registry.os, "replace", replace)
+    save_artifact("new", path)
+    assert renames == [(f"{path}.{os.getpid()}.tmp", path)]
+    assert joblib.load(path) == "new"
+    assert os.listdir(tmp_path) == ["model.pkl"]
+    assert file_signature(path) == (os.stat(path).st_mtime_ns, os.stat(path).st_size)
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+from scipy.sparse import random as sparse_random
+
+from peer_index import ExactPeerIndex, LSHPeerIndex, load_peer_index, make_peer_index, top_k
+
+
+def corpus(n=2000, dims=60, seed=3):
+    return sparse_random(n, dims, density=0.1, format="csr", random_state=seed)
+
+
+def test_top_k_breaks_ties_by_row_index():
+    scores = np.array([0.2, 0.9, 0.5, 0.9, 0.5, 0.1, 0.9])
+    assert top_k(scores, 2).tolist() == [1, 3]
+    assert top_k(scores, 4).tolist() == [1, 3, 6, 2]
+    assert top_k(scores, 10).tolist() == np.argsort(-scores, kind="stable").tolist()
+    assert top_k(scores, 0).tolist() == []
+
+
+def test_exact_index_matches_brute_force_cosine():
+    vectors = corpus(300).toarray()
+    index = ExactPeerIndex().add(vectors)
+    query = vectors[17] + 0.01
+    unit = vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-300)
+    expected = np.argsort(-(unit @ (query / np.linalg.norm(query))), kind="stable")[:5]
+    assert index.query(query.reshape(1, -1), 5).tolist() == expected.tolist()
+    assert ExactPeerIndex().query(query.reshape(1, -1), 5).tolist() == []
+
+
+def test_incremental_add_keeps_row_positions():
+    vectors = corpus(500)
+    whole = ExactPeerIndex().add(vectors)
+    parts = ExactPeerIndex().add(vectors[:200]).add(vectors[200:])
+    assert len(parts) == 500
+    for row in (0, 250, 499):
+        assert parts.query(vectors[row], 8).tolist() == whole.query(vectors[row], 8).tolist()
+
+    lsh = LSHPeerIndex(random_state=1).add(vectors[:200]).add(vectors[200:])
+    assert lsh.codes.shape == (500, lsh.n_tables)
+    # Every row finds itself first once added
+    assert lsh.query(vectors[450], 1).tolist() == [450]
+
+
+def test_lsh_recall_against_exact():
+    vectors = corpus()
+    exact = ExactPeerIndex().add(vectors)
+    lsh = LSHPeerIndex(n_tables=16, n_bits=8).add(vectors)
+    # Ranked from a bucket subset, not the full-scan fallback
+    assert 10 <= len(lsh.candidates(vectors[0])) < vectors.shape[0]
+    k, hits = 10, 0
+    for row in range(0, 2000, 40):
+        hits += len(set(lsh.query(vectors[row], k)) & set(exact.query(vectors[row], k)))
+    assert hits / (50 * k) >= 0.8
+
+
+def test_save_load_round_trip(tmp_path):
+    vectors = corpus(400)
+    for kind in ("exact", "lsh"):
+        index = make_peer_index(kind).add(vectors)
+        path = str(tmp_path / f"{kind}.pkl")
+        index.save(path)
+        loaded = load_peer_index(path)
+        assert type(loaded) is type(index) and len(loaded) == 400
+        for row in (3, 123, 399):
+            assert loaded.query(vectors[row], 5).tolist() == index.query(vectors[row], 5).tolist()
+    with pytest.raises(ValueError):
+        make_peer_index("annoy")
@@ -0,0 +1,159 @@
+import mongomock
+import pytest
+from pymongo.errors import PyMongoError
+
+from persistence import PredictionStore, find_page
+
+
+def make_result(label, display_label, confidence="High"):
+    return {"practical_prediction": {"label": label, "display_label": display_label, "confidence": confidence}}
+
+
+def make_store(**kwargs):
+    db = mongomock.MongoClient()["startup_db"]
+    store = PredictionStore(db, **kwargs)
+    store.ensure_indexes()
+    return db, store
+
+
+def test_unique_indexes_created():
+    db, store = make_store()
+    for name in ("active_startups", "closed_startups"):
+        index = db[name].index_information()["Organization_Name_unique"]
+        assert index["unique"]
+
+
+def test_upserts_buffered_until_flush():
+    db, store = make_store(max_batch=100)
+    store.record({"Organization_Name": "A", "Industries": "FinTech"}, make_result("Active", "Successful"))
+    store.record({"Organization_Name": "B"}, make_result("Closed", "Struggling"))
+    assert db["active_startups"].count_documents({}) == 0
+    assert store.flush() == {"Active": 1, "Closed": 1}
+    assert db["active_startups"].find_one({"Organization_Name": "A"}, {"_id": 0}) == {
+        "Organization_Name": "A", "Industries": "FinTech", "prediction": "Successful", "confidence_level": "High"
+    }
+    assert db["closed_startups"].count_documents({}) == 1
+    assert store.pending() == 0
+
+
+def test_repeated_upserts_merge_into_one_write():
+    db, store = make_store(max_batch=100)
+    store.record({"Organization_Name": "A", "Industries": "FinTech"}, make_result("Active", "Successful", "Low"))
+    store.record({"Organization_Name": "A", "Funding_Status": "Seed"}, make_result("Active", "Successful", "High"))
+    assert store.flush() == {"Active": 1}
+    doc = db["active_startups"].find_one({"Organization_Name": "A"}, {"_id": 0})
+    assert doc["Industries"] == "FinTech"
+    assert doc["Funding_Status"] == "Seed"
+    assert doc["confidence_level"] == "High"
+    store.record({"Organization_Name": "A", "Industries": "HealthTech"}, make_result("Active", "Successful"))
+    store.flush()
+    assert db["active_startups"].count_documents({}) == 1
+    assert db["active_startups"].find_one({"Organization_Name": "A"})["Industries"] == "HealthTech"
+
+
+def test_max_batch_triggers_flush():
+    db, store = make_store(max_batch=3)
+    rows = [{"Organization_Name": f"S{i}"} for i in range(3)]
+    store.record_batch(rows, [make_result("Active", "Successful")] * 3)
+    assert db["active_startups"].count_documents({}) == 3
+
+
+def test_background_flush_and_close():
+    db, store = make_store(flush_interval=0.05, max_batch=1000)
+    store.start()
+    store.record({"Organization_Name": "A"}, make_result("Active", "Successful"))
+    store.record({"Organization_Name": "B"}, make_result("Unknown", "?"))
+    store.close()
+    assert db["active_startups"].count_documents({}) == 1
+    assert db["closed_startups"].count_documents({}) == 0
+
+
+class FailingWrites:
+    def __init__(self, collection):
+        self.collection = collection
+        self.attempts = 0
+        self.failing = True
+
+    def bulk_write(self, ops, ordered=True):
+        self.attempts += 1
+        if self.failing:
+            raise PyMongoError("server selection timed out")
+        return self.collection.bulk_write(ops, ordered=ordered)
+
+
+def test_failed_flush_backs_off_before_retrying():
+    db, store = make_store(max_batch=2, retry_backoff=60)
+    active = store.collections["Active"] = FailingWrites(db["active_startups"])
+    rows = [{"Organization_Name": f"S{i}"} for i in range(5)]
+    store.record_batch(rows, [make_result("Active", "Successful")] * 5)
+    # Only the record that reached max_batch flushed; later ones don't wait on Mongo again
+    assert active.attempts == 1
+    assert store.failed_flushes == 1
+    assert store.backing_off()
+    assert store.pending() == 5
+    active.failing = False
+    store._retry_at = 0.0
+    assert store.flush() == {"Active": 5}
+    assert not store.backing_off()
+    assert store._backoff == 0.0
+
+
+def test_backoff_doubles_up_to_the_maximum():
+    db, store = make_store(max_batch=100, retry_backoff=1, max_retry_backoff=3)
+    store.collections["Active"] = FailingWrites(db["active_startups"])
+    store.record({"Organization_Name": "A"}, make_result("Active", "Successful"))
+    backoffs = []
+    for _ in range(4):
+        store.flush()
+        backoffs.append(store._backoff)
+    assert backoffs == [1, 2, 3, 3]
+
+
+def test_buffer_is_capped_while_writes_fail():
+    db, store = make_store(max_batch=100, max_buffered=3)
+    store.collections["Active"] = FailingWrites(db["active_startups"])
+    rows = [{"Organization_Name": f"S{i}"} for i in range(5)]
+    store.record_batch(rows, [make_result("Active", "Successful")] * 5)
+    assert store.pending() == 3
+    assert store.dropped == 2
+    # Updates to a startup already waiting still merge in
+    store.record({"Organization_Name": "S0", "Industries": "FinTech"}, make_result("Active", "Successful"))
+    assert store.dropped == 2
+    store.flush()
+    assert store.pending() == 3
+    # The failed batch went back into the buffer, which is still full
+    store.record({"Organization_Name": "S9"}, make_result("Closed", "Struggling"))
+    assert store.pending() == 3
+    assert store.dropped == 3
+
+
+def test_find_page_walks_every_document_once():
+    db = mongomock.MongoClient()["startup_db"]
+    collection = db["active_startups"]
+    # A startup without a name used to end pagination when it closed a page
+    collection.insert_many([{"Organization_Name": "B"}, {"Industries": "FinTech"}, {"Organization_Name": None},
+                            {"Organization_Name": "A"}, {"Organization_Name": "C"}])
+    pages, after = [], None
+    while True:
+        docs, after = find_page(collection, limit=2, after=after)
+        pages.append(docs)
+        if after is None:
+            break
+    assert [len(docs) for docs in pages] == [2, 2, 1]
+    assert [doc.get("Organization_Name", "-") for docs in pages for doc in docs] == ["B", "-", None, "A", "C"]
+    assert all("_id" not in doc for docs in pages for doc in docs)
+
+
+def test_find_page_projection_and_last_page():
+    db = mongomock.MongoClient()["startup_db"]
+    collection = db["active_startups"]
+    collection.insert_many([{"Organization_Name": "A", "Industries": "FinTech", "prediction": "Successful"}])
+    docs, after = find_page(collection, {"Industries": 1}, limit=1)
+    assert docs == [{"Organization_Name": "A", "Industries": "FinTech"}]
+    assert after is None
+
+
+def test_find_page_rejects_invalid_cursor():
+    db = mongomock.MongoClient()["startup_db"]
+    with pytest.raises(ValueError):
+        find_page(db["active_startups"], after="not-a-cursor")
@@ -0,0 +1,123 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from inference import get_engine
+from model_registry import registry
+from pipeline import _prepare_prediction_frame, _random_factors, predict_startup, predict_startups_batch
+
+N_THREADS = 16
+
+
+def legacy_random_factors(hardwork):
+    # The global-RNG sequence predict_startup used before per-call generators
+    factors = []
+    for h in hardwork:
+        np.random.seed(int(h * 1000) % 10000)
+        factors.append(np.random.normal(0, 0.15))
+    return np.array(factors)
+
+
+def load_records(n):
+    frame = pd.read_csv("startups.csv").drop(columns=["Operating Status"])
+    return frame.head(n).to_dict("records")
+
+
+# Records and the exact predict_startup output the original joblib-per-call,
+# pipeline.predict-then-transform implementation gave for them
+def load_golden():
+    with open("golden_predictions.jsonl") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_predict_startup_matches_golden_output():
+    golden = load_golden()
+    actual = [json.dumps(predict_startup(dict(g["record"]))) for g in golden]
+    assert actual == [json.dumps(g["prediction"]) for g in golden]
+
+
+def test_predict_startups_batch_matches_golden_output():
+    golden = load_golden()
+    actual = predict_startups_batch(pd.DataFrame([g["record"] for g in golden]))
+    assert [json.dumps(a) for a in actual] == [json.dumps(g["prediction"]) for g in golden]
+
+
+def test_random_factors_match_global_seeding():
+    hardwork = np.random.default_rng(7).uniform(-3, 12, 20000)
+    assert np.array_equal(_random_factors(hardwork), legacy_random_factors(hardwork))
+
+
+def test_random_factors_match_global_seeding_for_extreme_values():
+    hardwork = np.array([-1e300, -9.3e15, -2.5e12, 1e16 + 2, 9.3e15, 3.7e18, 1e200, np.finfo(float).max / 1000])
+    assert np.array_equal(_random_factors(hardwork), legacy_random_factors(hardwork))
+
+
+@pytest.mark.parametrize("value", [np.nan, np.inf, -np.inf, np.finfo(float).max])
+def test_random_factors_reject_non_finite_hardwork(value):
+    with pytest.raises(ValueError):
+        _random_factors(np.array([1.0, value]))
+
+
+def test_random_factors_leave_global_state_alone():
+    np.random.seed(123)
+    expected = np.random.random()
+    np.random.seed(123)
+    _random_factors(np.linspace(0, 5, 100))
+    assert np.random.random() == expected
+
+
+def test_concurrent_random_factors_match_serial():
+    chunks = [np.random.default_rng(i).uniform(0, 10, 50) for i in range(4000)]
+    serial = [_random_factors(chunk) for chunk in chunks]
+    with ThreadPoolExecutor(max_workers=N_THREADS) as executor:
+        concurrent = list(executor.map(_random_factors, chunks))
+    for expected, actual in zip(serial, concurrent):
+        assert np.array_equal(expected, actual)
+
+
+def test_concurrent_predictions_match_serial():
+    records = load_records(500)
+    serial = [predict_startup(dict(record)) for record in records]
+    with ThreadPoolExecutor(max_workers=N_THREADS) as executor:
+        concurrent = list(executor.map(lambda record: predict_startup(dict(record)), records * 4))
+    assert concurrent == serial * 4
+
+
+def test_concurrent_batches_match_serial():
+    frame = pd.DataFrame(load_records(1000))
+    chunks = [frame.iloc[start:start + 50] for start in range(0, len(frame), 50)]
+    serial = [predict_startups_batch(chunk) for chunk in chunks]
+    with ThreadPoolExecutor(max_workers=N_THREADS) as executor:
+        concurrent = list(executor.map(predict_startups_batch, chunks * 4))
+    assert concurrent == serial * 4
+
+
+def legacy_practical_probs(prediction_probs, hardwork_factor, active_class_idx=0):
+    # The original one-row arithmetic: scalar adjustment and a Python float
+    # random factor added to the float32 probabilities
+    adjusted_probs = prediction_probs.copy()
+    normalized_hardwork = (hardwork_factor - np.mean(hardwork_factor)) / (np.std(hardwork_factor) + 1e-10)
+    adjustment = np.clip(normalized_hardwork * 0.2, -0.2, 0.2)
+    adjusted_probs[0, active_class_idx] = np.clip(adjusted_probs[0, active_class_idx] + adjustment, 0, 1)
+    adjusted_probs = adjusted_probs / adjusted_probs.sum(axis=1, keepdims=True)
+    np.random.seed(int(hardwork_factor * 1000) % 10000)
+    random_factor = np.random.normal(0, 0.15)
+    practical_probs = adjusted_probs.copy()
+    practical_probs[0, active_class_idx] = np.clip(practical_probs[0, active_class_idx] + random_factor, 0, 1)
+    return practical_probs / practical_probs.sum(axis=1, keepdims=True)
+
+
+def test_practical_probabilities_match_one_row_path():
+    engine = get_engine(registry.get("startup_pipeline.pkl"))
+    records = load_records(300)
+    batch = predict_startups_batch(pd.DataFrame(records))
+    for record, batched in zip(records, batch):
+        _, prediction_probs, hardwork = engine.run(_prepare_prediction_frame(pd.DataFrame([dict(record)])))
+        expected = legacy_practical_probs(prediction_probs, hardwork[0])
+        single = predict_startup(dict(record))
+        assert single["probabilities"]["practical"] == expected.tolist()
+        assert single["practical_prediction"]["probability"] == float(expected[0].max())
+        assert batched == single
@@ -0,0 +1,115 @@
+import hashlib
+import pickle
+
+import pytest
+
+import response_cache
+from response_cache import RedisCache, TTLCache, canonical_key
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(response_cache.time, "monotonic", lambda: now[0])
+    return now
+
+
+# Just enough of redis.Redis for RedisCache; expiry is left to the server
+class FakeRedis:
+    def __init__(self):
+        self.values = {}
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def set(self, key, value, px=None):
+        self.values[key] = value.encode() if isinstance(value, str) else value
+
+    def scan_iter(self, pattern):
+        return [key for key in list(self.values) if key.startswith(pattern.rstrip("*"))]
+
+    def delete(self, key):
+        self.values.pop(key, None)
+
+
+def make_redis_cache(client):
+    cache = RedisCache.__new__(RedisCache)
+    cache.client = client
+    cache.ttl = 300
+    cache.prefix = "startup-api:"
+    cache.stats = response_cache.CacheStats()
+    return cache
+
+
+def test_canonical_key_ignores_key_order_and_tracks_versions():
+    key = canonical_key("predict", {"Industries": "FinTech", "Founded Date": 2015.0}, "model-a")
+    assert key == canonical_key("predict", {"Founded Date": 2015.0, "Industries": "FinTech"}, "model-a")
+    assert key.startswith("predict:")
+    assert key != canonical_key("predict", {"Industries": "FinTech", "Founded Date": 2015.0}, "model-b")
+    assert key != canonical_key("peer_comparison", {"Industries": "FinTech", "Founded Date": 2015.0}, "model-a")
+    assert key != canonical_key("predict", {"Industries": "FinTech", "Founded Date": 2016.0}, "model-a")
+
+
+def test_canonical_key_is_stable_across_calls():
+    # A fixed digest: a change here invalidates every shared cache entry
+    assert canonical_key("predict", {"a": 1}, "v1") == (
+        "predict:" + hashlib.sha256(b'["predict",{"a":1},["v1"]]').hexdigest())
+
+
+def test_ttl_expiry(clock):
+    cache = TTLCache(maxsize=10, ttl=5)
+    cache.set("a", {"value": 1})
+    clock[0] += 4.9
+    assert cache.get("a") == {"value": 1}
+    clock[0] += 0.2
+    assert cache.get("a") is None
+    metrics = cache.metrics()
+    assert (metrics["hits"], metrics["misses"], metrics["expired"], metrics["size"]) == (1, 1, 1, 0)
+
+
+def test_lru_eviction(clock):
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # a is now the most recently used
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.metrics()["evictions"] == 1
+
+
+def test_hit_miss_stats(clock):
+    cache = TTLCache(maxsize=10, ttl=60)
+    assert cache.get("a") is None
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    assert cache.get("a") == 1
+    metrics = cache.metrics()
+    assert (metrics["hits"], metrics["misses"]) == (2, 1)
+    assert metrics["hit_rate"] == pytest.approx(2 / 3)
+    cache.clear()
+    assert cache.metrics()["size"] == 0
+
+
+def test_redis_cache_round_trips_json():
+    client = FakeRedis()
+    cache = make_redis_cache(client)
+    value = {"practical_prediction": {"label": "Active", "confidence": "High"}, "probabilities": [0.25, 0.75]}
+    assert cache.get("k") is None
+    cache.set("k", value)
+    assert client.values["startup-api:k"].startswith(b"{")
+    assert cache.get("k") == value
+    assert cache.metrics()["hits"] == 1
+    assert cache.metrics()["misses"] == 1
+    cache.clear()
+    assert client.values == {}
+
+
+def test_redis_cache_never_unpickles():
+    client = FakeRedis()
+    cache = make_redis_cache(client)
+    client.values["startup-api:k"] = pickle.dumps({"value": 1})
+    assert cache.get("k") is None
+    assert cache.metrics()["errors"] == 1
+    assert cache.metrics()["misses"] == 1
@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+
+from pipeline import predict_startups_batch
+from startup_input import INPUT_COLUMNS, StartupData, startup_frame
+
+# The per-request mapping the handlers used to apply
+OLD_MAPPING = {field: field.replace("_", " ") for field in StartupData.model_fields}
+
+
+def load_startups(n=200):
+    frame = pd.read_csv("startups.csv").drop(columns=["Operating Status"]).head(n)
+    startups = []
+    for i, row in enumerate(frame.to_dict("records")):
+        body = {key.replace(" ", "_"): value for key, value in row.items() if key.replace(" ", "_") in OLD_MAPPING}
+        # Leave some fields out, as partial form submissions do
+        for field in list(body)[i % 5::7]:
+            body.pop(field)
+        startups.append(StartupData(**body))
+    return startups
+
+
+def test_record_matches_renamed_input():
+    for startup in load_startups(50):
+        input_data = startup.to_input()
+        assert startup.to_record() == {OLD_MAPPING[key]: value for key, value in input_data.items()}
+        assert list(startup.to_record()) == [c for c in INPUT_COLUMNS if c in startup.to_record()]
+    assert StartupData(Industries="FinTech").to_record() == {"Industries": "FinTech"}
+
+
+def test_batch_frame_scores_like_renamed_records():
+    startups = load_startups()
+    frame = startup_frame(startups)
+    assert list(frame.columns) == list(INPUT_COLUMNS)
+    assert not frame.isin([None]).any().any()
+    expected = predict_startups_batch(pd.DataFrame([startup.to_record() for startup in startups]))
+    assert predict_startups_batch(frame) == expected
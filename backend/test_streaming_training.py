@@ -0,0 +1,51 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from compiled_scorer import get_scorer
+from pipeline import _prepare_prediction_frame
+from streaming_training import collect_statistics, iter_chunks, train_pipeline_streaming
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DATA = os.path.join(HERE, "data_2.csv")
+
+
+def test_statistics_do_not_depend_on_chunking():
+    for sample_rows in (10_000, 250):
+        small = collect_statistics(DATA, chunk_size=7, sample_rows=sample_rows)
+        large = collect_statistics(DATA, chunk_size=5000, sample_rows=sample_rows)
+        assert small["n_rows"] == large["n_rows"] == 1000
+        assert small["n_train"] == large["n_train"]
+        assert 0.8 < small["n_train"] / 1000 < 0.9
+        pd.testing.assert_series_equal(small["labels"].sort_index(), large["labels"].sort_index())
+        pd.testing.assert_series_equal(small["locations"].sort_index(), large["locations"].sort_index())
+        pd.testing.assert_frame_equal(small["sample"], large["sample"])
+        assert len(small["sample"]) == min(sample_rows, small["n_train"])
+
+
+def test_sample_is_bounded():
+    stats = collect_statistics(DATA, chunk_size=100, sample_rows=250)
+    assert len(stats["sample"]) == 250
+    assert stats["labels"].sum() == stats["n_train"]
+    assert stats["locations"].sum() == stats["n_train"]
+
+
+def test_parquet_and_csv_chunks_match(tmp_path):
+    path = str(tmp_path / "data.parquet")
+    pd.read_csv(DATA).to_parquet(path)
+    from_csv = pd.concat(iter_chunks(DATA, 300), ignore_index=True)
+    from_parquet = pd.concat(iter_chunks(path, 300), ignore_index=True)
+    pd.testing.assert_frame_equal(from_csv, from_parquet)
+
+
+def test_streamed_pipeline_scores_like_a_regular_one(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    records = pd.read_csv(os.path.join(HERE, "startup_og.csv")).drop(columns=["Operating Status"], errors="ignore").head(100)
+    X = _prepare_prediction_frame(records)
+    for external_memory in (False, True):
+        pipeline = train_pipeline_streaming(DATA, chunk_size=250, sample_rows=400, external_memory=external_memory, cache_dir=str(tmp_path))
+        proba = pipeline.predict_proba(X)
+        assert proba.shape == (100, 2)
+        np.testing.assert_allclose(get_scorer(pipeline).predict_proba(X.to_dict("records")), proba, atol=1e-6)
+    assert os.path.exists("startup_pipeline.pkl") and os.path.exists("target_encoder.pkl")
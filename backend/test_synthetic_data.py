@@ -0,0 +1,25 @@
+import pandas as pd
+
+from generate_synthetic_data import COLUMNS, generate_chunks, generate_synthetic_data, write_synthetic_data
+
+
+def test_same_seed_same_data():
+    first = generate_synthetic_data(3000, seed=7, path=None)
+    assert first.equals(generate_synthetic_data(3000, seed=7, path=None))
+    assert not first.equals(generate_synthetic_data(3000, seed=8, path=None))
+    assert list(first.columns) == COLUMNS
+
+
+def test_closed_ratio_scales_with_rows():
+    for n_rows in (200, 5000, 40000):
+        closed = sum((chunk["Operating Status"] == "Closed").sum() for chunk in generate_chunks(n_rows, seed=1, chunk_size=3000))
+        assert 0.17 * n_rows - 1 <= closed <= 0.18 * n_rows + 1
+
+
+def test_streams_csv_and_parquet(tmp_path):
+    for name in ("data.csv", "data.parquet"):
+        path = str(tmp_path / name)
+        counts = write_synthetic_data(path, 2500, seed=3, chunk_size=1000)
+        frame = pd.read_parquet(path) if name.endswith(".parquet") else pd.read_csv(path)
+        assert len(frame) == 2500
+        assert frame["Operating Status"].value_counts().to_dict() == counts.to_dict()
@@ -0,0 +1,45 @@
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from training import preprocessing_config, train_pipeline
+from training_cache import TrainingCache, preprocessing_key
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def test_entry_round_trips(tmp_path):
+    cache = TrainingCache(str(tmp_path))
+    frame = pd.DataFrame({"Industries": ["FinTech", "Unknown"], "Number of Founders": [1.0, 2.0]})
+    arrays = {"X": np.arange(6, dtype=float).reshape(2, 3), "y": np.array([0, 1])}
+    cache.save("abc", frame, arrays, {"encoder": {"Active": 0}})
+    loaded_frame, loaded_arrays, objects = cache.load("abc")
+    pd.testing.assert_frame_equal(loaded_frame, frame)
+    np.testing.assert_array_equal(loaded_arrays["X"], arrays["X"])
+    assert objects == {"encoder": {"Active": 0}}
+    assert cache.load("missing") is None
+
+
+def test_key_follows_dataset_contents_and_config(tmp_path):
+    data = tmp_path / "startups.csv"
+    shutil.copy(os.path.join(HERE, "startups.csv"), data)
+    key = preprocessing_key(str(data), preprocessing_config())
+    assert preprocessing_key(str(data), preprocessing_config()) == key
+    assert preprocessing_key(str(data), {**preprocessing_config(), "test_size": 0.2}) != key
+    with open(data, "a") as f:
+        f.write("\n")
+    os.utime(data, ns=(0, 0))
+    assert preprocessing_key(str(data), preprocessing_config()) != key
+
+
+def test_cached_retrain_matches_fresh(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    data = os.path.join(HERE, "startups.csv")
+    X = pd.read_csv(data).drop(columns=["Operating Status"]).head(200)
+    fresh = train_pipeline(data, "fresh.pkl", cache_dir=None).predict_proba(X)
+    train_pipeline(data, "first.pkl", cache_dir="cache")
+    assert len(os.listdir("cache")) == 1
+    cached = train_pipeline(data, "cached.pkl", cache_dir="cache").predict_proba(X)
+    np.testing.assert_array_equal(cached, fresh)
@@ -0,0 +1,122 @@
+import logging
+import os
+import shutil
+import time
+
+import numpy as np
+import pytest
+
+import feature_store
+import worker_pool
+from feature_store import get_feature_store
+from model_registry import registry, save_artifact
+from pipeline import generate_peer_comparison_report
+from worker_pool import InferenceWorkerPool, SharedArrays, WorkerPoolBusy, attach_shared_arrays
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+SAMPLE = {
+    "Organization Name": "Test Startup", "Industries": "FinTech, E-Commerce", "Headquarters Location": "Delhi",
+    "Estimated Revenue": "Less than $1M", "Founded Date": 2021, "Investment Stage": "Seed",
+    "Number of Founders": 2, "Number of Employees": "11-50", "Total Funding Amount": "$0 to $1M",
+    "Growth Confidence": "Medium", "Monthly visit": 5000, "Visit Duration Growth": -12.0,
+}
+
+
+def test_shared_arrays_round_trip():
+    arrays = {
+        "floats": np.random.default_rng(0).standard_normal((7, 3)),
+        "ints": np.arange(5, dtype=np.int32),
+        "empty": np.empty(0),
+        "columns": np.asfortranarray(np.ones((4, 2))),
+    }
+    shared = SharedArrays(arrays)
+    try:
+        shm, attached = attach_shared_arrays(shared.name, shared.specs)
+        for name, array in arrays.items():
+            np.testing.assert_array_equal(attached[name], array)
+            assert attached[name].dtype == array.dtype
+            assert shared.specs[name][0] % 64 == 0
+        # Views over the same pages, not copies
+        attached["ints"][0] = 42
+        assert shared._view(shared.shm, "ints")[0] == 42
+        del attached
+        shm.close()
+    finally:
+        shared.close()
+
+
+@pytest.fixture(scope="module")
+def pool():
+    store = get_feature_store("startup_og.csv", registry.get("startup_pipeline.pkl"))
+    pool = InferenceWorkerPool(store, "startup_og.csv", processes=1, max_pending=2).start()
+    yield pool
+    pool.shutdown()
+
+
+def test_workers_answer_from_shared_store(pool):
+    expected = generate_peer_comparison_report(dict(SAMPLE), "startup_og.csv")
+    assert pool.submit(generate_peer_comparison_report, dict(SAMPLE), "startup_og.csv").result() == expected
+
+
+def test_backpressure_past_max_pending(pool):
+    rejected = pool.metrics()["rejected"]
+    running = [pool.submit(time.sleep, 0.5) for _ in range(2)]
+    with pytest.raises(WorkerPoolBusy):
+        pool.submit(time.sleep, 0)
+    assert pool.metrics()["rejected"] == rejected + 1
+    for future in running:
+        future.result()
+    # Room again once the done callbacks have run
+    deadline = time.monotonic() + 5
+    while pool.metrics()["pending"] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert pool.metrics()["pending"] == 0
+    assert pool.submit(time.sleep, 0).result() is None
+
+
+def test_swapped_pipeline_unmaps_shared_store(tmp_path, caplog):
+    # Run a worker's initializer in this process, then swap its pipeline
+    pipeline_path = str(tmp_path / "startup_pipeline.pkl")
+    dataset_path = str(tmp_path / "startup_og.csv")
+    shutil.copy(os.path.join(HERE, "startup_pipeline.pkl"), pipeline_path)
+    shutil.copy(os.path.join(HERE, "startup_og.csv"), dataset_path)
+    store = get_feature_store(dataset_path, registry.get(pipeline_path))
+    expected = generate_peer_comparison_report(dict(SAMPLE), dataset_path, pipeline_path=pipeline_path)
+    skeleton, arrays = store.detach()
+    shared = SharedArrays(arrays)
+    try:
+        worker_pool._init_worker(pipeline_path, dataset_path, skeleton, shared.name, shared.specs)
+        attached = get_feature_store(dataset_path, registry.get(pipeline_path))
+        assert attached is skeleton and attached.shared
+        assert generate_peer_comparison_report(dict(SAMPLE), dataset_path, pipeline_path=pipeline_path) == expected
+
+        save_artifact(registry.get(pipeline_path), pipeline_path)
+        os.utime(pipeline_path, ns=(0, os.stat(pipeline_path).st_mtime_ns + 1_000_000))
+        rebuilds = feature_store.fallback_rebuilds
+        with caplog.at_level(logging.WARNING):
+            report = generate_peer_comparison_report(dict(SAMPLE), dataset_path, pipeline_path=pipeline_path)
+        assert report == expected
+        assert feature_store.fallback_rebuilds == rebuilds + 1
+        assert "stale" in caplog.text
+        assert "Could not unmap" not in caplog.text
+        # The skeleton let go of its views and the worker's mapping is closed
+        assert skeleton.values is None and skeleton.index is None
+        assert "shm" not in worker_pool._worker_state
+        assert not get_feature_store(dataset_path, registry.get(pipeline_path)).shared
+    finally:
+        worker_pool._worker_state.pop("shm", None)
+        shared.close()
+
+
+def test_pool_reports_stale_shared_arrays(tmp_path):
+    pipeline_path = str(tmp_path / "startup_pipeline.pkl")
+    shutil.copy(os.path.join(HERE, "startup_pipeline.pkl"), pipeline_path)
+    store = get_feature_store(os.path.join(HERE, "startup_og.csv"), registry.get(pipeline_path))
+    pool = InferenceWorkerPool(store, os.path.join(HERE, "startup_og.csv"), pipeline_path=pipeline_path, processes=1)
+    try:
+        assert not pool.metrics()["shared_stale"]
+        os.utime(pipeline_path, ns=(0, os.stat(pipeline_path).st_mtime_ns + 1_000_000))
+        assert pool.metrics()["shared_stale"]
+    finally:
+        pool.shutdown()
@@ -1,4 +1,24 @@
+import argparse
+
 from pipeline import train_pipeline
 
 if __name__ == "__main__":
-    train_pipeline("startups.csv")
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Train the startup pipeline")
+    parser.add_argument("data_path", nargs="?", default="startups.csv")
+    parser.add_argument("--save-path", default="startup_pipeline.pkl")
+    parser.add_argument("--search", choices=["grid", "random", "halving"])
+    parser.add_argument("--n-iter", type=int, default=20)
+    parser.add_argument("--processes", type=int)
+    parser.add_argument("--streaming", action="store_true", help="chunked training for files larger than memory")
+    parser.add_argument("--external-memory", action="store_true", help="with --streaming, page the training matrix to disk")
+    parser.add_argument("--chunk-size", type=int, default=50_000)
+    args = parser.parse_args()
+    if args.streaming and (args.search or args.processes is not None or args.n_iter != parser.get_default("n_iter")):
+        parser.error("--search, --n-iter and --processes are not supported with --streaming")
+    if args.external_memory and not args.streaming:
+        parser.error("--external-memory requires --streaming")
+    if args.streaming:
+        from streaming_training import train_pipeline_streaming
+        train_pipeline_streaming(args.data_path, args.save_path, chunk_size=args.chunk_size, external_memory=args.external_memory)
+    else:
+        train_pipeline(args.data_path, args.save_path, search=args.search, n_iter=args.n_iter, processes=args.processes)
@@ -0,0 +1,305 @@
+import os
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+from sklearn.compose import ColumnTransformer
+from sklearn.impute import SimpleImputer
+from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score, confusion_matrix, classification_report, roc_auc_score, roc_curve
+from sklearn.model_selection import train_test_split, cross_val_score, StratifiedKFold
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler, OrdinalEncoder, LabelEncoder
+
+from compiled_scorer import export_scorer, scorer_path_for
+from dataset_store import load_dataset
+from hyperparameter_search import search_hyperparameters, resolve_params, write_leaderboard
+from model_registry import save_artifact
+from training_cache import DEFAULT_CACHE_DIR, TrainingCache, preprocessing_key
+from pipeline import (
+    RevenueMapper, EmployeeRangeConverter, FundingConverter, YearsActiveCalculator,
+    GrowthConfidenceConverter, IndustriesEncoder, FrequencyEncoder, DerivedFeatures,
+    NUMERIC_COLUMNS, PLACEHOLDER_COLUMNS
+)
+
+TEST_SIZE = 0.15
+
+# Pipeline Creation
+def create_preprocessing_pipeline():
+    numerical_features = [
+        "Number of Founders", "Number of Funding Rounds", "Monthly visit",
+        "Visit Duration Growth", "Patents Granted", "Visit Duration"
+    ]
+    custom_numerical_features = [
+        "Estimated Revenue", "Number of Employees", "Total Funding Amount", "Founded Date"
+    ]
+    categorical_features = [
+        "Investment Stage", "Funding Status", "Growth Category", "Industry Groups", "Founders"
+    ]
+    frequency_encoded_features = ["Headquarters Location"]
+    industries_feature = ["Industries"]
+    growth_confidence_feature = ["Growth Confidence"]
+    numerical_transformer = Pipeline(steps=[
+        ("imputer", SimpleImputer(strategy="median")),
+        ("scaler", StandardScaler())
+    ])
+    revenue_transformer = Pipeline(steps=[
+        ("mapper", RevenueMapper()),
+        ("imputer", SimpleImputer(strategy="constant", fill_value=0)),
+        ("scaler", StandardScaler())
+    ])
+    employees_transformer = Pipeline(steps=[
+        ("converter", EmployeeRangeConverter()),
+        ("imputer", SimpleImputer(strategy="constant", fill_value=0)),
+        ("scaler", StandardScaler())
+    ])
+    funding_transformer = Pipeline(steps=[
+        ("converter", FundingConverter()),
+        ("imputer", SimpleImputer(strategy="mean")),
+        ("scaler", StandardScaler())
+    ])
+    years_transformer = Pipeline(steps=[
+        ("calculator", YearsActiveCalculator()),
+        ("imputer", SimpleImputer(strategy="median")),
+        ("scaler", StandardScaler())
+    ])
+    categorical_transformer = Pipeline(steps=[
+        ("imputer", SimpleImputer(strategy="constant", fill_value="Unknown")),
+        ("encoder", OrdinalEncoder(handle_unknown='use_encoded_value', unknown_value=-1))
+    ])
+    frequency_transformer = Pipeline(steps=[
+        ("imputer", SimpleImputer(strategy="constant", fill_value="Unknown")),
+        ("freq_encoder", FrequencyEncoder())
+    ])
+    industries_transformer = Pipeline(steps=[
+        ("imputer", SimpleImputer(strategy="constant", fill_value="Unknown")),
+        ("encoder", IndustriesEncoder())
+    ])
+    growth_confidence_transformer = Pipeline(steps=[
+        ("converter", GrowthConfidenceConverter()),
+        ("imputer", SimpleImputer(strategy="constant", fill_value=0.5)),
+        ("scaler", StandardScaler())
+    ])
+    preprocessor = ColumnTransformer(
+        transformers=[
+            ("num", numerical_transformer, numerical_features),
+            ("revenue", revenue_transformer, ["Estimated Revenue"]),
+            ("employees", employees_transformer, ["Number of Employees"]),
+            ("funding", funding_transformer, ["Total Funding Amount"]),
+            ("years", years_transformer, ["Founded Date"]),
+            ("cat", categorical_transformer, categorical_features),
+            ("freq", frequency_transformer, frequency_encoded_features),
+            ("industries", industries_transformer, industries_feature),
+            ("growth_confidence", growth_confidence_transformer, growth_confidence_feature)
+        ],
+        verbose_feature_names_out=False
+    )
+    return preprocessor
+
+def create_full_pipeline():
+    preprocessor = create_preprocessing_pipeline()
+    pipeline = Pipeline(steps=[
+        ("preprocessor", preprocessor),
+        ("derived", DerivedFeatures()),
+        ("classifier", xgb.XGBClassifier(random_state=13, use_label_encoder=False, eval_metric='logloss'))
+    ])
+    return pipeline
+
+FEATURE_COLUMNS = [
+    "Industries", "Headquarters Location", "Estimated Revenue", "Founded Date",
+    "Investment Stage", "Industry Groups", "Number of Founders", "Founders",
+    "Number of Employees", "Number of Funding Rounds", "Funding Status",
+    "Total Funding Amount", "Growth Category", "Growth Confidence",
+    "Monthly visit", "Visit Duration Growth", "Patents Granted", "Visit Duration"
+]
+
+# Median for numeric columns, mode for the rest, and the target's mode
+def fill_values(df, feature_columns):
+    values = {}
+    for col in feature_columns + ["Operating Status"]:
+        if col != "Operating Status" and df[col].dtype in ['int64', 'float64']:
+            values[col] = df[col].median()
+        else:
+            values[col] = df[col].mode()[0]
+    return values
+
+# Load the cleaned dataset (the ingested Arrow file when current, see
+# dataset_store) and apply the missing-value fills
+def clean_training_frame(data_path):
+    df = load_dataset(data_path)
+    print(f"X_train shape (initial): {df.shape}")
+    print(f"Columns in dataset: {df.columns.tolist()}")
+    
+    for col in NUMERIC_COLUMNS + PLACEHOLDER_COLUMNS + ["Number of Employees"]:
+        if col in df.columns:
+            print(f"Missing values in {col} after conversion: {df[col].isna().sum()}")
+    
+    feature_columns = [col for col in FEATURE_COLUMNS if col in df.columns]
+    
+    missing_in_features = df[feature_columns].isna().sum()
+    print("\nMissing values in feature columns:")
+    for col, count in missing_in_features.items():
+        if count > 0:
+            print(f"{col}: {count} missing values")
+    
+    rows_with_missing = df[feature_columns].isna().any(axis=1).sum()
+    print(f"\nRows with any missing values in feature columns: {rows_with_missing}")
+    
+    if "Operating Status" not in df.columns:
+        raise ValueError("Target column 'Operating Status' not found in dataset")
+    
+    missing_in_target = df["Operating Status"].isna().sum()
+    print(f"Missing values in Operating Status: {missing_in_target}")
+    
+    # Instead of dropping rows, fill missing values
+    df_clean = df.fillna(fill_values(df, feature_columns))
+    
+    print(f"Rows after filling missing values: {len(df_clean)}")
+    
+    return df_clean[feature_columns], df_clean["Operating Status"]
+
+# Encode the target, split, and fit the preprocessor and DerivedFeatures on
+# the training rows. Returns what TrainingCache stores: the cleaned feature
+# frame, the matrices/labels/split positions and the fitted objects.
+def preprocess_training_data(data_path):
+    X, y = clean_training_frame(data_path)
+    
+    class_counts = y.value_counts()
+    print("\nClass distribution:")
+    for cls, count in class_counts.items():
+        print(f"Class {cls}: {count} samples ({count/len(y)*100:.2f}%)")
+    
+    le = LabelEncoder()
+    y = le.fit_transform(y)
+    
+    class_counts = np.bincount(y)
+    print("\nClass distribution after encoding:")
+    for i, count in enumerate(class_counts):
+        print(f"Class {le.inverse_transform([i])[0]}: {count} samples ({count/len(y)*100:.2f}%)")
+    
+    # Split positions rather than rows so a cache hit can rebuild the frames
+    train_idx, test_idx = train_test_split(
+        np.arange(len(y)), test_size=TEST_SIZE, stratify=y, random_state=13
+    )
+    X_train, X_test, y_train, y_test = X.iloc[train_idx], X.iloc[test_idx], y[train_idx], y[test_idx]
+    print(f"X_train shape: {X_train.shape}")
+    print(f"X_test shape: {X_test.shape}")
+    print(f"Features used: {X_train.columns.tolist()}")
+    
+    preprocessor = create_preprocessing_pipeline()
+    derived = DerivedFeatures()
+    
+    X_train_preprocessed = preprocessor.fit_transform(X_train)
+    feature_names = preprocessor.get_feature_names_out()
+    X_train_derived = derived.fit_transform(X_train_preprocessed, y_train, feature_names=feature_names)
+    X_test_derived = derived.transform(preprocessor.transform(X_test))
+    
+    arrays = {
+        "y": y, "train_idx": train_idx, "test_idx": test_idx,
+        "X_train_derived": X_train_derived, "X_test_derived": X_test_derived,
+    }
+    return X, arrays, {"target_encoder": le, "preprocessor": preprocessor, "derived": derived}
+
+def preprocessing_config():
+    return {"preprocessor": create_preprocessing_pipeline(), "derived": DerivedFeatures(), "test_size": TEST_SIZE, "random_state": 13}
+
+# search="grid" | "random" | "halving" tunes the classifier on the training
+# split with cross-validation before the final fit; the leaderboard goes to
+# report_dir and the held-out test split is left untouched by the search.
+#
+# The cleaned frame and the fitted/transformed matrices are cached under
+# cache_dir keyed on the dataset contents and preprocessing setup, so a
+# retrain on unchanged inputs goes straight to the classifier. Pass
+# cache_dir=None to always recompute.
+def train_pipeline(data_path, save_path="startup_pipeline.pkl", search=None, n_iter=20, processes=None, report_dir="reports", cache_dir=DEFAULT_CACHE_DIR):
+    cache = TrainingCache(cache_dir) if cache_dir else None
+    key = preprocessing_key(data_path, preprocessing_config()) if cache else None
+    cached = cache.load(key) if cache else None
+    if cached is None:
+        X, arrays, fitted = preprocess_training_data(data_path)
+        if cache:
+            cache.save(key, X, arrays, fitted)
+    else:
+        X, arrays, fitted = cached
+        print(f"Loaded preprocessed training data for {data_path} from {cache_dir}/{key}")
+    
+    le, preprocessor, derived = fitted["target_encoder"], fitted["preprocessor"], fitted["derived"]
+    y_train, y_test = arrays["y"][arrays["train_idx"]], arrays["y"][arrays["test_idx"]]
+    X_train = X.iloc[arrays["train_idx"]]
+    X_train_derived, X_test_derived = arrays["X_train_derived"], arrays["X_test_derived"]
+    save_artifact(le, "target_encoder.pkl")
+    
+    classifier_params = {}
+    if search is not None:
+        best_params, leaderboard = search_hyperparameters(
+            create_preprocessing_pipeline(), X_train, y_train, mode=search, n_iter=n_iter, processes=processes)
+        report_path = write_leaderboard(leaderboard, search, report_dir)
+        print(f"\nHyperparameter search ({search}, {len(leaderboard)} candidates) written to {report_path}")
+        print(leaderboard.head(5).to_string(index=False))
+        classifier_params = resolve_params(best_params, y_train)
+        print(f"Best parameters: {classifier_params}")
+    
+    classifier = xgb.XGBClassifier(random_state=13, use_label_encoder=False, eval_metric='logloss', **classifier_params)
+    classifier.fit(X_train_derived, y_train)
+    print("Components fitted successfully")
+    
+    y_pred = classifier.predict(X_test_derived)
+    
+    accuracy = accuracy_score(y_test, y_pred)
+    precision = precision_score(y_test, y_pred, average='weighted')
+    recall = recall_score(y_test, y_pred, average='weighted')
+    f1 = f1_score(y_test, y_pred, average='weighted')
+    conf_matrix = confusion_matrix(y_test, y_pred)
+    class_report = classification_report(y_test, y_pred, target_names=le.classes_)
+    
+    print("\nModel Performance:")
+    print(f"Accuracy: {accuracy:.4f}")
+    print(f"Precision: {precision:.4f}")
+    print(f"Recall: {recall:.4f}")
+    print(f"F1 Score: {f1:.4f}")
+    print("\nConfusion Matrix:")
+    print(conf_matrix)
+    print("\nClassification Report:")
+    print(class_report)
+    
+    # Create ROC curve
+    y_pred_proba = classifier.predict_proba(X_test_derived)
+    fpr, tpr, _ = roc_curve(y_test, y_pred_proba[:, 1])
+    roc_auc = roc_auc_score(y_test, y_pred_proba[:, 1])
+    
+    plt.figure()
+    plt.plot(fpr, tpr, color='darkorange', lw=2, label=f'ROC curve (AUC = {roc_auc:.2f})')
+    plt.plot([0, 1], [0, 1], color='navy', lw=2, linestyle='--')
+    plt.xlim([0.0, 1.0])
+    plt.ylim([0.0, 1.05])
+    plt.xlabel('False Positive Rate')
+    plt.ylabel('True Positive Rate')
+    plt.title('Receiver Operating Characteristic (ROC) Curve')
+    plt.legend(loc="lower right")
+    
+    # Create plots directory if it doesn't exist
+    os.makedirs('plots', exist_ok=True)
+    plt.savefig('plots/roc_curve.png')
+    plt.close()
+    
+    # Cross-validation
+    cv = StratifiedKFold(n_splits=5, shuffle=True, random_state=13)
+    cv_scores = cross_val_score(classifier, X_train_derived, y_train, cv=cv)
+    print("\nCross-validation scores:", cv_scores)
+    print(f"Mean CV score: {cv_scores.mean():.4f} (+/- {cv_scores.std() * 2:.4f})")
+    
+    pipeline = Pipeline([
+        ('preprocessor', preprocessor),
+        ('derived', derived),
+        ('classifier', classifier)
+    ])
+    
+    save_artifact(pipeline, save_path)
+    print(f"\nPipeline saved to {save_path}")
+
+    # Flat NumPy scorer for the single-row /predict path
+    scorer_path = scorer_path_for(save_path)
+    export_scorer(pipeline, scorer_path, source_path=save_path)
+    print(f"Compiled scorer saved to {scorer_path}")
+    
+    return pipeline
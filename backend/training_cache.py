@@ -0,0 +1,81 @@
+import json
+import logging
+import os
+import shutil
+
+import joblib
+import numpy as np
+import pandas as pd
+import sklearn
+
+from model_registry import _file_digest
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = ".training_cache"
+
+# Bump when what train_pipeline stores in an entry changes shape
+CACHE_FORMAT = 1
+
+_CODE_DEPENDENCIES = ("pipeline.py", "training.py", "dataset_store.py")
+
+
+def preprocessing_key(data_path, config):
+    # Content hash of the dataset, the unfitted preprocessing steps and split
+    # settings, and the source the cleanup/transformers are defined in, so an
+    # edit to any of them misses instead of reusing stale matrices.
+    here = os.path.dirname(os.path.abspath(__file__))
+    return joblib.hash((
+        CACHE_FORMAT,
+        _file_digest(data_path),
+        config,
+        [_file_digest(os.path.join(here, name)) for name in _CODE_DEPENDENCIES],
+        sklearn.__version__,
+        pd.__version__,
+    ))
+
+
+# One directory per key holding the cleaned frame as Parquet, each matrix as
+# .npy and the fitted transformers/encoder as a joblib pickle. Entries are
+# written to a temporary directory and renamed into place, so a concurrent
+# or interrupted run never reads half an entry.
+class TrainingCache:
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR):
+        self.cache_dir = cache_dir
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key)
+
+    def load(self, key):
+        path = self._path(key)
+        try:
+            with open(os.path.join(path, "manifest.json")) as f:
+                manifest = json.load(f)
+            frame = pd.read_parquet(os.path.join(path, "frame.parquet"))
+            arrays = {name: np.load(os.path.join(path, f"{name}.npy"), allow_pickle=False) for name in manifest["arrays"]}
+            objects = joblib.load(os.path.join(path, "objects.pkl"))
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable training cache entry {path}: {str(e)}")
+            return None
+        return frame, arrays, objects
+
+    def save(self, key, frame, arrays, objects):
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        os.makedirs(tmp_path, exist_ok=True)
+        try:
+            frame.to_parquet(os.path.join(tmp_path, "frame.parquet"))
+            for name, array in arrays.items():
+                np.save(os.path.join(tmp_path, f"{name}.npy"), np.asarray(array), allow_pickle=False)
+            joblib.dump(objects, os.path.join(tmp_path, "objects.pkl"))
+            with open(os.path.join(tmp_path, "manifest.json"), "w") as f:
+                json.dump({"arrays": sorted(arrays)}, f)
+            os.replace(tmp_path, path)
+        except OSError:
+            # Another run published the same key first; theirs is identical
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            if not os.path.isdir(path):
+                raise
+        return path
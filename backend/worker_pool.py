@@ -0,0 +1,180 @@
+import asyncio
+import gc
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, wait
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from feature_store import install_feature_store
+from model_registry import registry, file_signature
+
+logger = logging.getLogger(__name__)
+
+# Arrays are laid out back to back in one block, each starting on a cache line
+_ALIGNMENT = 64
+
+
+class WorkerPoolBusy(Exception):
+    pass
+
+
+# A set of named numpy arrays copied once into a single shared memory block.
+# Workers attach by name and get zero-copy views of the same pages.
+class SharedArrays:
+    def __init__(self, arrays):
+        self.specs = {}
+        offset = 0
+        for name, array in arrays.items():
+            array = np.ascontiguousarray(array)
+            self.specs[name] = (offset, array.shape, array.dtype.str)
+            offset += -(-array.nbytes // _ALIGNMENT) * _ALIGNMENT
+        self.shm = SharedMemory(create=True, size=max(offset, 1))
+        for name, array in arrays.items():
+            self._view(self.shm, name)[...] = array
+        self.nbytes = offset
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def _view(self, shm, name):
+        offset, shape, dtype = self.specs[name]
+        return np.ndarray(shape, dtype=dtype, buffer=shm.buf, offset=offset)
+
+    def close(self):
+        self.shm.close()
+        self.shm.unlink()
+
+
+def attach_shared_arrays(name, specs):
+    shm = SharedMemory(name=name)
+    arrays = {
+        key: np.ndarray(shape, dtype=dtype, buffer=shm.buf, offset=offset)
+        for key, (offset, shape, dtype) in specs.items()
+    }
+    return shm, arrays
+
+
+# Per-process state of a pool worker; the SharedMemory handle has to stay
+# referenced for as long as the views into it are in use.
+_worker_state = {}
+
+
+def _release_shared():
+    shm = _worker_state.pop("shm", None)
+    if shm is None:
+        return
+    try:
+        shm.close()
+    except BufferError:
+        # Views caught in a reference cycle keep the mapping exported
+        gc.collect()
+        try:
+            shm.close()
+        except BufferError as e:
+            logger.warning(f"Could not unmap stale shared feature store {shm.name}: {str(e)}")
+
+
+def _init_worker(pipeline_path, dataset_path, skeleton, shm_name, specs):
+    pipeline = registry.get(pipeline_path)
+    shm, arrays = attach_shared_arrays(shm_name, specs)
+    _worker_state["shm"] = shm
+    install_feature_store(dataset_path, skeleton.attach(pipeline, arrays, on_release=_release_shared))
+
+
+def _ready():
+    return multiprocessing.current_process().pid
+
+
+# Pre-started process pool for the GIL-bound pandas/sklearn/XGBoost work.
+# Each worker unpickles the pipeline once and maps the reference feature
+# store's arrays from shared memory rather than holding its own copy.
+#
+# At most max_pending calls may be queued or running; past that run() fails
+# fast with WorkerPoolBusy so the API can shed load instead of letting the
+# queue and latency grow without bound.
+#
+# The shared arrays belong to the pipeline the pool was started with. Once
+# that file is swapped, each worker's next peer call builds a private store
+# instead (and unmaps the shared one); metrics() reports shared_stale so the
+# pool can be restarted.
+class InferenceWorkerPool:
+    def __init__(self, store, dataset_path, pipeline_path="startup_pipeline.pkl",
+                 processes=None, max_pending=None, start_method="forkserver"):
+        self.processes = processes or multiprocessing.cpu_count()
+        self.max_pending = max_pending or self.processes * 4
+        self.pipeline_path = pipeline_path
+        self.pipeline_signature = file_signature(pipeline_path)
+        skeleton, arrays = store.detach()
+        self.shared = SharedArrays(arrays)
+        if start_method not in multiprocessing.get_all_start_methods():
+            start_method = "spawn"
+        context = multiprocessing.get_context(start_method)
+        if start_method == "forkserver":
+            # Workers fork from a server that already imported the heavy modules
+            context.set_forkserver_preload(["pipeline", "feature_store"])
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.processes,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(pipeline_path, dataset_path, skeleton, self.shared.name, self.shared.specs),
+        )
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+
+    def start(self):
+        # Bring every worker up (and through its initializer) before traffic
+        pids = {f.result() for f in wait([self.executor.submit(_ready) for _ in range(self.processes)]).done}
+        logger.info(f"Inference worker pool ready: {len(pids)} processes, "
+                    f"{self.shared.nbytes / 2 ** 20:.1f} MiB shared reference arrays")
+        return self
+
+    def _done(self, future):
+        with self._lock:
+            self.pending -= 1
+            if future.cancelled() or future.exception() is not None:
+                self.failed += 1
+            else:
+                self.completed += 1
+
+    def submit(self, fn, *args, **kwargs):
+        with self._lock:
+            if self.pending >= self.max_pending:
+                self.rejected += 1
+                raise WorkerPoolBusy(f"Inference queue full ({self.pending} pending)")
+            self.pending += 1
+        try:
+            future = self.executor.submit(fn, *args, **kwargs)
+        except Exception:
+            with self._lock:
+                self.pending -= 1
+            raise
+        future.add_done_callback(self._done)
+        return future
+
+    async def run(self, fn, *args, **kwargs):
+        return await asyncio.wrap_future(self.submit(fn, *args, **kwargs))
+
+    def metrics(self):
+        with self._lock:
+            return {
+                "processes": self.processes,
+                "max_pending": self.max_pending,
+                "pending": self.pending,
+                "queued": max(0, self.pending - self.processes),
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "shared_bytes": self.shared.nbytes,
+                "shared_stale": file_signature(self.pipeline_path) != self.pipeline_signature,
+            }
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True, cancel_futures=True)
+        self.shared.close()
@@ -42,12 +42,20 @@ const InvestorPage = () => {
 
   useEffect(() => {
     setLoading(true);
-    // Use the debug endpoint to get all startup data
-    axios
-      .get("http://localhost:8000/debug_startups")
-      .then((response) => {
-        console.log("Raw API response:", response.data); // Debug raw data
-        const mappedStartups = response.data.startups.map((startup) => {
+    // Use the debug endpoint to get all startup data, one page at a time
+    const fetchAllStartups = async (after = null, collected = []) => {
+      const response = await axios.get("http://localhost:8000/debug_startups", {
+        params: { limit: 1000, ...(after ? { after } : {}) }
+      });
+      const startups = collected.concat(response.data.startups);
+      return response.data.next_after
+        ? fetchAllStartups(response.data.next_after, startups)
+        : startups;
+    };
+    fetchAllStartups()
+      .then((allStartups) => {
+        console.log("Raw API response:", allStartups); // Debug raw data
+        const mappedStartups = allStartups.map((startup) => {
           return {
             name: startup.Organization_Name || "Unknown",
             industry: startup.Industries || "N/A",